@@ -7,7 +7,7 @@ Run with: python app.py "Ticket subject" "Ticket description"
 import sys
 import json
 from src.agents.workflow import create_support_workflow
-from src.agents.state import State
+from src.agents.state import create_initial_state
 
 def main():
     if len(sys.argv) != 3:
@@ -30,16 +30,7 @@ def main():
     }
     
     # Initialize state
-    initial_state = State(
-        ticket=ticket,
-        category=None,
-        context=None,
-        draft_response=None,
-        review_feedback=None,
-        review_status=None,
-        retry_count=0,
-        messages=[]
-    )
+    initial_state = create_initial_state(ticket)
     
     # Create and run workflow
     workflow = create_support_workflow()
@@ -65,7 +56,8 @@ def main():
     print("\n📊 STATS:")
     print(f"• Category: {result.get('category', 'Unknown')}")
     print(f"• Retry attempts: {result.get('retry_count', 0)}")
-    print(f"• Context items used: {len(result.get('context', []))}")
+    print(f"• Served from response cache: {'yes' if result.get('cache_hit') else 'no'}")
+    print(f"• Context items used: {len(result.get('context') or [])}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
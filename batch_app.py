@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Batch entry point for the Support Ticket Resolution Agent.
+Run with: python batch_app.py tickets.jsonl [--output results.jsonl] [--concurrency 8] [--mode async]
+
+Each input line is a JSON object with "subject" and "description"
+(or "title" and "body") and an optional "id".
+"""
+
+import argparse
+import asyncio
+from src.agents.batch import load_tickets, process_batch, aprocess_batch, write_results
+
+def main():
+    parser = argparse.ArgumentParser(description="Process a JSONL file of support tickets")
+    parser.add_argument("input", help="JSONL file of tickets")
+    parser.add_argument("--output", default="batch_results.jsonl", help="JSONL file for results")
+    parser.add_argument("--concurrency", type=int, default=4, help="Tickets processed in parallel")
+    parser.add_argument("--mode", choices=["thread", "async"], default="thread",
+                        help="thread: thread pool over invoke; async: asyncio over ainvoke")
+    args = parser.parse_args()
+    
+    tickets = load_tickets(args.input)
+    print(f"🚀 Processing {len(tickets)} tickets with concurrency {args.concurrency} ({args.mode} mode)...")
+    print("-" * 50)
+    
+    if args.mode == "async":
+        results, stats = asyncio.run(aprocess_batch(tickets, concurrency=args.concurrency))
+    else:
+        results, stats = process_batch(tickets, concurrency=args.concurrency)
+    write_results(args.output, results)
+    
+    latency = stats["latency"]
+    print("\n🎯 BATCH COMPLETED")
+    print("=" * 50)
+    print(f"📁 Results written to {args.output}")
+    print(f"• Tickets: {stats['tickets']} in {stats['elapsed_seconds']}s")
+    print(f"• Throughput: {stats['throughput']} tickets/sec")
+    print(f"• Latency p50: {latency['p50']:.2f}s  p95: {latency['p95']:.2f}s  p99: {latency['p99']:.2f}s")
+    print(f"• Status: {stats['by_status']}")
+    print(f"• LLM tokens/ticket: {stats['avg_tokens']} (escalated: {stats['avg_tokens_escalated']})")
+    print("\n⏱️  Per-node latency:")
+    for node, timing in stats["node_latency"].items():
+        print(f"   {node:<18} n={timing['count']:<5} p50={timing['p50']:.3f}s  p95={timing['p95']:.3f}s")
+
+if __name__ == "__main__":
+    main()
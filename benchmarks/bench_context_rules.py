@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark the keyword -> snippet context rules used by the mock/fallback
+retriever and the retry refiner.
+Run with: python -m benchmarks.bench_context_rules [iterations]
+
+Compares the compiled ContextRuleTable with the original implementation
+(one lowercase + substring test per keyword and text, lists concatenated
+on every call) over a mix of ticket texts and review feedback, and checks
+both return the same snippets. While Chroma is unavailable every ticket
+takes the fallback path, so this is its per-call cost.
+"""
+
+from src.data.mock_knowledge import (
+    FEEDBACK_CONTEXT_RULES,
+    TICKET_CONTEXT_RULES,
+    get_enhanced_context,
+    get_feedback_context,
+    get_mock_context
+)
+from src.utils.timing import summarize_latencies
+import sys
+import time
+
+TICKETS = [
+    ("Billing", "Payment failed", "My payment was declined twice this morning even though the card is valid."),
+    ("Technical", "Cannot login", "The login page keeps spinning after I enter my password in Chrome."),
+    ("Security", "Security alert about login", "I got a security email about a login from a device I don't own."),
+    ("General", "Opening hours", "What are your support hours over the holidays? " * 40),
+    ("Billing", "Invoice question", "Where can I download last month's invoice for my accounting team?"),
+]
+
+FEEDBACK = [
+    "The draft promises a refund within 3 days, which violates our refund policy.",
+    "Mentions AES-256; do not disclose security implementation details.",
+    "Tone is fine but the answer does not address the customer's question.",
+    "Compliance issue: specific timelines must not be promised.",
+]
+
+def legacy_enhanced_context(category: str, ticket_subject: str, ticket_description: str) -> list[str]:
+    """The per-keyword implementation ContextRuleTable replaced"""
+    base_context = get_mock_context(category)
+    additional_context = []
+    for rule in TICKET_CONTEXT_RULES:
+        keyword = rule["keywords"][0]
+        if keyword in ticket_subject.lower() or keyword in ticket_description.lower():
+            if category in rule["categories"]:
+                additional_context.extend(rule["snippets"])
+    return base_context + additional_context
+
+def legacy_feedback_context(review_feedback: str) -> list[str]:
+    additional_context = []
+    for rule in FEEDBACK_CONTEXT_RULES:
+        if any(keyword in str(review_feedback).lower() for keyword in rule["keywords"]):
+            additional_context.extend(rule["snippets"])
+    return additional_context
+
+def time_calls(fn, inputs: list[tuple], iterations: int) -> list[float]:
+    """Latency of one pass over inputs, per call"""
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        for args in inputs:
+            fn(*args)
+        latencies.append((time.perf_counter() - start) / len(inputs))
+    return latencies
+
+def print_summary(label: str, latencies: list[float]):
+    summary = summarize_latencies(latencies)
+    print(f"{label:<26} mean={summary['mean'] * 1e6:7.2f}us p50={summary['p50'] * 1e6:7.2f}us "
+          f"p99={summary['p99'] * 1e6:7.2f}us")
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    feedback_inputs = [(feedback,) for feedback in FEEDBACK]
+    
+    for category, subject, description in TICKETS:
+        assert get_enhanced_context(category, subject, description) == legacy_enhanced_context(category, subject, description)
+    for feedback in FEEDBACK:
+        assert get_feedback_context(feedback) == legacy_feedback_context(feedback)
+    
+    print(f"🧩 Context rule lookups, {iterations} passes over {len(TICKETS)} tickets / {len(FEEDBACK)} feedbacks")
+    print("-" * 70)
+    
+    print_summary("ticket: per-keyword", time_calls(legacy_enhanced_context, TICKETS, iterations))
+    print_summary("ticket: rule table", time_calls(get_enhanced_context, TICKETS, iterations))
+    print_summary("feedback: per-keyword", time_calls(legacy_feedback_context, feedback_inputs, iterations))
+    print_summary("feedback: rule table", time_calls(get_feedback_context, feedback_inputs, iterations))
+
+if __name__ == "__main__":
+    main()
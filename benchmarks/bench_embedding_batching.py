@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark query embedding throughput with and without micro-batching.
+Run with: python -m benchmarks.bench_embedding_batching [queries]
+
+Simulates 1, 8 and 32 concurrent tickets each embedding its query, and
+compares one encode() call per query against the EmbeddingBatcher.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from src.data.embeddings import EmbeddingBatcher, get_embedding_model
+import sys
+import time
+
+SUBJECTS = [
+    "Payment failed for monthly subscription",
+    "Cannot login to my account",
+    "Mobile app crashing on startup",
+    "Suspicious login alert",
+    "What are your support hours",
+    "Refund policy for annual plan",
+    "Two factor authentication codes not arriving",
+    "Invoice shows the wrong billing address",
+]
+
+def make_queries(count: int) -> list[str]:
+    return [f"{SUBJECTS[i % len(SUBJECTS)]} (ticket {i})" for i in range(count)]
+
+def run(encode, queries: list[str], concurrency: int) -> float:
+    """Return embeddings/sec for `concurrency` workers sharing the queries"""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(encode, queries))
+    return len(queries) / (time.perf_counter() - start)
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 512
+    queries = make_queries(total)
+    
+    model = get_embedding_model()
+    model.encode(queries[:8])  # warm up
+    
+    def direct(text):
+        return model.encode([text], normalize_embeddings=True)[0]
+    
+    print(f"📏 Query embedding throughput over {total} queries")
+    print("-" * 50)
+    print(f"{'concurrency':<12} {'per-query encode':>18} {'micro-batched':>16} {'avg batch':>10}")
+    for concurrency in (1, 8, 32):
+        batcher = EmbeddingBatcher()
+        unbatched = run(direct, queries, concurrency)
+        batched = run(batcher.encode, queries, concurrency)
+        print(f"{concurrency:<12} {unbatched:>14.1f}/sec {batched:>12.1f}/sec "
+              f"{batcher.stats()['avg_batch_size']:>10}")
+
+if __name__ == "__main__":
+    main()
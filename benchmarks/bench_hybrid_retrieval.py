@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark dense-only vs hybrid (dense + BM25, reciprocal-rank fusion) retrieval.
+Run with: python -m benchmarks.bench_hybrid_retrieval [--docs 100000] [--queries 500]
+
+Builds a synthetic corpus where every document mixes common category words
+with a few rare terms (error codes, product names), and queries ask for a
+specific document by some of its rare terms plus category words. Dense
+search is an exact matmul over the whole matrix (an upper bound on what a
+vector store returns), so the comparison isolates what BM25 fusion adds.
+
+Embeddings default to the hashed bag-of-words fake so 100k documents
+embed in seconds; --embeddings minilm uses the real model (much slower).
+"""
+
+from benchmarks.fakes import FakeEmbeddingModel
+from concurrent.futures import ThreadPoolExecutor
+from src.data.bm25_index import BM25Index
+from src.data.real_retrieval import reciprocal_rank_fusion
+from src.utils.config import config
+from src.utils.timing import summarize_latencies
+import argparse
+import numpy as np
+import random
+import time
+
+CATEGORY_WORDS = {
+    "Billing": "payment invoice charge subscription refund card billing plan renewal receipt".split(),
+    "Technical": "error crash login app browser sync update install timeout server".split(),
+    "Security": "password account alert breach authentication device session access verify lock".split(),
+    "General": "hours contact feedback profile settings language export question support team".split(),
+}
+FILLER = "please help issue problem customer service today need want again still after before".split()
+
+def make_corpus(count: int, rare_vocab: int, rng: random.Random) -> list[dict]:
+    categories = list(CATEGORY_WORDS)
+    docs = []
+    for i in range(count):
+        category = categories[i % len(categories)]
+        rare = [f"code{rng.randrange(rare_vocab)}" for _ in range(3)]
+        words = rng.choices(CATEGORY_WORDS[category], k=12) + rng.choices(FILLER, k=8) + rare
+        rng.shuffle(words)
+        docs.append({"id": f"doc{i}", "content": " ".join(words), "category": category, "rare": rare})
+    return docs
+
+def make_queries(docs: list[dict], count: int, rng: random.Random) -> list[dict]:
+    queries = []
+    for doc in rng.sample(docs, count):
+        words = rng.sample(doc["rare"], 2) + rng.choices(CATEGORY_WORDS[doc["category"]], k=3)
+        queries.append({"text": " ".join(words), "category": doc["category"], "target": doc["id"]})
+    return queries
+
+def dense_search(matrix, ids, categories, query_vector, category, n_results):
+    scores = matrix @ query_vector
+    scores[categories != category] = -np.inf
+    top = np.argpartition(-scores, n_results - 1)[:n_results]
+    top = top[np.argsort(-scores[top])]
+    return [{"id": ids[row], "confidence": float(scores[row])} for row in top]
+
+def recall(results: list[list[dict]], queries: list[dict], k: int) -> float:
+    hits = sum(1 for ranking, query in zip(results, queries) if query["target"] in [r["id"] for r in ranking[:k]])
+    return hits / len(queries)
+
+def main():
+    parser = argparse.ArgumentParser(description="Dense vs hybrid retrieval benchmark")
+    parser.add_argument("--docs", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=5, help="Results per query / recall cutoff")
+    parser.add_argument("--rare-vocab", type=int, default=20000, help="Distinct rare terms in the corpus")
+    parser.add_argument("--embeddings", choices=["fake", "minilm"], default="fake")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    docs = make_corpus(args.docs, args.rare_vocab, rng)
+    queries = make_queries(docs, args.queries, rng)
+    candidates = max(args.k, config.HYBRID_CANDIDATES)
+    
+    if args.embeddings == "minilm":
+        from src.data.embeddings import get_embedding_model
+        model = get_embedding_model()
+    else:
+        model = FakeEmbeddingModel(encode_cost=0)
+    
+    print(f"🔎 Hybrid retrieval benchmark: {args.docs} docs, {args.queries} queries, k={args.k}, embeddings={args.embeddings}")
+    print("-" * 60)
+    
+    start = time.perf_counter()
+    matrix = np.asarray(model.encode([d["content"] for d in docs], batch_size=256, normalize_embeddings=True), dtype=np.float32)
+    ids = [d["id"] for d in docs]
+    categories = np.asarray([d["category"] for d in docs], dtype=object)
+    print(f"Embedded corpus in {time.perf_counter() - start:.1f}s")
+    
+    start = time.perf_counter()
+    index = BM25Index()
+    index.upsert(ids, [d["content"] for d in docs], [{"category": d["category"]} for d in docs])
+    print(f"Built BM25 index in {time.perf_counter() - start:.1f}s")
+    
+    query_vectors = np.asarray(model.encode([q["text"] for q in queries], normalize_embeddings=True), dtype=np.float32)
+    index.search(queries[0]["text"], queries[0]["category"], candidates)  # build term arrays for the warm path
+    
+    dense_results, dense_latency = [], []
+    for query, vector in zip(queries, query_vectors):
+        start = time.perf_counter()
+        dense_results.append(dense_search(matrix, ids, categories, vector, query["category"], args.k))
+        dense_latency.append(time.perf_counter() - start)
+    
+    keyword_results, keyword_latency = [], []
+    for query in queries:
+        start = time.perf_counter()
+        keyword_results.append(index.search(query["text"], query["category"], args.k))
+        keyword_latency.append(time.perf_counter() - start)
+    
+    hybrid_results, hybrid_latency = [], []
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        for query, vector in zip(queries, query_vectors):
+            start = time.perf_counter()
+            keyword_future = executor.submit(index.search, query["text"], query["category"], candidates)
+            dense = dense_search(matrix, ids, categories, vector, query["category"], candidates)
+            hybrid_results.append(reciprocal_rank_fusion([dense, keyword_future.result()])[:args.k])
+            hybrid_latency.append(time.perf_counter() - start)
+    
+    print(f"\n{'path':<10} {'recall@1':>9} {'recall@' + str(args.k):>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for name, results, latencies in (
+        ("dense", dense_results, dense_latency),
+        ("bm25", keyword_results, keyword_latency),
+        ("hybrid", hybrid_results, hybrid_latency)
+    ):
+        summary = summarize_latencies(latencies)
+        print(f"{name:<10} {recall(results, queries, 1):>9.3f} {recall(results, queries, args.k):>9.3f} "
+              f"{summary['p50'] * 1000:>8.2f} {summary['p99'] * 1000:>8.2f}")
+
+if __name__ == "__main__":
+    main()
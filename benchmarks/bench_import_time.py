@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmark CLI/dashboard startup cost.
+Run with: python -m benchmarks.bench_import_time [runs]
+
+Each entry-point module is imported in a fresh interpreter so nothing is
+shared between measurements. With lazy embedding/Chroma initialization
+none of these should load sentence-transformers at import time.
+"""
+
+import statistics
+import subprocess
+import sys
+import time
+
+ENTRY_POINTS = [
+    "app",
+    "main",
+    "batch_app",
+    "src.dashboard.app",
+    "src.agents.workflow",
+]
+
+# Modules that should only be imported once actually needed
+HEAVY_MODULES = ["sentence_transformers", "chromadb", "torch", "pandas"]
+
+def time_import(module: str) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", f"import {module}"], check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+def loaded_heavy_modules(module: str) -> list[str]:
+    code = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    output = subprocess.run([sys.executable, "-c", code], check=True,
+                            capture_output=True, text=True).stdout.strip()
+    return [m for m in output.splitlines()[-1].split(",") if m] if output else []
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    
+    baseline = statistics.median(time_import("sys") for _ in range(runs))
+    
+    print(f"📏 Import time over {runs} fresh interpreters (interpreter startup {baseline * 1000:.0f}ms subtracted)")
+    print("-" * 50)
+    for module in ENTRY_POINTS:
+        median = statistics.median(time_import(module) for _ in range(runs)) - baseline
+        heavy = loaded_heavy_modules(module)
+        print(f"{module:<24} {median * 1000:8.0f}ms   heavy modules: {', '.join(heavy) or 'none'}")
+
+if __name__ == "__main__":
+    main()
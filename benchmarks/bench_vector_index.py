@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark the memory-mapped NumPy vector index against Chroma.
+Run with: python -m benchmarks.bench_vector_index [--chunks 50000] [--queries 1000]
+
+Generates clustered, unit-normalized 384-dim embeddings spread over the
+four categories, loads them into an in-memory Chroma collection and into
+float32 and int8 NumPy indexes, and runs the same category-filtered
+top-k queries against each. Reports p50/p99 latency and recall@k against
+exact float32 search. Chroma is skipped if chromadb isn't installed.
+"""
+
+from src.data.vector_index import build_vector_index
+from src.utils.config import config
+from src.utils.timing import summarize_latencies
+import argparse
+import numpy as np
+import tempfile
+import time
+
+def make_embeddings(count: int, dim: int, rng: np.random.Generator) -> np.ndarray:
+    """Topic clusters plus noise, so neighbours are meaningful"""
+    centroids = rng.normal(size=(64, dim)).astype(np.float32)
+    vectors = centroids[rng.integers(0, len(centroids), count)] + 0.6 * rng.normal(size=(count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+def timed(search, queries: list[tuple]) -> tuple[list[list[str]], dict]:
+    results, latencies = [], []
+    for vector, category in queries:
+        start = time.perf_counter()
+        results.append(search(vector, category))
+        latencies.append(time.perf_counter() - start)
+    return results, summarize_latencies(latencies)
+
+def recall(results: list[list[str]], exact: list[list[str]]) -> float:
+    found = sum(len(set(r) & set(e)) for r, e in zip(results, exact))
+    return found / sum(len(e) for e in exact)
+
+def build_chroma(ids, embeddings, documents, metadatas):
+    try:
+        import chromadb
+    except ImportError:
+        print("⚠️ chromadb not installed; skipping the Chroma comparison")
+        return None
+    
+    collection = chromadb.EphemeralClient().get_or_create_collection(
+        name="bench_vector_index", metadata={"hnsw:space": "cosine"}
+    )
+    for start in range(0, len(ids), 5000):
+        end = start + 5000
+        collection.upsert(
+            ids=ids[start:end],
+            embeddings=embeddings[start:end].tolist(),
+            documents=documents[start:end],
+            metadatas=metadatas[start:end]
+        )
+    return collection
+
+def main():
+    parser = argparse.ArgumentParser(description="NumPy vector index vs Chroma benchmark")
+    parser.add_argument("--chunks", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(args.seed)
+    embeddings = make_embeddings(args.chunks, args.dim, rng)
+    ids = [f"chunk{i}" for i in range(args.chunks)]
+    documents = [f"document {i}" for i in range(args.chunks)]
+    metadatas = [{"category": config.CATEGORIES[i % len(config.CATEGORIES)], "type": "synthetic"} for i in range(args.chunks)]
+    queries = [
+        (vector, config.CATEGORIES[int(rng.integers(len(config.CATEGORIES)))])
+        for vector in make_embeddings(args.queries, args.dim, rng)
+    ]
+    
+    print(f"🧮 Vector index benchmark: {args.chunks} chunks x {args.dim} dims, {args.queries} queries, k={args.k}")
+    print("-" * 60)
+    
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="vector-index-") as workdir:
+        float_index = build_vector_index(f"{workdir}/float32", ids, embeddings, documents, metadatas)
+        int8_index = build_vector_index(f"{workdir}/int8", ids, embeddings, documents, metadatas, quantize=True)
+        
+        exact, float_latency = timed(lambda v, c: [r["id"] for r in float_index.search(v, c, args.k)], queries)
+        rows.append(("numpy float32", float_latency, 1.0))
+        
+        int8_results, int8_latency = timed(lambda v, c: [r["id"] for r in int8_index.search(v, c, args.k)], queries)
+        rows.append(("numpy int8", int8_latency, recall(int8_results, exact)))
+        
+        collection = build_chroma(ids, embeddings, documents, metadatas)
+        if collection is not None:
+            def chroma_search(vector, category):
+                results = collection.query(
+                    query_embeddings=[vector.tolist()],
+                    n_results=args.k,
+                    where={"category": {"$eq": category}},
+                    include=["documents", "metadatas", "distances"]
+                )
+                return results["ids"][0]
+            
+            chroma_results, chroma_latency = timed(chroma_search, queries)
+            rows.append(("chroma", chroma_latency, recall(chroma_results, exact)))
+    
+    print(f"{'backend':<15} {'p50 ms':>8} {'p99 ms':>8} {'recall@' + str(args.k):>10}")
+    for name, latency, recall_at_k in rows:
+        print(f"{name:<15} {latency['p50'] * 1000:>8.3f} {latency['p99'] * 1000:>8.3f} {recall_at_k:>10.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-request workflow setup overhead.
+Run with: python -m benchmarks.bench_workflow_compile [iterations]
+
+Compares compiling the LangGraph StateGraph on every request (the old
+/api/process-ticket behaviour) with reusing the cached compiled graph.
+"""
+
+import logging
+import sys
+import time
+from src.agents.workflow import create_support_workflow, get_support_workflow
+from src.utils.timing import summarize_latencies
+
+def time_calls(fn, iterations: int) -> list[float]:
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+def print_summary(label: str, latencies: list[float]):
+    summary = summarize_latencies(latencies)
+    print(f"{label:<28} mean={summary['mean'] * 1000:8.3f}ms "
+          f"p50={summary['p50'] * 1000:8.3f}ms p95={summary['p95'] * 1000:8.3f}ms "
+          f"p99={summary['p99'] * 1000:8.3f}ms")
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    
+    # Silence the per-compile info log so it doesn't dominate the timing
+    logging.getLogger("src.agents.workflow").setLevel(logging.WARNING)
+    
+    print(f"📏 Workflow setup overhead over {iterations} requests")
+    print("-" * 50)
+    
+    before = time_calls(create_support_workflow, iterations)
+    get_support_workflow()  # warm-up, as done at server start
+    after = time_calls(get_support_workflow, iterations)
+    
+    print_summary("compile per request", before)
+    print_summary("cached compiled graph", after)
+    
+    saved = summarize_latencies(before)["mean"] - summarize_latencies(after)["mean"]
+    print(f"\n⚡ Saved {saved * 1000:.3f}ms of pure overhead per ticket")
+
+if __name__ == "__main__":
+    main()
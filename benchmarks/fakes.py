@@ -0,0 +1,129 @@
+"""
+Deterministic local stand-ins for the Groq chat model and the MiniLM
+embedding model, so the full workflow can be benchmarked without network.
+"""
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+import asyncio
+import hashlib
+import math
+import random
+import re
+import time
+import numpy as np
+import zlib
+
+CATEGORY_KEYWORDS = {
+    "Billing": ["payment", "refund", "invoice", "billing", "subscription", "charge", "card"],
+    "Security": ["security", "password", "suspicious", "2fa", "two factor", "privacy", "breach"],
+    "Technical": ["crash", "error", "login", "app", "bug", "slow", "api"],
+}
+
+DRAFT_TEMPLATE = (
+    "Thank you for reaching out about \"{subject}\". We understand how frustrating this can be. "
+    "Based on our help center, here are the steps that usually resolve it: first, check your account "
+    "settings; second, try signing out and back in; third, contact us again if the issue persists and "
+    "our team will take a closer look. We're here to help."
+)
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+class FakeChatGroq(BaseChatModel):
+    """Mimics ChatGroq: lognormal latency, canned classification/draft/review
+    outputs and token usage metadata. Outputs are a pure function of the
+    prompt and seed, so runs are reproducible at any concurrency."""
+    
+    model_name: str = "fake-llama-3.1-8b-instant"
+    temperature: float = 0.1
+    latency_median: float = 0.3
+    latency_sigma: float = 0.4
+    reject_rate: float = 0.2
+    seed: int = 0
+    
+    @property
+    def _llm_type(self) -> str:
+        return "fake-groq"
+    
+    def _rng(self, prompt: str) -> random.Random:
+        return random.Random(zlib.crc32(f"{self.seed}|{prompt}".encode("utf-8")))
+    
+    def _latency(self, rng: random.Random) -> float:
+        return self.latency_median * math.exp(rng.gauss(0, self.latency_sigma))
+    
+    def _respond(self, prompt: str, rng: random.Random) -> str:
+        if "ticket classification system" in prompt:
+            ticket_text = prompt.split("Ticket Subject:", 1)[-1].split("Analyze the ticket", 1)[0].lower()
+            for category, keywords in CATEGORY_KEYWORDS.items():
+                if any(keyword in ticket_text for keyword in keywords):
+                    return category
+            return "General"
+        
+        if "quality assurance reviewer" in prompt:
+            if rng.random() < self.reject_rate:
+                return "VERDICT: rejected\nFEEDBACK: The draft makes a promise about refund timelines that violates policy."
+            return "VERDICT: approved\nFEEDBACK: Clear, accurate and policy compliant."
+        
+        match = re.search(r"Subject:\**\s*(.+)", prompt)
+        return DRAFT_TEMPLATE.format(subject=match.group(1).strip() if match else "your request")
+    
+    def _result(self, prompt: str, content: str) -> ChatResult:
+        usage = {
+            "input_tokens": estimate_tokens(prompt),
+            "output_tokens": estimate_tokens(content),
+            "total_tokens": estimate_tokens(prompt) + estimate_tokens(content)
+        }
+        message = AIMessage(
+            content=content,
+            usage_metadata=usage,
+            response_metadata={
+                "model_name": self.model_name,
+                "token_usage": {
+                    "prompt_tokens": usage["input_tokens"],
+                    "completion_tokens": usage["output_tokens"],
+                    "total_tokens": usage["total_tokens"]
+                }
+            }
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+    
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        prompt = "\n".join(str(m.content) for m in messages)
+        rng = self._rng(prompt)
+        time.sleep(self._latency(rng))
+        return self._result(prompt, self._respond(prompt, rng))
+    
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        prompt = "\n".join(str(m.content) for m in messages)
+        rng = self._rng(prompt)
+        await asyncio.sleep(self._latency(rng))
+        return self._result(prompt, self._respond(prompt, rng))
+
+class FakeEmbeddingModel:
+    """Hashed bag-of-words embeddings with a SentenceTransformer-style encode()"""
+    
+    def __init__(self, dimensions: int = 384, encode_cost: float = 0.0005):
+        self.dimensions = dimensions
+        self.encode_cost = encode_cost  # simulated CPU seconds per text
+    
+    def _embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for token in re.findall(r"[a-z0-9]+", text.lower()):
+            digest = hashlib.md5(token.encode("utf-8")).digest()
+            index = int.from_bytes(digest[:4], "little") % self.dimensions
+            vector[index] += 1.0 if digest[4] % 2 else -1.0
+        return vector
+    
+    def encode(self, texts, batch_size: int = 32, normalize_embeddings: bool = False, **kwargs) -> np.ndarray:
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        if self.encode_cost:
+            time.sleep(self.encode_cost * len(texts))
+        
+        matrix = np.vstack([self._embed(text) for text in texts]) if texts else np.zeros((0, self.dimensions), dtype=np.float32)
+        if normalize_embeddings:
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix = matrix / np.where(norms == 0, 1, norms)
+        return matrix[0] if single else matrix
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Offline end-to-end benchmark of the support workflow.
+Run with: python -m benchmarks.run_suite [--concurrency 1,4,16,64] [--mode thread|async]
+
+Replaces ChatGroq with a deterministic FakeChatGroq (lognormal latency,
+configurable reject rate) and the MiniLM model with hashed embeddings, and
+ingests the sample knowledge base into a throwaway Chroma directory, so
+runs need no API key or network and are comparable across commits.
+
+For each concurrency level it reports throughput, end-to-end p50/p95/p99,
+the process memory high-water mark and per-node p50/p95.
+"""
+
+from benchmarks.fakes import FakeChatGroq, FakeEmbeddingModel
+from src.utils.config import config
+import argparse
+import asyncio
+import json
+import resource
+import sys
+import tempfile
+import tracemalloc
+
+SUBJECTS = [
+    ("Payment failed for monthly subscription", "My card was declined when renewing, please help with the charge."),
+    ("Cannot login to my account", "The app shows an error every time I try to log in."),
+    ("Mobile app crashing on startup", "After the last update the app crashes immediately."),
+    ("Suspicious login alert", "I got a security alert about a login from another country."),
+    ("What are your support hours", "I would like to know when your team is available."),
+    ("Refund for annual plan", "I was charged twice for the annual plan and want a refund invoice."),
+    ("Two factor authentication codes not arriving", "My 2FA codes never arrive by SMS."),
+    ("Export my data", "How can I download everything stored in my account?"),
+]
+
+def make_tickets(count: int, run: int) -> list[dict]:
+    """Unique synthetic tickets, so exact-match caches don't hide LLM latency"""
+    tickets = []
+    for i in range(count):
+        subject, description = SUBJECTS[i % len(SUBJECTS)]
+        tickets.append({
+            "id": f"{run}-{i}",
+            "ticket": {"subject": subject, "description": f"{description} (reference {run}-{i})"}
+        })
+    return tickets
+
+def max_rss_mb() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return usage / (1024 * 1024) if sys.platform == "darwin" else usage / 1024
+
+def configure(args, workdir: str):
+    """Point every on-disk artifact at workdir and install the fakes"""
+    config.CHROMA_PERSIST_DIR = f"{workdir}/chroma_db"
+    config.ESCALATION_LOG_FILE = f"{workdir}/escalation_log.csv"
+    config.DASHBOARD_DB_PATH = f"{workdir}/dashboard.db"
+    config.RESPONSE_CACHE_PATH = ""
+    config.RESPONSE_CACHE_ENABLED = args.fast_paths
+    config.LOCAL_CLASSIFIER_ENABLED = args.fast_paths
+    config.PARALLEL_RETRIEVAL = args.parallel_retrieval
+    
+    from src.utils.llm_utils import set_llm_factory
+    from src.data.embeddings import set_embedding_model
+    
+    set_llm_factory(lambda model_name, temperature: FakeChatGroq(
+        model_name=model_name,
+        temperature=temperature,
+        latency_median=args.latency_ms / 1000,
+        reject_rate=args.reject_rate,
+        seed=args.seed
+    ))
+    set_embedding_model(FakeEmbeddingModel())
+
+def build_chroma_fixture() -> bool:
+    """Ingest the sample documents into the temporary Chroma directory"""
+    try:
+        from src.data.ingest_documents import DocumentIngestor
+        DocumentIngestor().ingest_documents()
+    except ImportError as e:
+        print(f"⚠️ chromadb unavailable ({e}); retrieval will use the mock knowledge base")
+        return False
+    
+    from src.data.real_retrieval import retrieval_system
+    retrieval_system.reload()
+    return True
+
+def run_level(args, concurrency: int, run: int) -> dict:
+    from src.agents.batch import process_batch, aprocess_batch
+    from src.agents.classification_node import classification_cache
+    from src.utils.metrics import metrics
+    
+    metrics.reset()
+    classification_cache.clear()
+    tickets = make_tickets(args.tickets, run)
+    
+    if args.trace_memory:
+        tracemalloc.reset_peak()
+    
+    if args.mode == "async":
+        _, stats = asyncio.run(aprocess_batch(tickets, concurrency))
+    else:
+        _, stats = process_batch(tickets, concurrency)
+    
+    stats["max_rss_mb"] = round(max_rss_mb(), 1)
+    if args.trace_memory:
+        stats["python_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+    return stats
+
+def print_level(stats: dict):
+    latency = stats["latency"]
+    memory = f"rss {stats['max_rss_mb']}MB"
+    if "python_peak_mb" in stats:
+        memory += f", python peak {stats['python_peak_mb']}MB"
+    
+    print(f"\nconcurrency={stats['concurrency']}: {stats['tickets']} tickets in {stats['elapsed_seconds']}s "
+          f"({stats['throughput']} tickets/sec), {memory}")
+    print(f"  latency p50={latency['p50']}s p95={latency['p95']}s p99={latency['p99']}s max={latency['max']}s")
+    print(f"  status: {stats['by_status']}, LLM tokens/ticket {stats['avg_tokens']} "
+          f"(escalated: {stats['avg_tokens_escalated']})")
+    for node, node_stats in stats["node_latency"].items():
+        print(f"  {node:<18} p50={node_stats['p50']}s p95={node_stats['p95']}s (n={node_stats['count']})")
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline workflow benchmark with a fake LLM")
+    parser.add_argument("--tickets", type=int, default=64, help="Tickets per concurrency level (default: 64)")
+    parser.add_argument("--concurrency", default="1,4,16,64", help="Comma-separated concurrency levels")
+    parser.add_argument("--mode", choices=["thread", "async"], default="thread")
+    parser.add_argument("--latency-ms", type=float, default=300, help="Median fake LLM latency (default: 300)")
+    parser.add_argument("--reject-rate", type=float, default=0.2, help="Fraction of reviews rejected (default: 0.2)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fast-paths", action="store_true",
+                        help="Keep the response cache and local classifier enabled")
+    parser.add_argument("--parallel-retrieval", action="store_true",
+                        help="Prefetch context in parallel with classification")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Also report the Python heap peak via tracemalloc (slower)")
+    parser.add_argument("--json-output", help="Write per-level stats to this JSON file")
+    args = parser.parse_args()
+    
+    levels = [int(level) for level in args.concurrency.split(",") if level.strip()]
+    
+    with tempfile.TemporaryDirectory(prefix="ticket-bench-") as workdir:
+        configure(args, workdir)
+        chroma = build_chroma_fixture()
+        
+        if args.trace_memory:
+            tracemalloc.start()
+        
+        print(f"🏁 Offline benchmark: {args.tickets} tickets/level, mode={args.mode}, "
+              f"LLM p50={args.latency_ms}ms, reject rate={args.reject_rate}, "
+              f"retrieval={'chroma' if chroma else 'mock'}{' (parallel)' if args.parallel_retrieval else ''}")
+        print("-" * 60)
+        
+        results = []
+        for run, concurrency in enumerate(levels):
+            stats = run_level(args, concurrency, run)
+            print_level(stats)
+            results.append(stats)
+        
+        from src.utils.escalation_writer import get_escalation_writer
+        get_escalation_writer().close()
+    
+    if args.json_output:
+        with open(args.json_output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📄 Stats written to {args.json_output}")
+
+if __name__ == "__main__":
+    main()
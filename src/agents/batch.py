@@ -0,0 +1,155 @@
+from concurrent.futures import ThreadPoolExecutor
+from src.agents.state import create_initial_state
+from src.agents.workflow import get_support_workflow, get_async_support_workflow
+from src.utils.timing import summarize_latencies
+from src.utils.metrics import metrics
+from src.utils.llm_utils import aclose_loop_llms, total_tokens
+import asyncio
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+def parse_ticket(record: dict, line_number: int) -> dict:
+    """Build a ticket from a JSONL record.
+
+    Accepts subject/description fields, or title/body as used by
+    requests.jsonl-style files. The id falls back to the line number.
+    """
+    subject = record.get("subject", record.get("title", ""))
+    description = record.get("description", record.get("body", ""))
+    ticket_id = record.get("id", record.get("ticket_id", record.get("request_id", line_number)))
+    
+    return {
+        "id": ticket_id,
+        "ticket": {"subject": subject, "description": description}
+    }
+
+def load_tickets(path: str) -> list[dict]:
+    """Load tickets from a JSONL file, skipping blank, malformed and non-object lines"""
+    tickets = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.error(f"Skipping malformed line {line_number} in {path}: {e}")
+                continue
+            if not isinstance(record, dict):
+                logger.error(f"Skipping line {line_number} in {path}: expected a JSON object, "
+                             f"got {type(record).__name__}")
+                continue
+            tickets.append(parse_ticket(record, line_number))
+    return tickets
+
+def build_output(item: dict, result: dict = None, error: Exception = None) -> dict:
+    """Build the JSONL output record for a processed ticket"""
+    output = {"id": item["id"], "subject": item["ticket"]["subject"]}
+    
+    if error is not None:
+        logger.error(f"Ticket {item['id']} failed: {error}")
+        output.update({
+            "category": None,
+            "review_status": "error",
+            "retry_count": 0,
+            "cache_hit": False,
+            "tokens": 0,
+            "response": None,
+            "error": str(error)
+        })
+    else:
+        output.update({
+            "category": result.get("category"),
+            "review_status": result.get("review_status"),
+            "retry_count": result.get("retry_count", 0),
+            "cache_hit": result.get("cache_hit", False),
+            "tokens": total_tokens(result.get("token_usage")),
+            "response": result.get("draft_response"),
+            "error": None
+        })
+    
+    return output
+
+def process_one(workflow, item: dict) -> dict:
+    """Run one ticket through the workflow, capturing latency and errors"""
+    start = time.perf_counter()
+    
+    try:
+        output = build_output(item, result=workflow.invoke(create_initial_state(item["ticket"])))
+    except Exception as e:
+        output = build_output(item, error=e)
+    
+    output["latency_seconds"] = round(time.perf_counter() - start, 4)
+    return output
+
+async def aprocess_one(workflow, item: dict, semaphore: asyncio.Semaphore) -> dict:
+    """Run one ticket through the async workflow, bounded by the semaphore"""
+    async with semaphore:
+        start = time.perf_counter()
+        
+        try:
+            result = await workflow.ainvoke(create_initial_state(item["ticket"]))
+            output = build_output(item, result=result)
+        except Exception as e:
+            output = build_output(item, error=e)
+        
+        output["latency_seconds"] = round(time.perf_counter() - start, 4)
+        return output
+
+def process_batch(tickets: list[dict], concurrency: int = 4) -> tuple[list[dict], dict]:
+    """Process tickets concurrently, returning results in input order and run stats"""
+    workflow = get_support_workflow()
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        # executor.map yields results in submission order
+        results = list(executor.map(lambda item: process_one(workflow, item), tickets))
+    elapsed = time.perf_counter() - start
+    
+    return results, build_stats(results, elapsed, concurrency)
+
+async def aprocess_batch(tickets: list[dict], concurrency: int = 32) -> tuple[list[dict], dict]:
+    """Process tickets on the event loop with at most `concurrency` in flight"""
+    workflow = get_async_support_workflow()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    
+    start = time.perf_counter()
+    try:
+        # gather returns results in the order the coroutines were passed
+        results = await asyncio.gather(*(aprocess_one(workflow, item, semaphore) for item in tickets))
+        elapsed = time.perf_counter() - start
+    finally:
+        # Connections opened on this loop can't be reused once it ends
+        await aclose_loop_llms()
+    
+    return list(results), build_stats(list(results), elapsed, concurrency)
+
+def build_stats(results: list[dict], elapsed: float, concurrency: int) -> dict:
+    """Compute throughput and latency percentiles for a batch run"""
+    latencies = [r["latency_seconds"] for r in results]
+    by_status = {}
+    for r in results:
+        by_status[r["review_status"]] = by_status.get(r["review_status"], 0) + 1
+    escalated_tokens = [r["tokens"] for r in results if r["review_status"] == "escalated"]
+    
+    return {
+        "tickets": len(results),
+        "concurrency": concurrency,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput": round(len(results) / elapsed, 3) if elapsed > 0 else 0,
+        "latency": summarize_latencies(latencies),
+        "by_status": by_status,
+        "avg_tokens": round(sum(r["tokens"] for r in results) / len(results), 1) if results else 0,
+        "avg_tokens_escalated": round(sum(escalated_tokens) / len(escalated_tokens), 1) if escalated_tokens else 0,
+        "node_latency": metrics.percentiles("node_duration_seconds", by="node")
+    }
+
+def write_results(path: str, results: list[dict]):
+    """Write batch results as JSONL, one line per input ticket"""
+    with open(path, 'w', encoding='utf-8') as f:
+        for result in results:
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
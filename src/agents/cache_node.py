@@ -0,0 +1,55 @@
+from langchain_core.messages import HumanMessage
+from src.data.response_cache import get_response_cache
+from src.agents.state import State
+from src.utils.config import config
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+def lookup_cached_response(state: State) -> dict:
+    """Serve a previously approved draft for a near-duplicate ticket"""
+    if not config.RESPONSE_CACHE_ENABLED:
+        return {"cache_hit": False}
+    
+    try:
+        entry = get_response_cache().lookup(state["ticket"], state["category"])
+    except Exception as e:
+        logger.error(f"Response cache lookup failed: {e}")
+        entry = None
+    
+    if entry is None:
+        return {"cache_hit": False}
+    
+    return {
+        "draft_response": entry["draft_response"],
+        "review_status": "approved",
+        "review_feedback": f"Served from response cache (similar to: {entry['subject']})",
+        "cache_hit": True,
+        "messages": [HumanMessage(content=f"Response served from cache (similarity {entry['similarity']:.2f})")]
+    }
+
+def route_after_cache(state: State) -> str:
+    """Skip drafting and review entirely on a cache hit"""
+    return "hit" if state.get("cache_hit") else "miss"
+
+def store_approved_response(state: State) -> dict:
+    """Remember an approved draft so near-duplicate tickets can reuse it"""
+    if not config.RESPONSE_CACHE_ENABLED or state.get("cache_hit"):
+        return {}
+    
+    if state.get("review_status") == "approved" and state.get("draft_response"):
+        try:
+            get_response_cache().store(state["ticket"], state["category"], state["draft_response"])
+        except Exception as e:
+            logger.error(f"Failed to cache approved response: {e}")
+    
+    return {}
+
+async def alookup_cached_response(state: State) -> dict:
+    """Async variant: embedding runs in a worker thread"""
+    return await asyncio.to_thread(lookup_cached_response, state)
+
+async def astore_approved_response(state: State) -> dict:
+    """Async variant: embedding and persistence run in a worker thread"""
+    return await asyncio.to_thread(store_approved_response, state)
@@ -1,43 +1,146 @@
 from langchain_core.messages import HumanMessage
 from langgraph.graph import StateGraph, START, END
-from src.utils.llm_utils import get_classification_llm
+from src.utils.llm_utils import get_classification_llm, invoke_llm, ainvoke_llm
 from src.utils.prompts import get_classification_prompt
 from src.utils.config import config
+from src.utils.cache import LRUCache, ticket_hash
+from src.utils.metrics import metrics
 from src.utils.logger import setup_logging
+from src.data.local_classifier import get_local_classifier, ticket_text
 from src.agents.state import State
+import asyncio
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
-def classify_ticket(state: State) -> dict:
-    """Classify the support ticket into a category"""
-    ticket = state["ticket"]
-    
-    logger.info(f"Classifying ticket: {ticket['subject']}")
-    
-    # Prepare the prompt
+# Normalized ticket hash -> category, so duplicate submissions skip the LLM
+classification_cache = LRUCache(
+    max_size=config.CLASSIFICATION_CACHE_MAX_ENTRIES,
+    ttl_seconds=config.CLASSIFICATION_CACHE_TTL_SECONDS,
+    persist_path=config.CLASSIFICATION_CACHE_PATH or None,
+    persist_interval=5,
+    name="classification"
+)
+
+# Tickets decided by the local classifier vs handed to the LLM; updated
+# from worker threads, so guarded by a lock
+local_classifier_stats = {"confident": 0, "fallbacks": 0}
+_stats_lock = threading.Lock()
+
+def get_classification_cache_stats() -> dict:
+    """Get exact-match classification cache and local classifier counters"""
+    stats = classification_cache.stats()
+    with _stats_lock:
+        counts = dict(local_classifier_stats)
+    decided = counts["confident"] + counts["fallbacks"]
+    stats["local_classifier"] = {
+        **counts,
+        "llm_calls_avoided": round(counts["confident"] / decided * 100, 2) if decided > 0 else 0
+    }
+    return stats
+
+def build_classification_messages(ticket: dict) -> list:
+    """Prepare the classification prompt messages for a ticket"""
     prompt = get_classification_prompt()
-    messages = prompt.format_messages(
+    return prompt.format_messages(
         categories=", ".join(config.CATEGORIES),
         subject=ticket["subject"],
         description=ticket["description"]
     )
-    
-    # Get LLM response
-    llm = get_classification_llm()
-    response = llm.invoke(messages)
-    
+
+def parse_category(content: str) -> str:
+    """Extract and validate the category from the LLM output"""
     # Extract and clean the category
-    category = response.content.strip()
+    category = content.strip()
     
     # Validate category
     if category not in config.CATEGORIES:
         logger.warning(f"LLM returned invalid category: {category}. Defaulting to 'General'")
         category = "General"
     
-    logger.info(f"Ticket classified as: {category}")
+    return category
+
+def classification_result(category: str, source: str) -> dict:
+    """Build the state update for a classified ticket.
+    
+    source records who decided the label ("llm", "local" or "cache"), so
+    only LLM labels are used to train and evaluate the local classifier.
+    """
+    logger.info(f"Ticket classified as: {category} ({source})")
     
     return {
         "category": category,
+        "category_source": source,
         "messages": [HumanMessage(content=f"Ticket classified as: {category}")]
-    }
\ No newline at end of file
+    }
+
+def fast_path_category(ticket: dict, key: str):
+    """Classify without the LLM: exact-match cache first, then the local classifier.
+    
+    Returns (category, source), or None when the LLM has to decide.
+    """
+    cached_category = classification_cache.get(key)
+    if cached_category is not None:
+        logger.info("Classification served from cache")
+        return cached_category, "cache"
+    
+    if not config.LOCAL_CLASSIFIER_ENABLED:
+        return None
+    
+    try:
+        category, confidence = get_local_classifier().predict(ticket_text(ticket['subject'], ticket['description']))
+    except Exception as e:
+        logger.error(f"Local classifier failed, falling back to LLM: {e}")
+        return None
+    
+    if confidence < config.LOCAL_CLASSIFIER_THRESHOLD:
+        with _stats_lock:
+            local_classifier_stats["fallbacks"] += 1
+        metrics.inc("cache_requests_total", cache="local_classifier", result="miss")
+        logger.info(f"Local classifier unsure ({category}, {confidence:.2f}); asking LLM")
+        return None
+    
+    with _stats_lock:
+        local_classifier_stats["confident"] += 1
+    metrics.inc("cache_requests_total", cache="local_classifier", result="hit")
+    logger.info(f"Local classifier: {category} ({confidence:.2f})")
+    classification_cache.set(key, category)
+    return category, "local"
+
+def classify_ticket(state: State) -> dict:
+    """Classify the support ticket into a category"""
+    ticket = state["ticket"]
+    
+    logger.info(f"Classifying ticket: {ticket['subject']}")
+    
+    key = ticket_hash(ticket["subject"], ticket["description"])
+    fast_path = fast_path_category(ticket, key)
+    if fast_path is not None:
+        return classification_result(*fast_path)
+    
+    # Get LLM response
+    llm = get_classification_llm()
+    response = invoke_llm(llm, build_classification_messages(ticket), "classify_ticket")
+    
+    category = parse_category(response.content)
+    classification_cache.set(key, category)
+    return classification_result(category, "llm")
+
+async def aclassify_ticket(state: State) -> dict:
+    """Classify the support ticket into a category without blocking the event loop"""
+    ticket = state["ticket"]
+    
+    logger.info(f"Classifying ticket: {ticket['subject']}")
+    
+    key = ticket_hash(ticket["subject"], ticket["description"])
+    fast_path = await asyncio.to_thread(fast_path_category, ticket, key)
+    if fast_path is not None:
+        return classification_result(*fast_path)
+    
+    llm = get_classification_llm()
+    response = await ainvoke_llm(llm, build_classification_messages(ticket), "classify_ticket")
+    
+    category = parse_category(response.content)
+    classification_cache.set(key, category)
+    return classification_result(category, "llm")
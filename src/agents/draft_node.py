@@ -1,40 +1,126 @@
 from langchain_core.messages import HumanMessage
-from src.utils.llm_utils import get_draft_llm
-from src.utils.prompts import get_draft_prompt
+from src.utils.llm_utils import get_draft_llm, invoke_llm, ainvoke_llm, stream_llm, astream_llm, attempt_usage
+from src.utils.prompts import get_draft_prompt, get_revision_prompt
+from src.utils.policy_rules import security_redactor
+from src.utils.context_assembler import assemble_context
+from src.utils.metrics import metrics
+from src.utils.config import config
 from src.agents.state import State
 import logging
 
 logger = logging.getLogger(__name__)
 
-def generate_draft_response(state: State) -> dict:
-    """Generate a draft response using the ticket and context"""
-    ticket = state["ticket"]
-    context = state["context"]
-    
-    logger.info(f"Generating draft response for: {ticket['subject']}")
-    logger.info(f"Using {len(context)} context items")
-    
+def build_draft_messages(ticket: dict, context: list[str]) -> list:
+    """Prepare the draft prompt messages for a ticket and its context"""
     # Format context for the prompt
     formatted_context = "\n".join([f"• {item}" for item in context])
     
     # Prepare the prompt
     prompt = get_draft_prompt()
-    messages = prompt.format_messages(
+    return prompt.format_messages(
         subject=ticket["subject"],
         description=ticket["description"],
         context=formatted_context
     )
+
+def build_revision_messages(ticket: dict, draft_response: str, review_feedback: str,
+                            guidance: list[str], context: list[str] = None) -> list:
+    """Prepare an edit request: the ticket, the top knowledge base context,
+    the rejected draft and the review feedback"""
+    prompt = get_revision_prompt()
+    return prompt.format_messages(
+        subject=ticket["subject"],
+        description=ticket["description"],
+        context="\n".join([f"• {item}" for item in context or []]) or "• None available.",
+        draft_response=draft_response,
+        review_feedback=review_feedback,
+        guidance="\n".join([f"• {item}" for item in guidance]) or "• Follow the reviewer feedback."
+    )
+
+def is_revision(state: State) -> bool:
+    """Whether this attempt revises a rejected draft rather than drafting anew"""
+    return (
+        config.REVISION_MODE
+        and state.get("retry_count", 0) > 0
+        and bool(state.get("draft_response"))
+        and bool(state.get("review_feedback"))
+    )
+
+def build_messages_for_state(state: State) -> list:
+    """Draft or revision prompt messages for the current attempt"""
+    ticket = state["ticket"]
     
-    # Get LLM response
-    llm = get_draft_llm()
-    response = llm.invoke(messages)
+    if is_revision(state):
+        logger.info(f"Revising rejected draft (attempt {state['retry_count'] + 1})")
+        guidance = state.get("revision_context") or []
+        top_context = (state.get("context") or [])[:config.REVISION_CONTEXT_ITEMS]
+        # One budget for both; guidance first so it is never trimmed away
+        assembled = assemble_ticket_context(ticket, guidance + top_context)
+        return build_revision_messages(
+            ticket,
+            state["draft_response"],
+            state["review_feedback"],
+            [item for item in assembled if item in guidance],
+            [item for item in assembled if item not in guidance]
+        )
     
-    draft_response = response.content.strip()
+    context = assemble_ticket_context(ticket, state["context"])
+    logger.info(f"Using {len(context)} context items")
+    return build_draft_messages(ticket, context)
+
+def assemble_ticket_context(ticket: dict, snippets: list[str]) -> list[str]:
+    """Deduplicate and budget context snippets, logging the tokens saved"""
+    context, stats = assemble_context(snippets)
+    if stats["tokens_saved"]:
+        logger.info(f"Context for '{ticket['subject']}': {stats['tokens_before']} -> {stats['tokens_after']} tokens "
+                    f"({stats['tokens_saved']} saved, {stats['duplicates']} duplicates dropped)")
+    return context
+
+def draft_result(response, attempt: int = 0) -> dict:
+    """Turn the draft LLM response into a state update"""
+    # Every outgoing draft passes through the security redactor
+    draft_response, redactions = security_redactor.redact(response.content.strip())
     
     logger.info(f"Draft response generated ({len(draft_response)} characters)")
     logger.debug(f"Draft preview: {draft_response[:100]}...")
+    if redactions:
+        metrics.inc("draft_redactions_total", len(redactions))
+        logger.info(f"Redacted {len(redactions)} security term(s): {[r['term'] for r in redactions]}")
     
     return {
         "draft_response": draft_response,
+        "redactions": redactions,
+        "token_usage": [attempt_usage(response, "generate_draft", attempt)],
         "messages": [HumanMessage(content=f"Draft response generated:\n{draft_response}")]
-    }
\ No newline at end of file
+    }
+
+def generate_draft_response(state: State) -> dict:
+    """Generate a draft response using the ticket and context"""
+    ticket = state["ticket"]
+    
+    logger.info(f"Generating draft response for: {ticket['subject']}")
+    
+    # Get LLM response
+    llm = get_draft_llm()
+    messages = build_messages_for_state(state)
+    if config.DRAFT_STREAMING:
+        response = stream_llm(llm, messages, "generate_draft")
+    else:
+        response = invoke_llm(llm, messages, "generate_draft")
+    
+    return draft_result(response, state.get("retry_count", 0))
+
+async def agenerate_draft_response(state: State) -> dict:
+    """Generate a draft response without blocking the event loop"""
+    ticket = state["ticket"]
+    
+    logger.info(f"Generating draft response for: {ticket['subject']}")
+    
+    llm = get_draft_llm()
+    messages = build_messages_for_state(state)
+    if config.DRAFT_STREAMING:
+        response = await astream_llm(llm, messages, "generate_draft")
+    else:
+        response = await ainvoke_llm(llm, messages, "generate_draft")
+    
+    return draft_result(response, state.get("retry_count", 0))
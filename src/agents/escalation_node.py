@@ -1,51 +1,36 @@
 from langchain_core.messages import HumanMessage
 from src.agents.state import State
+from src.utils.escalation_writer import get_escalation_writer
+from src.utils.llm_utils import total_tokens
 import logging
-import csv
 import datetime
-import os
 
 logger = logging.getLogger(__name__)
 
-def escalate_to_human(state: State) -> dict:
-    """Escalate the ticket to human review after max retries"""
+def build_escalation_record(state: State) -> dict:
+    """Create the escalation log entry for a ticket"""
     ticket = state["ticket"]
-    category = state["category"]
     draft_response = state["draft_response"]
     review_feedback = state["review_feedback"]
-    retry_count = state["retry_count"]
     
-    logger.warning(f"Escalating ticket to human review after {retry_count} retries")
-    
-    # Create escalation entry
-    escalation_data = {
+    return {
         "timestamp": datetime.datetime.now().isoformat(),
         "ticket_subject": ticket["subject"],
         "ticket_description": ticket["description"][:500],  # Truncate if too long
-        "category": category,
+        "category": state["category"],
+        "category_source": state.get("category_source"),
         "draft_response": draft_response[:1000] if draft_response else "No draft",
         "review_feedback": review_feedback[:500] if review_feedback else "No feedback",
-        "retry_count": retry_count
+        "retry_count": state["retry_count"]
     }
-    
-    # Log to CSV file
-    csv_file = "escalation_log.csv"
-    file_exists = os.path.isfile(csv_file)
-    
-    try:
-        with open(csv_file, 'a', newline='', encoding='utf-8') as f:
-            fieldnames = list(escalation_data.keys())
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            
-            if not file_exists:
-                writer.writeheader()
-            
-            writer.writerow(escalation_data)
-        
-        logger.info(f"Escalation logged to {csv_file}")
-        
-    except Exception as e:
-        logger.error(f"Failed to write escalation log: {e}")
+
+def escalation_result(state: State) -> dict:
+    """Build the human-readable escalation state update"""
+    ticket = state["ticket"]
+    category = state["category"]
+    draft_response = state["draft_response"]
+    review_feedback = state["review_feedback"]
+    retry_count = state["retry_count"]
     
     # Create human-readable message
     escalation_message = f"""
@@ -68,4 +53,23 @@ Please handle this ticket manually.
     return {
         "messages": [HumanMessage(content=escalation_message)],
         "review_status": "escalated"
-    }
\ No newline at end of file
+    }
+
+def escalate_to_human(state: State) -> dict:
+    """Escalate the ticket to human review after max retries"""
+    logger.warning(
+        f"Escalating ticket to human review after {state['retry_count']} retries "
+        f"({total_tokens(state.get('token_usage'))} LLM tokens spent)"
+    )
+    
+    # Queued for the background writer; no disk I/O on the request path
+    try:
+        get_escalation_writer().submit(build_escalation_record(state))
+    except Exception as e:
+        logger.error(f"Failed to queue escalation log entry: {e}")
+    
+    return escalation_result(state)
+
+async def aescalate_to_human(state: State) -> dict:
+    """Async variant; queueing the log entry never blocks the event loop"""
+    return escalate_to_human(state)
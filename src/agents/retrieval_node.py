@@ -1,7 +1,7 @@
 from langchain_core.messages import HumanMessage
-from src.dashboard.app import dashboard_data
-from src.data.real_retrieval import get_real_context  # Change this import
+from src.data.real_retrieval import get_real_context, prefetch_real_candidates, select_real_context
 from src.agents.state import State
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -30,6 +30,84 @@ def retrieve_context(state: State) -> dict:
         "context": context,
         "messages": [HumanMessage(content=f"Retrieved context:\n{formatted_context}")]
     }
+
+async def aretrieve_context(state: State) -> dict:
+    """Retrieve relevant context in a worker thread so the event loop stays free"""
+    ticket = state["ticket"]
+    category = state["category"]
+    
+    logger.info(f"Retrieving context for category: {category}")
+    logger.info(f"Ticket subject: {ticket['subject']}")
+    
+    # Embedding and Chroma queries are blocking, so run them off the loop
+    context = await asyncio.to_thread(
+        get_real_context,
+        category=category,
+        ticket_subject=ticket["subject"],
+        ticket_description=ticket["description"]
+    )
+    
+    logger.info(f"Retrieved {len(context)} context items")
+    
+    formatted_context = "\n".join([f"• {item}" for item in context])
+    
+    return {
+        "context": context,
+        "messages": [HumanMessage(content=f"Retrieved context:\n{formatted_context}")]
+    }
+
+def prefetch_context(state: State) -> dict:
+    """Search all categories for the ticket; runs in parallel with classification"""
+    ticket = state["ticket"]
+    
+    candidates = prefetch_real_candidates(ticket["subject"], ticket["description"])
+    logger.info(f"Prefetched {len(candidates) if candidates is not None else 0} candidate context items")
+    
+    return {"candidate_context": candidates}
+
+async def aprefetch_context(state: State) -> dict:
+    """Prefetch candidates in a worker thread so the event loop stays free"""
+    ticket = state["ticket"]
+    
+    candidates = await asyncio.to_thread(prefetch_real_candidates, ticket["subject"], ticket["description"])
+    logger.info(f"Prefetched {len(candidates) if candidates is not None else 0} candidate context items")
+    
+    return {"candidate_context": candidates}
+
+def select_context(state: State) -> dict:
+    """Filter and rank the prefetched candidates once the category is known"""
+    ticket = state["ticket"]
+    category = state["category"]
+    
+    context = select_real_context(state.get("candidate_context"), category, ticket["subject"], ticket["description"])
+    
+    formatted_context = "\n".join([f"• {item}" for item in context])
+    
+    return {
+        "context": context,
+        "messages": [HumanMessage(content=f"Retrieved context:\n{formatted_context}")]
+    }
+
+async def aselect_context(state: State) -> dict:
+    """Select context off the event loop; it may fall back to a blocking search"""
+    ticket = state["ticket"]
+    category = state["category"]
+    
+    context = await asyncio.to_thread(
+        select_real_context,
+        state.get("candidate_context"),
+        category,
+        ticket["subject"],
+        ticket["description"]
+    )
+    
+    formatted_context = "\n".join([f"• {item}" for item in context])
+    
+    return {
+        "context": context,
+        "messages": [HumanMessage(content=f"Retrieved context:\n{formatted_context}")]
+    }
+
 def retrieve_context_with_logging(state: State) -> dict:
     """Retrieve context and log to dashboard"""
     result = retrieve_context(state)
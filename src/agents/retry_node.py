@@ -1,6 +1,8 @@
 from langchain_core.messages import HumanMessage
-from src.data.mock_knowledge import get_enhanced_context
+from src.data.mock_knowledge import get_enhanced_context, get_feedback_context
 from src.agents.state import State
+from src.utils.config import config
+import difflib
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,6 +19,19 @@ def refine_context_for_retry(state: State) -> dict:
     logger.info(f"Refining context for retry #{retry_count + 1}")
     logger.info(f"Review feedback: {review_feedback[:100]}...")
     
+    # Add context based on review feedback keywords
+    additional_context = get_feedback_context(review_feedback)
+    
+    # Revision mode edits the previous draft, so only the feedback-specific
+    # guidance is needed rather than a whole new context
+    if config.REVISION_MODE:
+        logger.info(f"Prepared {len(additional_context)} revision guidance items")
+        return {
+            "revision_context": additional_context,
+            "retry_count": retry_count + 1,
+            "messages": [HumanMessage(content=f"Revision requested for retry #{retry_count + 1} based on feedback")]
+        }
+    
     # Enhance context based on review feedback
     base_context = get_enhanced_context(
         category=category,
@@ -24,31 +39,9 @@ def refine_context_for_retry(state: State) -> dict:
         ticket_description=ticket["description"]
     )
     
-    # Add context based on review feedback keywords
-    additional_context = []
-    
-    if "refund" in str(review_feedback).lower():
-        additional_context.extend([
-            "Refund eligibility is determined case-by-case based on our terms of service.",
-            "Refunds typically take 5-7 business days to process once approved.",
-            "Partial refunds may be offered for unused portions of subscriptions."
-        ])
-    
-    if "policy" in str(review_feedback).lower() or "compliance" in str(review_feedback).lower():
-        additional_context.extend([
-            "Always refer customers to our terms of service for policy questions.",
-            "Avoid making specific promises about outcomes or timelines.",
-            "Escalate to human review when policy interpretation is unclear."
-        ])
-    
-    if "security" in str(review_feedback).lower():
-        additional_context.extend([
-            "Never share specific security implementation details with customers.",
-            "Refer security concerns to security@ourcompany.com for expert handling.",
-            "Use general security best practices language without specifics."
-        ])
-    
-    refined_context = base_context + additional_context
+    # Feedback guidance goes first so the draft node's token budget never
+    # trims it away; deduplication and budgeting happen there, once
+    refined_context = additional_context + base_context
     
     logger.info(f"Refined context with {len(additional_context)} additional items")
     
@@ -56,4 +49,17 @@ def refine_context_for_retry(state: State) -> dict:
         "context": refined_context,
         "retry_count": retry_count + 1,  # Increment the count
         "messages": [HumanMessage(content=f"Context refined for retry #{retry_count + 1} based on feedback")]
-    }
\ No newline at end of file
+    }
+
+def feedback_repeats(previous: str, current: str) -> bool:
+    """Whether two rounds of review feedback say essentially the same thing"""
+    matcher = difflib.SequenceMatcher(None, (previous or "").lower(), (current or "").lower())
+    # quick_ratio is a cheap upper bound on ratio
+    return (
+        matcher.quick_ratio() >= config.REPEATED_FEEDBACK_SIMILARITY
+        and matcher.ratio() >= config.REPEATED_FEEDBACK_SIMILARITY
+    )
+
+async def arefine_context_for_retry(state: State) -> dict:
+    """Async variant of refine_context_for_retry (pure in-memory work, no I/O)"""
+    return refine_context_for_retry(state)
@@ -1,34 +1,27 @@
 from langchain_core.messages import HumanMessage
-from src.utils.llm_utils import get_review_llm
+from src.utils.llm_utils import get_review_llm, invoke_llm, ainvoke_llm, attempt_usage
 from src.utils.prompts import get_review_prompt
+from src.utils.policy_rules import security_redactor, scan_policy_violations, format_policy_feedback
+from src.utils.config import config
+from src.utils.metrics import metrics
 from src.agents.state import State
 import logging
 import re
 
 logger = logging.getLogger(__name__)
 
-def review_draft_response(state: State) -> dict:
-    """Review the draft response for policy compliance and quality"""
-    ticket = state["ticket"]
-    category = state["category"]
-    draft_response = state["draft_response"]
-    
-    logger.info(f"Reviewing draft response for: {ticket['subject']}")
-    logger.info(f"Draft length: {len(draft_response)} characters")
-    
-    # Prepare the prompt
+def build_review_messages(ticket: dict, category: str, draft_response: str) -> list:
+    """Prepare the review prompt messages for a draft"""
     prompt = get_review_prompt()
-    messages = prompt.format_messages(
+    return prompt.format_messages(
         subject=ticket["subject"],
         description=ticket["description"],
         category=category,
         draft_response=draft_response
     )
-    
-    # Get LLM response
-    llm = get_review_llm()
-    response = llm.invoke(messages)
-    
+
+def review_result(response, attempt: int = 0) -> dict:
+    """Parse the review LLM response into a state update"""
     review_output = response.content.strip()
     
     # Parse the review output
@@ -51,23 +44,83 @@ def review_draft_response(state: State) -> dict:
     return {
         "review_status": verdict,
         "review_feedback": feedback,
+        "feedback_history": [feedback] if verdict == "rejected" else [],
+        "token_usage": [attempt_usage(response, "review_draft", attempt)],
         "messages": [HumanMessage(content=f"Review completed: {verdict.upper()}\nFeedback: {feedback}")]
     }
 
-def filter_security_details(response: str) -> str:
-    """Remove specific security technical details from responses"""
-    security_redactions = {
-        "AES-256 encryption": "industry-standard encryption",
-        "encryption keys": "security protocols", 
-        "database schema": "system architecture",
-        "API endpoints": "system interfaces",
-        "SSL/TLS": "secure connections",
-        "RSA encryption": "asymmetric encryption",
-        "SHA-256": "cryptographic hashing"
-    }
+def prescreen_review(draft_response: str) -> dict:
+    """Review locally when the policy rules settle the verdict.
+    
+    Returns a rejection with structured feedback when the draft matches a
+    policy rule, an approval when it is clean and fast-track is on, or None
+    when the review LLM still has to decide.
+    """
+    if not config.REVIEW_PRESCREEN_ENABLED:
+        return None
     
-    filtered_response = response
-    for technical_term, general_term in security_redactions.items():
-        filtered_response = filtered_response.replace(technical_term, general_term)
+    violations = scan_policy_violations(draft_response)
+    if violations:
+        metrics.inc("review_prescreen_total", result="rejected")
+        feedback = format_policy_feedback(violations)
+        logger.info(f"Policy pre-screen rejected draft: {sorted({v['rule'] for v in violations})}")
+        return {
+            "review_status": "rejected",
+            "review_feedback": feedback,
+            "feedback_history": [feedback],
+            "messages": [HumanMessage(content=f"Review completed: REJECTED (policy pre-screen)\nFeedback: {feedback}")]
+        }
     
+    if config.REVIEW_FAST_TRACK:
+        metrics.inc("review_prescreen_total", result="fast_tracked")
+        logger.info("Policy pre-screen passed; fast-tracking approval")
+        return {
+            "review_status": "approved",
+            "review_feedback": "Passed automatic policy pre-screen",
+            "messages": [HumanMessage(content="Review completed: APPROVED (policy pre-screen fast-track)")]
+        }
+    
+    metrics.inc("review_prescreen_total", result="passed")
+    return None
+
+def review_draft_response(state: State) -> dict:
+    """Review the draft response for policy compliance and quality"""
+    ticket = state["ticket"]
+    category = state["category"]
+    draft_response = state["draft_response"]
+    
+    logger.info(f"Reviewing draft response for: {ticket['subject']}")
+    logger.info(f"Draft length: {len(draft_response)} characters")
+    
+    prescreened = prescreen_review(draft_response)
+    if prescreened is not None:
+        return prescreened
+    
+    # Get LLM response
+    llm = get_review_llm()
+    response = invoke_llm(llm, build_review_messages(ticket, category, draft_response), "review_draft")
+    
+    return review_result(response, state.get("retry_count", 0))
+
+async def areview_draft_response(state: State) -> dict:
+    """Review the draft response without blocking the event loop"""
+    ticket = state["ticket"]
+    category = state["category"]
+    draft_response = state["draft_response"]
+    
+    logger.info(f"Reviewing draft response for: {ticket['subject']}")
+    logger.info(f"Draft length: {len(draft_response)} characters")
+    
+    prescreened = prescreen_review(draft_response)
+    if prescreened is not None:
+        return prescreened
+    
+    llm = get_review_llm()
+    response = await ainvoke_llm(llm, build_review_messages(ticket, category, draft_response), "review_draft")
+    
+    return review_result(response, state.get("retry_count", 0))
+
+def filter_security_details(response: str) -> str:
+    """Remove specific security technical details from responses"""
+    filtered_response, _ = security_redactor.redact(response)
     return filtered_response
\ No newline at end of file
@@ -1,5 +1,6 @@
-from typing import TypedDict, List, Optional, Literal
+from typing import Annotated, TypedDict, List, Optional, Literal
 from langgraph.graph import add_messages
+import operator
 
 class Ticket(TypedDict):
     subject: str
@@ -8,9 +9,36 @@ class Ticket(TypedDict):
 class State(TypedDict):
     ticket: Ticket
     category: Optional[str]
+    category_source: Optional[Literal["llm", "local", "cache"]]
     context: Optional[List[str]]
+    candidate_context: Optional[List[dict]]
     draft_response: Optional[str]
+    redactions: Optional[List[dict]]
     review_feedback: Optional[str]
     review_status: Optional[Literal["approved", "rejected"]]
     retry_count: int
-    messages: add_messages
\ No newline at end of file
+    revision_context: Optional[List[str]]
+    feedback_history: Annotated[List[str], operator.add]
+    token_usage: Annotated[List[dict], operator.add]
+    cache_hit: Optional[bool]
+    messages: add_messages
+
+def create_initial_state(ticket: Ticket) -> State:
+    """Create the initial workflow state for a ticket"""
+    return State(
+        ticket=ticket,
+        category=None,
+        category_source=None,
+        context=None,
+        candidate_context=None,
+        draft_response=None,
+        redactions=None,
+        review_feedback=None,
+        review_status=None,
+        retry_count=0,
+        revision_context=None,
+        feedback_history=[],
+        token_usage=[],
+        cache_hit=False,
+        messages=[]
+    )
@@ -1,17 +1,68 @@
-from langgraph.graph import StateGraph, END
-from src.dashboard.app import dashboard_data
-from src.agents.classification_node import classify_ticket
-from src.agents.retrieval_node import retrieve_context
-from src.agents.draft_node import generate_draft_response
-from src.agents.review_node import review_draft_response
-from src.agents.retry_node import refine_context_for_retry
-from src.agents.escalation_node import escalate_to_human  # Add this import
+from langgraph.graph import StateGraph, START, END
+from src.agents.classification_node import classify_ticket, aclassify_ticket
+from src.agents.retrieval_node import (
+    retrieve_context, aretrieve_context,
+    prefetch_context, aprefetch_context,
+    select_context, aselect_context
+)
+from src.agents.draft_node import generate_draft_response, agenerate_draft_response
+from src.agents.review_node import review_draft_response, areview_draft_response
+from src.agents.retry_node import refine_context_for_retry, arefine_context_for_retry, feedback_repeats
+from src.agents.escalation_node import escalate_to_human, aescalate_to_human
+from src.agents.cache_node import (
+    lookup_cached_response, alookup_cached_response,
+    store_approved_response, astore_approved_response,
+    route_after_cache
+)
 from src.agents.state import State
 from src.utils.config import config
+from src.utils.metrics import metrics, instrument_node
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Compiled graphs shared by every caller in this process
+_compiled_workflow = None
+_compiled_async_workflow = None
+_workflow_lock = threading.Lock()
+
+# Node implementations for the blocking and the asyncio workflows
+SYNC_NODES = {
+    "classify_ticket": classify_ticket,
+    "check_cache": lookup_cached_response,
+    "retrieve_context": retrieve_context,
+    "prefetch_context": prefetch_context,
+    "select_context": select_context,
+    "generate_draft": generate_draft_response,
+    "review_draft": review_draft_response,
+    "refine_context": refine_context_for_retry,
+    "escalate": escalate_to_human,
+    "cache_response": store_approved_response
+}
+
+ASYNC_NODES = {
+    "classify_ticket": aclassify_ticket,
+    "check_cache": alookup_cached_response,
+    "retrieve_context": aretrieve_context,
+    "prefetch_context": aprefetch_context,
+    "select_context": aselect_context,
+    "generate_draft": agenerate_draft_response,
+    "review_draft": areview_draft_response,
+    "refine_context": arefine_context_for_retry,
+    "escalate": aescalate_to_human,
+    "cache_response": astore_approved_response
+}
+
+# Nodes used only by the sequential or only by the parallel-retrieval graph
+SEQUENTIAL_RETRIEVAL_NODES = {"retrieve_context"}
+PARALLEL_RETRIEVAL_NODES = {"prefetch_context", "select_context"}
+
+def feedback_repeated(state: State) -> bool:
+    """Whether the last two rejections gave essentially the same feedback"""
+    feedback_history = state.get("feedback_history") or []
+    return len(feedback_history) >= 2 and feedback_repeats(feedback_history[-2], feedback_history[-1])
+
 def should_retry(state: State) -> str:
     """Determine whether to retry or end based on review status and retry count"""
     review_status = state.get("review_status")
@@ -23,30 +74,69 @@ def should_retry(state: State) -> str:
     elif retry_count >= config.MAX_RETRIES:
         logger.warning(f"Max retries reached ({retry_count}). Proceeding to escalation.")
         return "escalate"
+    elif feedback_repeated(state):
+        # Another attempt is unlikely to fix what the last one didn't
+        logger.warning(f"Review feedback repeated after attempt {retry_count + 1}. Proceeding to escalation.")
+        metrics.inc("retry_early_stops_total")
+        return "escalate"
     else:
         logger.info(f"Retry needed. Attempt {retry_count + 1} of {config.MAX_RETRIES}")
         return "retry"
 
-def create_support_workflow() -> StateGraph:
-    """Create the main support ticket resolution workflow"""
+def build_workflow(nodes: dict, parallel_retrieval: bool = None) -> StateGraph:
+    """Build and compile the support graph from a node-name -> callable mapping.
+    
+    With parallel_retrieval, an unfiltered vector search starts alongside
+    classification and its candidates are filtered by category once both
+    finish, so retrieval latency hides behind the classification call.
+    """
+    if parallel_retrieval is None:
+        parallel_retrieval = config.PARALLEL_RETRIEVAL
+    unused = SEQUENTIAL_RETRIEVAL_NODES if parallel_retrieval else PARALLEL_RETRIEVAL_NODES
     
     # Initialize the graph
     workflow = StateGraph(State)
     
-    # Add nodes (including escalation node)
-    workflow.add_node("classify_ticket", classify_ticket)
-    workflow.add_node("retrieve_context", retrieve_context)
-    workflow.add_node("generate_draft", generate_draft_response)
-    workflow.add_node("review_draft", review_draft_response)
-    workflow.add_node("refine_context", refine_context_for_retry)
-    workflow.add_node("escalate", escalate_to_human)  # Add escalation node
+    # Add nodes (including escalation node), each timed by the metrics layer
+    for name, node in nodes.items():
+        if name not in unused:
+            workflow.add_node(name, instrument_node(name, node))
     
-    # Set entry point
-    workflow.set_entry_point("classify_ticket")
+    if parallel_retrieval:
+        # Fan out from the start, then join before the cache check
+        workflow.add_edge(START, "classify_ticket")
+        workflow.add_edge(START, "prefetch_context")
+        workflow.add_edge(["classify_ticket", "prefetch_context"], "select_context")
+        workflow.add_edge("select_context", "check_cache")
+        
+        # Context is already selected, so a miss goes straight to drafting
+        workflow.add_conditional_edges(
+            "check_cache",
+            route_after_cache,
+            {
+                "hit": END,
+                "miss": "generate_draft"
+            }
+        )
+    else:
+        # Set entry point
+        workflow.set_entry_point("classify_ticket")
+        
+        # Add edges
+        workflow.add_edge("classify_ticket", "check_cache")
+        
+        # Near-duplicate tickets are answered from the response cache
+        workflow.add_conditional_edges(
+            "check_cache",
+            route_after_cache,
+            {
+                "hit": END,
+                "miss": "retrieve_context"
+            }
+        )
+        
+        workflow.add_edge("retrieve_context", "generate_draft")
     
-    # Add edges
-    workflow.add_edge("classify_ticket", "retrieve_context")
-    workflow.add_edge("retrieve_context", "generate_draft")
     workflow.add_edge("generate_draft", "review_draft")
     
     # Add conditional edges for retry logic
@@ -54,7 +144,7 @@ def create_support_workflow() -> StateGraph:
         "review_draft",
         should_retry,
         {
-            "end": END,
+            "end": "cache_response",
             "escalate": "escalate",  # Now points to escalate node
             "retry": "refine_context"
         }
@@ -65,9 +155,74 @@ def create_support_workflow() -> StateGraph:
     
     # Add edge from escalate to end
     workflow.add_edge("escalate", END)
+    workflow.add_edge("cache_response", END)
     
     # Compile the graph
-    compiled_workflow = workflow.compile()
+    return workflow.compile()
+
+def create_support_workflow() -> StateGraph:
+    """Create the main support ticket resolution workflow"""
+    compiled_workflow = build_workflow(SYNC_NODES)
     
     logger.info("Support workflow compiled successfully!")
-    return compiled_workflow
\ No newline at end of file
+    return compiled_workflow
+
+def create_async_support_workflow() -> StateGraph:
+    """Create the support workflow with async nodes, for use with ainvoke/abatch"""
+    compiled_workflow = build_workflow(ASYNC_NODES)
+    
+    logger.info("Async support workflow compiled successfully!")
+    return compiled_workflow
+
+def get_support_workflow():
+    """Get the process-wide compiled support workflow, compiling it on first use"""
+    global _compiled_workflow
+    
+    if _compiled_workflow is None:
+        with _workflow_lock:
+            if _compiled_workflow is None:
+                _compiled_workflow = create_support_workflow()
+    
+    return _compiled_workflow
+
+def get_async_support_workflow():
+    """Get the process-wide compiled async support workflow"""
+    global _compiled_async_workflow
+    
+    if _compiled_async_workflow is None:
+        with _workflow_lock:
+            if _compiled_async_workflow is None:
+                _compiled_async_workflow = create_async_support_workflow()
+    
+    return _compiled_async_workflow
+
+def warm_up_workflow():
+    """Compile the workflow, create pooled LLM clients, load the embedding
+    model and token encoding and train the local classifier ahead of the
+    first ticket.
+    
+    Each component is warmed independently, so one that fails to load
+    (e.g. Chroma unavailable) doesn't leave the others cold.
+    """
+    from src.utils.llm_utils import get_classification_llm, get_draft_llm, get_review_llm
+    from src.data.embeddings import warm_up_embeddings
+    from src.utils.context_assembler import load_encoding
+    from src.data.local_classifier import get_local_classifier
+    
+    workflow = get_support_workflow()
+    
+    warm_ups = [
+        ("LLM clients", lambda: (get_classification_llm(), get_draft_llm(), get_review_llm())),
+        ("embeddings", warm_up_embeddings),
+        ("token encoding", load_encoding)
+    ]
+    if config.LOCAL_CLASSIFIER_ENABLED:
+        warm_ups.append(("local classifier", get_local_classifier))
+    for name, warm_up in warm_ups:
+        try:
+            warm_up()
+        except Exception as e:
+            logger.warning(f"Warm-up of {name} failed, it will load on first use: {e}")
+    
+    logger.info("Support workflow warmed up")
+    return workflow
@@ -3,13 +3,15 @@
 Web Dashboard for Support Ticket Agent Monitoring
 """
 
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request, stream_with_context
 from flask_cors import CORS
+from src.dashboard.store import MetricsStore
+from src.dashboard.escalation_index import EscalationIndex
+from src.utils.config import config
+from src.utils.metrics import metrics
 import json
-import os
-import pandas as pd
-from datetime import datetime, timedelta
 import logging
+import time
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -20,55 +22,23 @@ CORS(app)
 
 class DashboardData:
     def __init__(self):
-        self.data_file = "dashboard_data.json"
-        self.escalation_file = "escalation_log.csv"
-        self.ensure_data_file()
+        self.escalation_file = config.ESCALATION_LOG_FILE
+        self.store = MetricsStore()
+        self.escalations = EscalationIndex(self.escalation_file)
     
-    def ensure_data_file(self):
-        """Ensure data file exists"""
-        if not os.path.exists(self.data_file):
-            with open(self.data_file, 'w') as f:
-                json.dump({
-                    "tickets_processed": 0,
-                    "by_category": {"Billing": 0, "Technical": 0, "Security": 0, "General": 0},
-                    "by_status": {"approved": 0, "rejected": 0, "escalated": 0},
-                    "avg_processing_time": 0,
-                    "success_rate": 100,
-                    "recent_tickets": []
-                }, f)
-    
-    def log_ticket(self, ticket_data, result):
+    def log_ticket(self, ticket_data, result, processing_time=None):
         """Log a processed ticket"""
         try:
-            with open(self.data_file, 'r') as f:
-                data = json.load(f)
-            
-            # Update statistics
-            data["tickets_processed"] += 1
-            data["by_category"][result.get("category", "Unknown")] += 1
-            data["by_status"][result.get("review_status", "unknown")] += 1
-            
-            # Add to recent tickets
-            recent_ticket = {
-                "timestamp": datetime.now().isoformat(),
-                "subject": ticket_data["subject"],
-                "category": result.get("category", "Unknown"),
-                "status": result.get("review_status", "unknown"),
-                "retry_count": result.get("retry_count", 0),
-                "response_length": len(result.get("draft_response", ""))
-            }
-            
-            data["recent_tickets"].insert(0, recent_ticket)
-            data["recent_tickets"] = data["recent_tickets"][:50]  # Keep last 50
-            
-            # Calculate success rate
-            total = data["tickets_processed"]
-            success = data["by_status"]["approved"]
-            data["success_rate"] = round((success / total) * 100, 2) if total > 0 else 100
-            
-            with open(self.data_file, 'w') as f:
-                json.dump(data, f, indent=2)
-                
+            self.store.log_ticket(
+                subject=ticket_data["subject"],
+                description=ticket_data.get("description", ""),
+                category=result.get("category") or "Unknown",
+                status=result.get("review_status") or "unknown",
+                retry_count=result.get("retry_count", 0),
+                response_length=len(result.get("draft_response") or ""),
+                processing_time=processing_time,
+                category_source=result.get("category_source")
+            )
         except Exception as e:
             logger.error(f"Error logging ticket: {e}")
 
@@ -83,97 +53,210 @@ def index():
 @app.route('/api/stats')
 def get_stats():
     """Get dashboard statistics"""
+    from src.utils.llm_utils import get_llm_pool_stats
+    from src.data.response_cache import get_response_cache
+    from src.agents.classification_node import get_classification_cache_stats
+    from src.data.real_retrieval import retrieval_system
+    
     try:
-        with open(dashboard_data.data_file, 'r') as f:
-            data = json.load(f)
+        data = dashboard_data.store.stats()
         
-        # Get escalation count
-        escalation_count = 0
-        if os.path.exists(dashboard_data.escalation_file):
-            try:
-                df = pd.read_csv(dashboard_data.escalation_file)
-                escalation_count = len(df)
-            except:
-                escalation_count = 0
+        # Get escalation count (only newly appended rows are parsed)
+        escalations = dashboard_data.escalations.stats()
         
         return jsonify({
             "tickets_processed": data["tickets_processed"],
             "by_category": data["by_category"],
             "by_status": data["by_status"],
             "success_rate": data["success_rate"],
-            "escalation_count": escalation_count,
-            "recent_tickets": data["recent_tickets"][:10]  # Last 10 tickets
+            "avg_processing_time": data["avg_processing_time"],
+            "escalation_count": escalations["total"],
+            "escalations": escalations,
+            "recent_tickets": dashboard_data.store.recent_tickets(10),  # Last 10 tickets
+            "llm_pool": get_llm_pool_stats(),
+            "response_cache": get_response_cache().stats(),
+            "classification_cache": get_classification_cache_stats(),
+            "retrieval_cache": retrieval_system.query_cache.stats(),
+            "review_prescreen": {
+                result: metrics.counter_value("review_prescreen_total", result=result)
+                for result in ("rejected", "fast_tracked", "passed")
+            },
+            "node_latency": metrics.percentiles("node_duration_seconds", by="node"),
+            "llm_latency": metrics.percentiles("llm_request_duration_seconds", by="node")
         })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route('/metrics')
+def prometheus_metrics():
+    """Expose pipeline metrics in the Prometheus text format"""
+    return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/api/tickets/recent')
 def get_recent_tickets():
     """Get recent tickets"""
     try:
-        with open(dashboard_data.data_file, 'r') as f:
-            data = json.load(f)
-        return jsonify(data["recent_tickets"])
+        return jsonify(dashboard_data.store.recent_tickets(50))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/escalations')
 def get_escalations():
-    """Get escalation data"""
+    """Get escalation data, newest first.
+    
+    Query params: limit (default 50, max 500), offset, category, retry_count.
+    The total number of matching rows is returned in the X-Total-Count header.
+    """
     try:
-        if os.path.exists(dashboard_data.escalation_file):
-            df = pd.read_csv(dashboard_data.escalation_file)
-            return jsonify(df.to_dict('records'))
-        else:
-            return jsonify([])
+        limit = min(request.args.get('limit', 50, type=int), 500)
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        
+        rows, total = dashboard_data.escalations.page(
+            offset=offset,
+            limit=limit,
+            category=request.args.get('category'),
+            retry_count=request.args.get('retry_count')
+        )
+        
+        response = jsonify(rows)
+        response.headers['X-Total-Count'] = str(total)
+        return response
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+def ticket_from_request() -> dict:
+    """Read subject/description from a JSON body or, for GET, the query string"""
+    data = request.get_json(silent=True) or request.args
+    return {
+        "subject": data.get('subject', ''),
+        "description": data.get('description', '')
+    }
+
+def result_payload(result: dict, processing_time: float) -> dict:
+    """API view of a finished workflow state"""
+    return {
+        "review_status": result.get('review_status'),
+        "category": result.get('category'),
+        "retry_count": result.get('retry_count', 0),
+        "cache_hit": result.get('cache_hit', False),
+        "response": result.get('draft_response'),
+        "context_items": len(result.get('context') or []),
+        "processing_time": round(processing_time, 3)
+    }
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
 @app.route('/api/process-ticket', methods=['POST'])
 def api_process_ticket():
     """Process a ticket via API"""
-    from src.agents.workflow import create_support_workflow
-    from src.agents.state import State
+    from src.agents.workflow import get_support_workflow
+    from src.agents.state import create_initial_state
     
     try:
-        data = request.json
-        ticket = {
-            "subject": data.get('subject', ''),
-            "description": data.get('description', '')
-        }
-        
-        initial_state = State(
-            ticket=ticket,
-            category=None,
-            context=None,
-            draft_response=None,
-            review_feedback=None,
-            review_status=None,
-            retry_count=0,
-            messages=[]
-        )
+        ticket = ticket_from_request()
+        initial_state = create_initial_state(ticket)
         
-        workflow = create_support_workflow()
+        workflow = get_support_workflow()
+        start = time.perf_counter()
         result = workflow.invoke(initial_state)
+        processing_time = time.perf_counter() - start
+        metrics.observe("ticket_processing_seconds", processing_time, status=result.get('review_status'))
         
         # Log to dashboard
-        dashboard_data.log_ticket(ticket, result)
+        dashboard_data.log_ticket(ticket, result, processing_time=processing_time)
         
         return jsonify({
             "status": "success",
-            "result": {
-                "review_status": result.get('review_status'),
-                "category": result.get('category'),
-                "retry_count": result.get('retry_count', 0),
-                "response": result.get('draft_response'),
-                "context_items": len(result.get('context', []))
-            }
+            "result": result_payload(result, processing_time)
         })
         
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
+@app.route('/api/process-ticket/stream', methods=['GET', 'POST'])
+def api_process_ticket_stream():
+    """Process a ticket, streaming progress as server-sent events.
+    
+    Events: "node" after each workflow node finishes, "token" with draft
+    text as the LLM produces it (restarting with a new attempt number on
+    retries), "draft" with the complete redacted draft, "discard" when
+    review rejects an attempt's draft, and a terminal "done" (same payload
+    as /api/process-ticket) or "error".
+    
+    Token text goes through the security redactor before it is sent, held
+    back at word boundaries so a term split across tokens is never leaked.
+    """
+    from src.agents.workflow import get_support_workflow
+    from src.agents.state import create_initial_state
+    from src.utils.policy_rules import security_redactor
+    from src.utils.redaction import StreamingRedactor
+    
+    ticket = ticket_from_request()
+    
+    def generate():
+        state = dict(create_initial_state(ticket))
+        token_redactor = StreamingRedactor(security_redactor)
+        start = time.perf_counter()
+        yield sse_event("start", {"subject": ticket["subject"]})
+        
+        try:
+            workflow = get_support_workflow()
+            for mode, chunk in workflow.stream(create_initial_state(ticket), stream_mode=["updates", "messages"]):
+                if mode == "messages":
+                    message, metadata = chunk
+                    if metadata.get("langgraph_node") == "generate_draft" and message.content:
+                        text = token_redactor.feed(message.content)
+                        if text:
+                            yield sse_event("token", {"text": text, "attempt": state.get("retry_count", 0)})
+                    continue
+                
+                for node, update in chunk.items():
+                    update = {k: v for k, v in (update or {}).items() if k != "messages"}
+                    if "draft_response" in update:
+                        # The attempt's last held-back tokens, then the authoritative draft
+                        text = token_redactor.flush()
+                        if text:
+                            yield sse_event("token", {"text": text, "attempt": state.get("retry_count", 0)})
+                    if update.get("review_status") == "rejected":
+                        yield sse_event("discard", {"attempt": state.get("retry_count", 0)})
+                    state.update(update)
+                    yield sse_event("node", {
+                        "node": node,
+                        "elapsed": round(time.perf_counter() - start, 3),
+                        "category": state.get("category"),
+                        "review_status": update.get("review_status"),
+                        "retry_count": state.get("retry_count", 0)
+                    })
+                    if "draft_response" in update:
+                        yield sse_event("draft", {"text": update["draft_response"], "attempt": state.get("retry_count", 0)})
+            
+            processing_time = time.perf_counter() - start
+            metrics.observe("ticket_processing_seconds", processing_time, status=state.get('review_status'))
+            dashboard_data.log_ticket(ticket, state, processing_time=processing_time)
+            yield sse_event("done", result_payload(state, processing_time))
+        
+        except Exception as e:
+            logger.error(f"Streaming ticket processing failed: {e}")
+            yield sse_event("error", {"message": str(e)})
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def warm_up():
+    """Compile the support workflow once before serving requests"""
+    from src.agents.workflow import warm_up_workflow
+    
+    try:
+        warm_up_workflow()
+    except Exception as e:
+        logger.error(f"Workflow warm-up failed: {e}")
+
 if __name__ == '__main__':
+    warm_up()
     print("🚀 Starting Support Ticket Agent Dashboard...")
     print("📍 http://localhost:5001")
     print("📊 Dashboard features:")
@@ -0,0 +1,183 @@
+"""
+Incrementally maintained index over the escalation CSV log.
+
+Each refresh() only parses bytes appended since the previous call, keeping
+running counts per category and retry_count plus the byte offset of every
+row. Dashboard polling therefore costs O(new rows), and a page of recent
+escalations is read by seeking straight to its rows. Files rotated by the
+escalation writer are picked up once and never re-read.
+"""
+
+from src.utils.config import config
+import csv
+import glob
+import io
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+def split_records(data: bytes) -> tuple[list[tuple[int, int]], int]:
+    """Split CSV bytes into complete records.
+    
+    Returns (start, end) spans and the number of bytes consumed. Quoted
+    fields may contain newlines, so a record only ends at a newline when
+    its quotes are balanced; a trailing partial record is left unconsumed.
+    """
+    spans = []
+    record_start = 0
+    quotes = 0
+    position = 0
+    
+    while True:
+        newline = data.find(b"\n", position)
+        if newline == -1:
+            break
+        quotes += data.count(b'"', position, newline)
+        position = newline + 1
+        if quotes % 2 == 0:
+            spans.append((record_start, position))
+            record_start = position
+            quotes = 0
+    
+    return spans, record_start
+
+def parse_record(raw: bytes) -> list[str]:
+    return next(csv.reader(io.StringIO(raw.decode("utf-8"))), [])
+
+class _TrackedFile:
+    def __init__(self, index: int, path: str, inode: int):
+        self.index = index
+        self.path = path
+        self.inode = inode
+        self.offset = 0
+        self.header = None
+
+class EscalationIndex:
+    def __init__(self, path: str = None):
+        self.path = path or config.ESCALATION_LOG_FILE
+        self._lock = threading.Lock()
+        self._files = []  # _TrackedFile, oldest first
+        self._rows = []  # (file index, start, end, category, retry_count), oldest first
+        self._rows_by_category = {}
+        self._rows_by_retry = {}
+        self.by_category = {}
+        self.by_retry_count = {}
+    
+    @property
+    def total(self) -> int:
+        return len(self._rows)
+    
+    def _rotated_paths(self) -> list[str]:
+        stem, ext = os.path.splitext(self.path)
+        return sorted(glob.glob(f"{stem}.*{ext}"), key=self._rotation_key)
+    
+    @staticmethod
+    def _rotation_key(path: str):
+        # escalation_log.<date>.<n>.csv -> (date, n)
+        parts = os.path.basename(path).split(".")
+        try:
+            return parts[-3], int(parts[-2])
+        except (IndexError, ValueError):
+            return path, 0
+    
+    def refresh(self):
+        """Index rows appended since the last refresh (including rotations)"""
+        with self._lock:
+            known_inodes = {f.inode: f for f in self._files}
+            
+            for path in self._rotated_paths() + [self.path]:
+                try:
+                    inode = os.stat(path).st_ino
+                except FileNotFoundError:
+                    continue
+                
+                tracked = known_inodes.get(inode)
+                if tracked is None:
+                    tracked = _TrackedFile(len(self._files), path, inode)
+                    self._files.append(tracked)
+                    known_inodes[inode] = tracked
+                elif tracked.path != path:
+                    # The live log was rotated; keep tailing it under its new name
+                    tracked.path = path
+                
+                self._tail(tracked)
+    
+    def _tail(self, tracked: _TrackedFile):
+        if os.path.getsize(tracked.path) <= tracked.offset:
+            return
+        
+        with open(tracked.path, 'rb') as f:
+            f.seek(tracked.offset)
+            data = f.read()
+        
+        spans, consumed = split_records(data)
+        for start, end in spans:
+            fields = parse_record(data[start:end])
+            if not fields:
+                continue
+            if tracked.header is None:
+                tracked.header = fields
+                continue
+            
+            row = dict(zip(tracked.header, fields))
+            category = row.get("category", "Unknown").strip() or "Unknown"
+            retry_count = row.get("retry_count", "").strip()
+            
+            row_index = len(self._rows)
+            self._rows.append((tracked.index, tracked.offset + start, tracked.offset + end, category, retry_count))
+            self._rows_by_category.setdefault(category, []).append(row_index)
+            self._rows_by_retry.setdefault(retry_count, []).append(row_index)
+            self.by_category[category] = self.by_category.get(category, 0) + 1
+            self.by_retry_count[retry_count] = self.by_retry_count.get(retry_count, 0) + 1
+        
+        tracked.offset += consumed
+    
+    def _read_row(self, row_index: int) -> dict:
+        file_index, start, end, _, _ = self._rows[row_index]
+        tracked = self._files[file_index]
+        with open(tracked.path, 'rb') as f:
+            f.seek(start)
+            row = dict(zip(tracked.header, parse_record(f.read(end - start))))
+        
+        if row.get("retry_count", "").strip().isdigit():
+            row["retry_count"] = int(row["retry_count"])
+        return row
+    
+    def page(self, offset: int = 0, limit: int = 50, category: str = None,
+             retry_count: str = None) -> tuple[list[dict], int]:
+        """Newest-first page of escalations, optionally filtered.
+        
+        Returns (rows, total matching rows).
+        """
+        self.refresh()
+        
+        with self._lock:
+            if category is not None and retry_count is not None:
+                retry_rows = set(self._rows_by_retry.get(retry_count, []))
+                candidates = [i for i in self._rows_by_category.get(category, []) if i in retry_rows]
+            elif category is not None:
+                candidates = self._rows_by_category.get(category, [])
+            elif retry_count is not None:
+                candidates = self._rows_by_retry.get(retry_count, [])
+            else:
+                candidates = range(len(self._rows))
+            
+            total = len(candidates)
+            # Walk from the end so the newest rows come first
+            stop = max(total - offset, 0)
+            start = max(stop - limit, 0)
+            selected = [candidates[i] for i in range(stop - 1, start - 1, -1)]
+            
+            return [self._read_row(i) for i in selected], total
+    
+    def stats(self) -> dict:
+        self.refresh()
+        
+        with self._lock:
+            return {
+                "total": len(self._rows),
+                "by_category": dict(self.by_category),
+                "by_retry_count": dict(self.by_retry_count)
+            }
@@ -0,0 +1,213 @@
+"""
+SQLite-backed metrics store for the dashboard.
+
+Each processed ticket is one INSERT plus atomic counter upserts inside a
+single transaction, so concurrent Flask threads and worker processes never
+lose updates. WAL mode lets readers run alongside the writer, and the
+stats/recent-ticket endpoints are served from the counters table and the
+rowid index instead of parsing a JSON file.
+"""
+
+from datetime import datetime
+from src.utils.config import config
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS tickets (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    description TEXT,
+    category TEXT,
+    category_source TEXT,
+    status TEXT,
+    retry_count INTEGER NOT NULL DEFAULT 0,
+    response_length INTEGER NOT NULL DEFAULT 0,
+    processing_time REAL
+);
+CREATE INDEX IF NOT EXISTS idx_tickets_timestamp ON tickets (timestamp);
+"""
+
+UPSERT_COUNTER = """
+INSERT INTO counters (name, value) VALUES (?, ?)
+ON CONFLICT(name) DO UPDATE SET value = value + excluded.value
+"""
+
+class MetricsStore:
+    def __init__(self, db_path: str = None, legacy_json_path: str = None):
+        self.db_path = db_path or config.DASHBOARD_DB_PATH
+        self._local = threading.local()
+        
+        self._connection().executescript(SCHEMA)
+        self._migrate()
+        
+        legacy_json_path = legacy_json_path or config.DASHBOARD_DATA_FILE
+        if os.path.exists(legacy_json_path):
+            self.import_legacy_json(legacy_json_path)
+    
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread; sqlite3 connections aren't shareable"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def _transaction(self):
+        return _Transaction(self._connection())
+    
+    def _migrate(self):
+        """Add columns introduced after a database was created"""
+        columns = {row["name"] for row in self._connection().execute("PRAGMA table_info(tickets)")}
+        for column in ("description", "category_source"):
+            if column not in columns:
+                try:
+                    self._connection().execute(f"ALTER TABLE tickets ADD COLUMN {column} TEXT")
+                except sqlite3.OperationalError:
+                    pass  # added concurrently by another process
+    
+    def import_legacy_json(self, path: str):
+        """One-time migration of the old dashboard_data.json into an empty store"""
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not import legacy dashboard data from {path}: {e}")
+            return
+        
+        with self._transaction() as conn:
+            # Checked under the write lock so two processes can't both import
+            if conn.execute("SELECT COUNT(*) FROM counters").fetchone()[0] > 0:
+                return
+            
+            conn.execute(UPSERT_COUNTER, ("tickets_processed", data.get("tickets_processed", 0)))
+            for category, count in data.get("by_category", {}).items():
+                conn.execute(UPSERT_COUNTER, (f"category:{category}", count))
+            for status, count in data.get("by_status", {}).items():
+                conn.execute(UPSERT_COUNTER, (f"status:{status}", count))
+            
+            # Stored newest-first; insert oldest-first so rowid order is chronological
+            for ticket in reversed(data.get("recent_tickets", [])):
+                conn.execute(
+                    "INSERT INTO tickets (timestamp, subject, category, status, retry_count, response_length) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (ticket["timestamp"], ticket["subject"], ticket.get("category"), ticket.get("status"),
+                     ticket.get("retry_count", 0), ticket.get("response_length", 0))
+                )
+            
+            logger.info(f"Imported legacy dashboard data from {path}")
+    
+    def log_ticket(self, subject: str, category: str, status: str, retry_count: int,
+                   response_length: int, processing_time: float = None, category_source: str = None,
+                   description: str = None):
+        """Record one processed ticket and bump its counters atomically"""
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO tickets (timestamp, subject, description, category, category_source, status, "
+                "retry_count, response_length, processing_time) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (datetime.now().isoformat(), subject, description, category, category_source, status,
+                 retry_count, response_length, processing_time)
+            )
+            conn.execute(UPSERT_COUNTER, ("tickets_processed", 1))
+            conn.execute(UPSERT_COUNTER, (f"category:{category}", 1))
+            conn.execute(UPSERT_COUNTER, (f"status:{status}", 1))
+            if processing_time is not None:
+                conn.execute(UPSERT_COUNTER, ("timed_tickets", 1))
+                conn.execute(UPSERT_COUNTER, ("processing_time_total", processing_time))
+    
+    def counters(self) -> dict:
+        rows = self._connection().execute("SELECT name, value FROM counters").fetchall()
+        return {row["name"]: row["value"] for row in rows}
+    
+    def recent_tickets(self, limit: int = 50) -> list[dict]:
+        """Most recent tickets, newest first (served from the rowid index)"""
+        rows = self._connection().execute(
+            "SELECT timestamp, subject, category, status, retry_count, response_length, processing_time "
+            "FROM tickets ORDER BY id DESC LIMIT ?",
+            (limit,)
+        ).fetchall()
+        
+        tickets = []
+        for row in rows:
+            ticket = {
+                "timestamp": row["timestamp"],
+                "subject": row["subject"],
+                "category": row["category"],
+                "status": row["status"],
+                "retry_count": row["retry_count"],
+                "response_length": row["response_length"]
+            }
+            if row["processing_time"] is not None:
+                ticket["processing_time"] = round(row["processing_time"], 3)
+            tickets.append(ticket)
+        return tickets
+    
+    def labelled_tickets(self, source: str = "llm", limit: int = 5000) -> list[dict]:
+        """Most recent tickets whose category was decided by source, newest first.
+        
+        Only tickets logged with their description are returned, so callers
+        get the same text the classifier sees at inference.
+        """
+        rows = self._connection().execute(
+            "SELECT subject, description, category FROM tickets "
+            "WHERE category_source = ? AND description IS NOT NULL ORDER BY id DESC LIMIT ?",
+            (source, limit)
+        ).fetchall()
+        return [
+            {"subject": row["subject"], "description": row["description"], "category": row["category"]}
+            for row in rows
+        ]
+    
+    def stats(self) -> dict:
+        """Aggregate counters in the shape of the legacy dashboard_data.json"""
+        counters = self.counters()
+        by_category = {category: 0 for category in config.CATEGORIES}
+        by_status = {"approved": 0, "rejected": 0, "escalated": 0}
+        
+        for name, value in counters.items():
+            if name.startswith("category:"):
+                by_category[name.split(":", 1)[1]] = int(value)
+            elif name.startswith("status:"):
+                by_status[name.split(":", 1)[1]] = int(value)
+        
+        total = int(counters.get("tickets_processed", 0))
+        timed = counters.get("timed_tickets", 0)
+        
+        return {
+            "tickets_processed": total,
+            "by_category": by_category,
+            "by_status": by_status,
+            "avg_processing_time": round(counters.get("processing_time_total", 0) / timed, 3) if timed else 0,
+            "success_rate": round((by_status["approved"] / total) * 100, 2) if total > 0 else 100
+        }
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT, taking the write lock up front so
+    concurrent read-modify-write sequences can't interleave"""
+    
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+    
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.conn.execute("COMMIT")
+        else:
+            self.conn.execute("ROLLBACK")
+        return False
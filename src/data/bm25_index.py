@@ -0,0 +1,279 @@
+"""
+Persistent BM25 inverted index over the knowledge base chunks.
+
+Built alongside the Chroma collection by DocumentIngestor (same chunk ids
+and metadata) and queried next to the vector search for hybrid retrieval.
+Postings are held as term -> {row: term frequency} and turned into NumPy
+arrays per term on first use, so scoring a query is a few vectorized adds
+over the postings of its terms.
+
+The index is saved as JSON with its postings and document lengths, so
+loading restores it without re-tokenizing the corpus. Deleted rows are
+compacted away on save. Files in the older format (one [id, text,
+category, type] row per chunk) are still loaded, by re-tokenizing.
+"""
+
+from src.utils.config import config
+import json
+import logging
+import math
+import numpy as np
+import os
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset("""
+a an and are as at be but by can do for from has have how i if in is it its my
+of on or our so that the their then there this to was we what when where which
+will with you your
+""".split())
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased alphanumeric tokens without stopwords"""
+    return [token for token in TOKEN_PATTERN.findall((text or "").lower()) if token not in STOPWORDS]
+
+class BM25Index:
+    def __init__(self, path: str = None, k1: float = 1.5, b: float = 0.75):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._reset()
+        
+        if path and os.path.exists(path):
+            self.load()
+    
+    def _reset(self):
+        self.ids = []           # row -> chunk id; None once deleted
+        self.rows = {}          # chunk id -> row
+        self.documents = []     # row -> {"content", "category", "type"}
+        self.lengths = []       # row -> token count
+        self.postings = {}      # term -> {row: tf}
+        self.total_length = 0
+        self._term_arrays = {}  # term -> (rows, tfs), rebuilt after changes
+        self._length_array = None
+        self._category_array = None
+    
+    def __len__(self) -> int:
+        return len(self.rows)
+    
+    def _invalidate(self):
+        self._term_arrays = {}
+        self._length_array = None
+        self._category_array = None
+    
+    def _remove_row(self, row: int):
+        for term in set(tokenize(self.documents[row]["content"])):
+            term_postings = self.postings.get(term)
+            if term_postings is not None:
+                term_postings.pop(row, None)
+                if not term_postings:
+                    del self.postings[term]
+        
+        del self.rows[self.ids[row]]
+        self.total_length -= self.lengths[row]
+        self.ids[row] = None
+        self.lengths[row] = 0
+        self.documents[row] = {"content": "", "category": None, "type": None}
+    
+    def upsert(self, ids: list[str], contents: list[str], metadatas: list[dict]):
+        """Add or replace chunks"""
+        with self._lock:
+            for chunk_id, content, metadata in zip(ids, contents, metadatas):
+                if chunk_id in self.rows:
+                    self._remove_row(self.rows[chunk_id])
+                
+                row = len(self.ids)
+                tokens = tokenize(content)
+                self.ids.append(chunk_id)
+                self.rows[chunk_id] = row
+                self.documents.append({
+                    "content": content,
+                    "category": metadata.get("category"),
+                    "type": metadata.get("type", "Unknown")
+                })
+                self.lengths.append(len(tokens))
+                self.total_length += len(tokens)
+                
+                for term in tokens:
+                    term_postings = self.postings.setdefault(term, {})
+                    term_postings[row] = term_postings.get(row, 0) + 1
+            
+            self._invalidate()
+    
+    def delete(self, ids: list[str]):
+        """Remove chunks by id; unknown ids are ignored"""
+        with self._lock:
+            for chunk_id in ids:
+                row = self.rows.get(chunk_id)
+                if row is not None:
+                    self._remove_row(row)
+            self._invalidate()
+    
+    def _arrays(self, term: str):
+        arrays = self._term_arrays.get(term)
+        if arrays is None:
+            term_postings = self.postings.get(term, {})
+            arrays = (
+                np.fromiter(term_postings.keys(), dtype=np.int64, count=len(term_postings)),
+                np.fromiter(term_postings.values(), dtype=np.float32, count=len(term_postings))
+            )
+            self._term_arrays[term] = arrays
+        return arrays
+    
+    def search(self, query: str, category: str = None, n_results: int = 5) -> list[dict]:
+        """Top BM25 matches as {id, content, category, type, score}, best first"""
+        terms = set(tokenize(query))
+        
+        with self._lock:
+            if not self.rows or not terms:
+                return []
+            
+            if self._length_array is None:
+                self._length_array = np.asarray(self.lengths, dtype=np.float32)
+                self._category_array = np.asarray([doc["category"] for doc in self.documents], dtype=object)
+            
+            doc_count = len(self.rows)
+            avg_length = self.total_length / doc_count if doc_count else 1.0
+            norm = self.k1 * (1 - self.b + self.b * self._length_array / max(avg_length, 1e-9))
+            scores = np.zeros(len(self.ids), dtype=np.float32)
+            
+            for term in terms:
+                rows, tfs = self._arrays(term)
+                if not len(rows):
+                    continue
+                idf = math.log(1 + (doc_count - len(rows) + 0.5) / (len(rows) + 0.5))
+                scores[rows] += idf * tfs * (self.k1 + 1) / (tfs + norm[rows])
+            
+            if category:
+                scores[self._category_array != category] = 0
+            
+            candidates = np.flatnonzero(scores)
+            if not len(candidates):
+                return []
+            if len(candidates) > n_results:
+                candidates = candidates[np.argpartition(-scores[candidates], n_results - 1)[:n_results]]
+            candidates = candidates[np.argsort(-scores[candidates])]
+            
+            return [
+                {"id": self.ids[row], **self.documents[row], "score": float(scores[row])}
+                for row in candidates
+            ]
+    
+    def save(self):
+        """Atomically write the live chunks and their postings to path"""
+        if not self.path:
+            return
+        
+        with self._lock:
+            live = [row for row, chunk_id in enumerate(self.ids) if chunk_id is not None]
+            new_rows = {row: i for i, row in enumerate(live)}
+            snapshot = {
+                "format": 2,
+                "ids": [self.ids[row] for row in live],
+                "documents": [
+                    [self.documents[row]["content"], self.documents[row]["category"], self.documents[row]["type"]]
+                    for row in live
+                ],
+                "lengths": [self.lengths[row] for row in live],
+                "postings": {
+                    term: [[new_rows[row], tf] for row, tf in term_postings.items()]
+                    for term, term_postings in self.postings.items()
+                }
+            }
+        
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, self.path)
+    
+    def load(self):
+        """Restore the index from path"""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+        
+        with self._lock:
+            self._reset()
+            if isinstance(snapshot, list):
+                # Older format: chunks only, re-tokenized here
+                self.upsert(
+                    [chunk_id for chunk_id, _, _, _ in snapshot],
+                    [content for _, content, _, _ in snapshot],
+                    [{"category": category, "type": doc_type} for _, _, category, doc_type in snapshot]
+                )
+            else:
+                self.ids = snapshot["ids"]
+                self.rows = {chunk_id: row for row, chunk_id in enumerate(self.ids)}
+                self.documents = [
+                    {"content": content, "category": category, "type": doc_type}
+                    for content, category, doc_type in snapshot["documents"]
+                ]
+                self.lengths = snapshot["lengths"]
+                self.total_length = sum(self.lengths)
+                self.postings = {
+                    term: {row: tf for row, tf in term_postings}
+                    for term, term_postings in snapshot["postings"].items()
+                }
+        
+        logger.info(f"Loaded BM25 index with {len(self)} chunks from {self.path}")
+
+_bm25_index = None
+_bm25_lock = threading.Lock()
+_reload_lock = threading.Lock()
+_reload_state = {"running": False, "pending": False}
+
+def get_bm25_index() -> BM25Index:
+    """Get the shared BM25 index stored next to the Chroma collection"""
+    global _bm25_index
+    
+    if _bm25_index is None:
+        with _bm25_lock:
+            if _bm25_index is None:
+                _bm25_index = BM25Index(_bm25_path())
+    
+    return _bm25_index
+
+def _bm25_path() -> str:
+    return os.path.join(config.CHROMA_PERSIST_DIR, config.BM25_INDEX_FILE)
+
+def reload_bm25_index_async():
+    """Rebuild the shared index from disk in a background thread.
+    
+    Loading parses the whole index file, so searches keep using the
+    current instance until the new one is ready and swapped in. A request
+    made while a reload runs triggers one more reload after it.
+    """
+    with _reload_lock:
+        if _reload_state["running"]:
+            _reload_state["pending"] = True
+            return
+        _reload_state["running"] = True
+    
+    threading.Thread(target=_reload_worker, name="bm25-reload", daemon=True).start()
+
+def bm25_reload_in_progress() -> bool:
+    with _reload_lock:
+        return _reload_state["running"]
+
+def _reload_worker():
+    global _bm25_index
+    
+    while True:
+        try:
+            if os.path.exists(_bm25_path()):
+                index = BM25Index(_bm25_path())
+                with _bm25_lock:
+                    _bm25_index = index
+        except Exception as e:
+            logger.error(f"Failed to reload BM25 index: {e}")
+        
+        with _reload_lock:
+            if not _reload_state["pending"]:
+                _reload_state["running"] = False
+                return
+            _reload_state["pending"] = False
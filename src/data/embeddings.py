@@ -0,0 +1,168 @@
+"""
+Lazily initialized, process-wide embedding model and Chroma client.
+
+Importing this module is cheap: sentence-transformers and chromadb are only
+imported and loaded the first time they are needed, or on warm_up().
+"""
+
+from concurrent.futures import Future
+from src.utils.config import config
+import asyncio
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_embedding_model = None
+_chroma_client = None
+_embedding_batcher = None
+_lock = threading.Lock()
+
+def get_embedding_model():
+    """Get the shared SentenceTransformer, loading it on first use"""
+    global _embedding_model
+    
+    if _embedding_model is None:
+        with _lock:
+            if _embedding_model is None:
+                from sentence_transformers import SentenceTransformer
+                
+                start = time.perf_counter()
+                _embedding_model = SentenceTransformer(config.EMBEDDING_MODEL_NAME)
+                logger.info(f"Loaded embedding model {config.EMBEDDING_MODEL_NAME} in {time.perf_counter() - start:.2f}s")
+    
+    return _embedding_model
+
+def get_chroma_client():
+    """Get the shared persistent Chroma client, opening it on first use"""
+    global _chroma_client
+    
+    if _chroma_client is None:
+        with _lock:
+            if _chroma_client is None:
+                import chromadb
+                
+                _chroma_client = chromadb.PersistentClient(path=config.CHROMA_PERSIST_DIR)
+    
+    return _chroma_client
+
+def set_embedding_model(model):
+    """Use a pre-built embedding model (anything with a SentenceTransformer-style encode)"""
+    global _embedding_model
+    
+    with _lock:
+        _embedding_model = model
+
+def set_chroma_client(client):
+    """Use a specific Chroma client, e.g. an ephemeral one for benchmarks"""
+    global _chroma_client
+    
+    with _lock:
+        _chroma_client = client
+
+def warm_up_embeddings():
+    """Load the embedding model and open Chroma ahead of the first request"""
+    model = get_embedding_model()
+    # Run one encode so lazy weight initialization isn't paid by the first ticket
+    model.encode(["warm up"])
+    get_chroma_client()
+
+class EmbeddingBatcher:
+    """Micro-batches concurrent single-text encode requests.
+    
+    A background thread waits for the first request, keeps collecting
+    requests for up to max_wait_ms (or until max_batch_size is reached),
+    encodes the whole batch in one vectorized call and resolves each
+    caller's future with its own row. Embeddings are unit-normalized.
+    """
+    
+    def __init__(self, max_batch_size: int = None, max_wait_ms: float = None):
+        self.max_batch_size = max_batch_size or config.EMBEDDING_BATCH_SIZE
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else config.EMBEDDING_BATCH_WAIT_MS) / 1000
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+    
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                    self._thread.start()
+    
+    def _collect_batch(self) -> list:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        
+        return batch
+    
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            texts = [text for text, _ in batch]
+            
+            try:
+                embeddings = get_embedding_model().encode(texts, batch_size=len(texts), normalize_embeddings=True)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            
+            self.batches += 1
+            self.items += len(batch)
+            for (_, future), embedding in zip(batch, embeddings):
+                future.set_result(embedding)
+    
+    def submit(self, text: str) -> Future:
+        """Queue a text for the next batch"""
+        self._ensure_started()
+        future = Future()
+        self._queue.put((text, future))
+        return future
+    
+    def encode(self, text: str):
+        """Embed one text, blocking until its batch has been encoded"""
+        return self.submit(text).result()
+    
+    async def aencode(self, text: str):
+        """Embed one text without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(text))
+    
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000
+        }
+
+def get_embedding_batcher() -> EmbeddingBatcher:
+    """Get the shared micro-batching embedding service"""
+    global _embedding_batcher
+    
+    if _embedding_batcher is None:
+        with _lock:
+            if _embedding_batcher is None:
+                _embedding_batcher = EmbeddingBatcher()
+    
+    return _embedding_batcher
+
+def embed_query(text: str):
+    """Embed a single query (unit-normalized), micro-batched when enabled"""
+    if config.EMBEDDING_BATCHING_ENABLED:
+        return get_embedding_batcher().encode(text)
+    return get_embedding_model().encode([text], normalize_embeddings=True)[0]
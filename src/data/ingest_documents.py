@@ -1,20 +1,132 @@
 #!/usr/bin/env python3
 """
 Ingest real documents into ChromaDB for RAG retrieval - UPDATED FOR NEW CHROMA API
+
+Bulk ingestion of help-center articles:
+    python -m src.data.ingest_documents --source ./articles [--batch-size 256] [--workers 4]
+
+A source is a directory (.md/.txt/.json/.jsonl files) or a single JSONL
+file. Documents are chunked, unchanged documents are skipped by content
+hash, and progress is checkpointed after each batch so an interrupted run
+resumes where it stopped. The BM25 keyword index is updated with every
+batch and saved in the same checkpoint; with RETRIEVAL_BACKEND=numpy the
+memory-mapped vector index is re-exported as well. Finally the knowledge
+base generation is bumped so running retrievers drop cached results.
 """
 
-import chromadb
-from sentence_transformers import SentenceTransformer
+from src.data.embeddings import get_embedding_model, get_chroma_client
+from src.data.bm25_index import get_bm25_index
+from src.data.real_retrieval import bump_kb_generation
+from src.data.vector_index import export_vector_index
+from src.utils.config import config
+import argparse
+import hashlib
+import logging
 import os
 import json
+import time
+
+logger = logging.getLogger(__name__)
+
+TEXT_EXTENSIONS = (".md", ".txt")
+
+def content_hash(doc: dict) -> str:
+    """Hash everything that ends up in the collection for a document"""
+    payload = json.dumps([doc["content"], doc["category"], doc["type"]], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def normalize_document(record: dict, default_id: str, default_category: str = "General") -> dict:
+    """Map a raw JSON record onto the id/content/category/type document shape"""
+    category = record.get("category", default_category)
+    return {
+        "id": str(record.get("id", default_id)),
+        "content": record.get("content", record.get("text", record.get("body", ""))),
+        "category": category if category in config.CATEGORIES else "General",
+        "type": record.get("type", "article"),
+        "source": record.get("source", "help_center")
+    }
+
+def read_jsonl(path: str, prefix: str):
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield normalize_document(json.loads(line), f"{prefix}:{line_number}")
+            except json.JSONDecodeError as e:
+                logger.error(f"Skipping malformed line {line_number} in {path}: {e}")
+
+def iter_source_documents(source: str):
+    """Stream documents from a JSONL file or a directory tree.
+    
+    For .md/.txt files the id is the relative path and the category is the
+    parent directory name when it matches one of config.CATEGORIES.
+    """
+    if os.path.isfile(source):
+        yield from read_jsonl(source, os.path.basename(source))
+        return
+    
+    for root, dirs, files in os.walk(source):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            rel_path = os.path.relpath(path, source)
+            
+            if name.endswith(".jsonl"):
+                yield from read_jsonl(path, rel_path)
+            elif name.endswith(".json"):
+                with open(path, 'r', encoding='utf-8') as f:
+                    records = json.load(f)
+                for i, record in enumerate(records if isinstance(records, list) else [records]):
+                    yield normalize_document(record, f"{rel_path}:{i}")
+            elif name.endswith(TEXT_EXTENSIONS):
+                with open(path, 'r', encoding='utf-8') as f:
+                    text = f.read()
+                parent = os.path.basename(os.path.dirname(path))
+                yield normalize_document(
+                    {"content": text, "type": os.path.splitext(name)[0]},
+                    rel_path,
+                    default_category=parent
+                )
+
+def chunk_text(text: str, chunk_size: int, overlap: int) -> list[str]:
+    """Split text into windows of at most chunk_size words with overlap"""
+    words = text.split()
+    if len(words) <= chunk_size:
+        return [" ".join(words)] if words else []
+    
+    step = max(1, chunk_size - overlap)
+    return [" ".join(words[i:i + chunk_size]) for i in range(0, len(words) - overlap, step)]
+
+class IngestManifest:
+    """doc_id -> {hash, chunk_ids}, checkpointed atomically after each batch"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+    
+    def is_unchanged(self, doc_id: str, doc_hash: str) -> bool:
+        entry = self.entries.get(doc_id)
+        return entry is not None and entry["hash"] == doc_hash
+    
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, self.path)
 
 class DocumentIngestor:
     def __init__(self):
-        self.persist_directory = "./chroma_db"
-        self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-        
-        # NEW Chroma client syntax
-        self.client = chromadb.PersistentClient(path=self.persist_directory)
+        self.persist_directory = config.CHROMA_PERSIST_DIR
+        # Shared with the retrieval system, so only one model copy is loaded
+        self.embedding_model = get_embedding_model()
+        self.client = get_chroma_client()
+        self.bm25_index = get_bm25_index()
         
     def create_sample_documents(self):
         """Create sample support documents for each category"""
@@ -77,53 +189,202 @@ class DocumentIngestor:
         ]
         return documents
     
-    def ingest_documents(self):
-        """Ingest documents into ChromaDB"""
+    def get_collection(self):
+        # Create or get collection - NEW syntax
+        return self.client.get_or_create_collection(
+            name=config.CHROMA_COLLECTION,
+            metadata={"hnsw:space": "cosine"}
+        )
+    
+    def ingest_stream(self, documents, batch_size: int = None, workers: int = 1,
+                      chunk_size: int = None, chunk_overlap: int = None) -> dict:
+        """Chunk, embed and upsert a stream of documents in batches.
+        
+        Documents whose content hash matches the manifest are skipped. A
+        batch is flushed once it holds batch_size chunks; the BM25 index and
+        then the manifest are saved after every flush so a rerun resumes
+        after the last one.
+        """
+        batch_size = batch_size or config.INGEST_BATCH_SIZE
+        chunk_size = chunk_size or config.INGEST_CHUNK_WORDS
+        chunk_overlap = chunk_overlap if chunk_overlap is not None else config.INGEST_CHUNK_OVERLAP
+        
+        collection = self.get_collection()
+        manifest = IngestManifest(os.path.join(self.persist_directory, config.INGEST_MANIFEST_FILE))
+        pool = self.embedding_model.start_multi_process_pool(["cpu"] * workers) if workers > 1 else None
+        
+        # Collections ingested before the keyword index existed are backfilled once
+        if manifest.entries and len(self.bm25_index) == 0:
+            self.backfill_bm25_index(collection)
+            self.bm25_index.save()
+        
+        stats = {"documents": 0, "skipped": 0, "chunks": 0, "batches": 0, "categories": set()}
+        pending_docs, pending_chunks = [], []
+        start = time.perf_counter()
+        
         try:
-            # Create or get collection - NEW syntax
-            collection = self.client.get_or_create_collection(
-                name="support_knowledge_base",
-                metadata={"hnsw:space": "cosine"}
-            )
-            
-            # Get sample documents
-            documents = self.create_sample_documents()
-            
-            # Prepare data for ingestion
-            ids = [doc["id"] for doc in documents]
-            contents = [doc["content"] for doc in documents]
-            metadatas = [{
-                "category": doc["category"],
-                "type": doc["type"],
-                "source": "internal_knowledge_base"
-            } for doc in documents]
-            
-            # Generate embeddings
-            embeddings = self.embedding_model.encode(contents).tolist()
+            for doc in documents:
+                doc_hash = content_hash(doc)
+                if manifest.is_unchanged(doc["id"], doc_hash):
+                    stats["skipped"] += 1
+                    continue
+                
+                chunks = chunk_text(doc["content"], chunk_size, chunk_overlap)
+                # Single-chunk documents keep their own id
+                chunk_ids = [doc["id"]] if len(chunks) == 1 else [f"{doc['id']}#chunk{i}" for i in range(len(chunks))]
+                for i, (chunk_id, chunk) in enumerate(zip(chunk_ids, chunks)):
+                    pending_chunks.append((chunk_id, chunk, {
+                        "category": doc["category"],
+                        "type": doc["type"],
+                        "source": doc.get("source", "internal_knowledge_base"),
+                        "doc_id": doc["id"],
+                        "chunk_index": i,
+                        "content_hash": doc_hash
+                    }))
+                pending_docs.append((doc, doc_hash, chunk_ids))
+                
+                if len(pending_chunks) >= batch_size:
+                    self.flush_batch(collection, manifest, pending_docs, pending_chunks, pool, stats)
+                    pending_docs, pending_chunks = [], []
+                    elapsed = time.perf_counter() - start
+                    logger.info(f"Ingested {stats['documents']} docs ({stats['documents'] / elapsed:.1f} docs/sec), "
+                                f"skipped {stats['skipped']} unchanged")
             
-            # Add to collection - NEW syntax
+            if pending_docs:
+                self.flush_batch(collection, manifest, pending_docs, pending_chunks, pool, stats)
+        finally:
+            if pool is not None:
+                self.embedding_model.stop_multi_process_pool(pool)
+            if stats["batches"]:
+                self.publish_changes(collection)
+        
+        vector_index_dir = os.path.join(self.persist_directory, config.VECTOR_INDEX_DIR)
+        if config.RETRIEVAL_BACKEND == "numpy" and not os.path.exists(vector_index_dir):
+            self.publish_changes(collection)
+        
+        stats["elapsed_seconds"] = time.perf_counter() - start
+        stats["docs_per_sec"] = stats["documents"] / stats["elapsed_seconds"] if stats["elapsed_seconds"] > 0 else 0
+        stats["collection"] = collection
+        return stats
+    
+    def publish_changes(self, collection):
+        """Re-export the vector index if it is the backend, then bump the
+        knowledge base generation so retrieval caches are dropped"""
+        if config.RETRIEVAL_BACKEND == "numpy":
+            try:
+                export_vector_index(collection, os.path.join(self.persist_directory, config.VECTOR_INDEX_DIR))
+            except Exception as e:
+                logger.error(f"Failed to export vector index: {e}")
+        bump_kb_generation()
+    
+    def flush_batch(self, collection, manifest, pending_docs, pending_chunks, pool, stats):
+        """Embed and upsert one batch of chunks, then checkpoint the BM25 index and manifest"""
+        ids = [chunk_id for chunk_id, _, _ in pending_chunks]
+        contents = [chunk for _, chunk, _ in pending_chunks]
+        metadatas = [metadata for _, _, metadata in pending_chunks]
+        
+        # Generate embeddings
+        if pool is not None:
+            embeddings = self.embedding_model.encode_multi_process(contents, pool, normalize_embeddings=True)
+        else:
+            embeddings = self.embedding_model.encode(contents, batch_size=64, normalize_embeddings=True)
+        
+        # Add to collection - NEW syntax
+        if ids:
             collection.upsert(
                 documents=contents,
-                embeddings=embeddings,
+                embeddings=embeddings.tolist(),
                 metadatas=metadatas,
                 ids=ids
             )
+            self.bm25_index.upsert(ids, contents, metadatas)
+        
+        for doc, doc_hash, chunk_ids in pending_docs:
+            # Drop chunks left over from a longer previous version of the document
+            previous = manifest.entries.get(doc["id"], {}).get("chunk_ids", [])
+            current = set(chunk_ids)
+            stale = [chunk_id for chunk_id in previous if chunk_id not in current]
+            if stale:
+                collection.delete(ids=stale)
+                self.bm25_index.delete(stale)
+            manifest.entries[doc["id"]] = {"hash": doc_hash, "chunk_ids": chunk_ids}
+            stats["categories"].add(doc["category"])
+        
+        # Keyword index first: a manifest entry must never outlive its chunks
+        # in it, or a resumed run would skip the document for good
+        self.bm25_index.save()
+        manifest.save()
+        stats["documents"] += len(pending_docs)
+        stats["chunks"] += len(ids)
+        stats["batches"] += 1
+    
+    def backfill_bm25_index(self, collection, page_size: int = 1000):
+        """Load every chunk already in the collection into the BM25 index"""
+        offset = 0
+        while True:
+            page = collection.get(include=["documents", "metadatas"], limit=page_size, offset=offset)
+            if not page["ids"]:
+                break
+            self.bm25_index.upsert(page["ids"], page["documents"], page["metadatas"])
+            offset += len(page["ids"])
+        
+        logger.info(f"Backfilled BM25 index with {offset} chunks from the collection")
+    
+    def ingest_documents(self):
+        """Ingest documents into ChromaDB"""
+        try:
+            # Get sample documents
+            documents = self.create_sample_documents()
+            
+            stats = self.ingest_stream(documents)
             
-            print(f"✅ Successfully ingested {len(documents)} documents into ChromaDB")
-            print(f"📊 Categories: {set(doc['category'] for doc in documents)}")
+            print(f"✅ Successfully ingested {stats['documents']} documents into ChromaDB "
+                  f"({stats['skipped']} unchanged skipped)")
+            print(f"📊 Categories: {stats['categories'] or set(doc['category'] for doc in documents)}")
             
-            return collection
+            return stats["collection"]
             
         except Exception as e:
             print(f"❌ Error ingesting documents: {e}")
             # If collection exists, get it
             try:
-                return self.client.get_collection("support_knowledge_base")
+                return self.client.get_collection(config.CHROMA_COLLECTION)
             except:
                 raise e
 
 if __name__ == "__main__":
-    print("📥 Ingesting documents into ChromaDB...")
+    parser = argparse.ArgumentParser(description="Ingest documents into ChromaDB")
+    parser.add_argument("--source", help="Directory or JSONL file of documents (default: built-in samples)")
+    parser.add_argument("--batch-size", type=int, default=config.INGEST_BATCH_SIZE, help="Chunks per embed/upsert batch")
+    parser.add_argument("--workers", type=int, default=1, help="Embedding processes")
+    parser.add_argument("--chunk-words", type=int, default=config.INGEST_CHUNK_WORDS, help="Words per chunk")
+    parser.add_argument("--export-vector-index", action="store_true",
+                        help="Only export the collection to the NumPy vector index")
+    parser.add_argument("--quantize", action="store_true", help="Store the exported vector index as int8")
+    args = parser.parse_args()
+    
+    if args.quantize:
+        config.VECTOR_INDEX_QUANTIZE = True
+    
     ingestor = DocumentIngestor()
-    collection = ingestor.ingest_documents()
+    
+    if args.export_vector_index:
+        index = export_vector_index(ingestor.get_collection())
+        print(f"✅ Exported {len(index)} chunks to the {'int8' if index.quantized else 'float32'} vector index at {index.directory}")
+        raise SystemExit(0)
+    
+    print("📥 Ingesting documents into ChromaDB...")
+    
+    if args.source:
+        stats = ingestor.ingest_stream(
+            iter_source_documents(args.source),
+            batch_size=args.batch_size,
+            workers=args.workers,
+            chunk_size=args.chunk_words
+        )
+        print(f"✅ Ingested {stats['documents']} documents ({stats['chunks']} chunks) in {stats['batches']} batches")
+        print(f"⏭️  Skipped {stats['skipped']} unchanged documents")
+        print(f"⚡ {stats['docs_per_sec']:.1f} docs/sec over {stats['elapsed_seconds']:.1f}s")
+    else:
+        collection = ingestor.ingest_documents()
     print("🎉 Document ingestion completed!")
\ No newline at end of file
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Local embedding-based ticket classifier used as a fast path before the LLM.
+Evaluate with: python -m src.data.local_classifier --evaluate [--threshold 0.6]
+"""
+
+from src.data.mock_knowledge import MOCK_KNOWLEDGE_BASE
+from src.data.embeddings import get_embedding_model, embed_query
+from src.utils.config import config
+import argparse
+import csv
+import logging
+import numpy as np
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Category definitions from the classification prompt, used as seed examples
+CATEGORY_DESCRIPTIONS = {
+    "Billing": "Issues related to payments, invoices, subscriptions, refunds",
+    "Technical": "Software bugs, technical issues, feature requests, system errors",
+    "Security": "Account security, privacy concerns, data protection, authentication issues",
+    "General": "General inquiries, feedback, non-urgent questions, account management"
+}
+
+def ticket_text(subject: str, description: str) -> str:
+    """The text a ticket is classified by, for training and inference alike"""
+    return f"{subject or ''} {description or ''}".strip()
+
+def load_knowledge_examples() -> list[tuple[str, str]]:
+    """Knowledge base snippets and category definitions as (text, category) pairs"""
+    examples = [(text, category) for category, text in CATEGORY_DESCRIPTIONS.items()]
+    for category, snippets in MOCK_KNOWLEDGE_BASE.items():
+        examples.extend((snippet, category) for snippet in snippets)
+    return examples
+
+def is_llm_labelled(row: dict, path: str) -> bool:
+    """Whether an escalation log row's category came from the LLM.
+    
+    Rows record their category_source. Files without that column predate
+    the local classifier, except the live log, which may have been written
+    by a version that classified locally without recording it.
+    """
+    if "category_source" in row:
+        return row["category_source"] == "llm"
+    return os.path.abspath(path) != os.path.abspath(config.ESCALATION_LOG_FILE)
+
+def load_historical_tickets() -> list[tuple[str, str]]:
+    """LLM-labelled tickets from the dashboard store and escalation logs.
+    
+    Tickets labelled by the local classifier or served from the
+    classification cache are skipped, so the classifier never trains or
+    is evaluated on its own predictions. Every source yields
+    ticket_text(subject, description), the text used at inference;
+    dashboard rows logged before descriptions were stored are skipped.
+    """
+    examples = []
+    
+    try:
+        from src.dashboard.store import MetricsStore
+        
+        for ticket in MetricsStore().labelled_tickets(source="llm", limit=5000):
+            if ticket.get("category") in config.CATEGORIES:
+                examples.append((ticket_text(ticket["subject"], ticket["description"]), ticket["category"]))
+    except Exception as e:
+        logger.warning(f"Could not read dashboard ticket history: {e}")
+    
+    for csv_file in config.ESCALATION_LOG_FILES:
+        if not os.path.exists(csv_file):
+            continue
+        try:
+            with open(csv_file, 'r', newline='', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    category = (row.get("category") or "").strip()
+                    if category in config.CATEGORIES and is_llm_labelled(row, csv_file):
+                        text = ticket_text(row.get("ticket_subject"), row.get("ticket_description"))
+                        examples.append((text, category))
+        except Exception as e:
+            logger.warning(f"Could not read {csv_file}: {e}")
+    
+    return examples
+
+def softmax(scores: np.ndarray, temperature: float) -> np.ndarray:
+    scaled = (scores - scores.max()) / temperature
+    exp = np.exp(scaled)
+    return exp / exp.sum()
+
+class LocalClassifier:
+    """Nearest-centroid classifier over MiniLM sentence embeddings.
+    
+    Confidence is the softmax probability of the closest category centroid,
+    so ambiguous tickets score low and fall back to the LLM.
+    """
+    
+    def __init__(self, temperature: float = None):
+        self.temperature = temperature or config.LOCAL_CLASSIFIER_TEMPERATURE
+        self.categories = list(config.CATEGORIES)
+        self.centroids = None
+    
+    def embed(self, texts: list[str]) -> np.ndarray:
+        return np.asarray(get_embedding_model().encode(texts, normalize_embeddings=True), dtype=np.float32)
+    
+    def fit_embeddings(self, embeddings: np.ndarray, labels: list[str]):
+        """Compute one unit-length centroid per category"""
+        labels = np.asarray(labels)
+        centroids = []
+        for category in self.categories:
+            rows = embeddings[labels == category]
+            centroid = rows.mean(axis=0) if len(rows) else np.zeros(embeddings.shape[1], dtype=np.float32)
+            norm = np.linalg.norm(centroid)
+            centroids.append(centroid / norm if norm > 0 else centroid)
+        self.centroids = np.vstack(centroids)
+        return self
+    
+    def fit(self, examples: list[tuple[str, str]]):
+        texts = [text for text, _ in examples]
+        labels = [label for _, label in examples]
+        return self.fit_embeddings(self.embed(texts), labels)
+    
+    def predict_embedding(self, embedding: np.ndarray) -> tuple[str, float]:
+        probabilities = softmax(self.centroids @ embedding, self.temperature)
+        best = int(np.argmax(probabilities))
+        return self.categories[best], float(probabilities[best])
+    
+    def predict(self, text: str) -> tuple[str, float]:
+        """Predict (category, confidence) for a ticket text"""
+        return self.predict_embedding(np.asarray(embed_query(text), dtype=np.float32))
+
+_local_classifier = None
+_local_classifier_lock = threading.Lock()
+
+def get_local_classifier() -> LocalClassifier:
+    """Get the process-wide local classifier, training it on first use
+    (warm_up_workflow trains it at startup)"""
+    global _local_classifier
+    
+    if _local_classifier is None:
+        with _local_classifier_lock:
+            if _local_classifier is None:
+                examples = load_knowledge_examples() + load_historical_tickets()
+                _local_classifier = LocalClassifier().fit(examples)
+                logger.info(f"Local classifier trained on {len(examples)} examples")
+    
+    return _local_classifier
+
+def evaluate(threshold: float) -> dict:
+    """Leave-one-out evaluation against historical LLM labels"""
+    knowledge = load_knowledge_examples()
+    tickets = load_historical_tickets()
+    if not tickets:
+        raise ValueError("No historical LLM-labelled tickets found to evaluate against")
+    
+    classifier = LocalClassifier()
+    knowledge_embeddings = classifier.embed([text for text, _ in knowledge])
+    ticket_embeddings = classifier.embed([text for text, _ in tickets])
+    knowledge_labels = [label for _, label in knowledge]
+    ticket_labels = [label for _, label in tickets]
+    
+    correct = confident = confident_correct = 0
+    for i, (embedding, label) in enumerate(zip(ticket_embeddings, ticket_labels)):
+        # Train on the knowledge base plus every ticket except the one held out
+        keep = [j for j in range(len(tickets)) if j != i]
+        classifier.fit_embeddings(
+            np.vstack([knowledge_embeddings, ticket_embeddings[keep]]),
+            knowledge_labels + [ticket_labels[j] for j in keep]
+        )
+        predicted, confidence = classifier.predict_embedding(embedding)
+        
+        correct += predicted == label
+        if confidence >= threshold:
+            confident += 1
+            confident_correct += predicted == label
+    
+    total = len(tickets)
+    return {
+        "tickets": total,
+        "threshold": threshold,
+        "accuracy": correct / total,
+        "llm_calls_avoided": confident / total,
+        "fast_path_accuracy": confident_correct / confident if confident else 0.0,
+        # Low-confidence tickets go to the LLM, whose label is the reference
+        "end_to_end_accuracy": (confident_correct + total - confident) / total
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local ticket classifier")
+    parser.add_argument("--evaluate", action="store_true", help="Evaluate against historical LLM labels")
+    parser.add_argument("--threshold", type=float, default=config.LOCAL_CLASSIFIER_THRESHOLD)
+    args = parser.parse_args()
+    
+    if args.evaluate:
+        results = evaluate(args.threshold)
+        print("📊 Local classifier vs LLM labels (leave-one-out)")
+        print("-" * 50)
+        print(f"• Tickets evaluated: {results['tickets']}")
+        print(f"• Confidence threshold: {results['threshold']}")
+        print(f"• Accuracy (all predictions): {results['accuracy']:.1%}")
+        print(f"• LLM calls avoided: {results['llm_calls_avoided']:.1%}")
+        print(f"• Fast-path accuracy: {results['fast_path_accuracy']:.1%}")
+        print(f"• End-to-end accuracy with LLM fallback: {results['end_to_end_accuracy']:.1%}")
+    else:
+        parser.print_help()
@@ -32,43 +32,139 @@ MOCK_KNOWLEDGE_BASE = {
     ]
 }
 
+NO_CONTEXT = ["No specific context available for this category."]
+
+# Extra snippets added when a keyword appears in the ticket. "categories"
+# limits a rule to tickets of those categories; None applies it to all.
+TICKET_CONTEXT_RULES = [
+    {
+        "keywords": ["payment"],
+        "categories": ["Billing"],
+        "snippets": [
+            "For payment issues, check if the card expiration date is current.",
+            "International payments may require 3D Secure authentication.",
+            "Payment failures are logged and can be reviewed in the billing history."
+        ]
+    },
+    {
+        "keywords": ["login"],
+        "categories": ["Technical", "Security"],
+        "snippets": [
+            "Login attempts are limited to 5 tries per hour for security.",
+            "Password reset tokens expire after 1 hour for security reasons.",
+            "Check if CAPS LOCK is accidentally enabled when entering password."
+        ]
+    },
+    {
+        "keywords": ["security"],
+        "categories": ["Security"],
+        "snippets": [
+            "All login attempts are logged with IP address and timestamp.",
+            "Users receive email notifications for new device logins.",
+            "Account lockout occurs after 5 failed login attempts."
+        ]
+    }
+]
+
+# Guidance added on retry when a keyword appears in the review feedback
+FEEDBACK_CONTEXT_RULES = [
+    {
+        "keywords": ["refund"],
+        "categories": None,
+        "snippets": [
+            "Refund eligibility is determined case-by-case based on our terms of service.",
+            "Refunds typically take 5-7 business days to process once approved.",
+            "Partial refunds may be offered for unused portions of subscriptions."
+        ]
+    },
+    {
+        "keywords": ["policy", "compliance"],
+        "categories": None,
+        "snippets": [
+            "Always refer customers to our terms of service for policy questions.",
+            "Avoid making specific promises about outcomes or timelines.",
+            "Escalate to human review when policy interpretation is unclear."
+        ]
+    },
+    {
+        "keywords": ["security"],
+        "categories": None,
+        "snippets": [
+            "Never share specific security implementation details with customers.",
+            "Refer security concerns to security@ourcompany.com for expert handling.",
+            "Use general security best practices language without specifics."
+        ]
+    }
+]
+
+class ContextRuleTable:
+    """Keyword -> snippet rules compiled into lookup tables.
+    
+    Each distinct keyword maps to a bitmask of the rules it triggers, and
+    the snippet list for every (category, set of matched rules) is built
+    here, once. A lookup lowercases the texts once, ORs together the masks
+    of the keywords found in them and indexes the category's bundle tuple.
+    Keywords match as substrings, like `in`; for tables this small a
+    substring test per keyword is faster than a regex alternation.
+    """
+    
+    def __init__(self, rules: list[dict], base_context: dict = None, default_context: list[str] = ()):
+        self.rules = rules
+        self._keyword_masks = {}
+        for i, rule in enumerate(rules):
+            for keyword in rule["keywords"]:
+                keyword = keyword.lower()
+                self._keyword_masks[keyword] = self._keyword_masks.get(keyword, 0) | (1 << i)
+        self._keywords = tuple(self._keyword_masks.items())
+        self._all_rules = (1 << len(rules)) - 1
+        
+        # Rule tables are a handful of entries, so all 2^n combinations are cheap
+        self._bundles = {
+            category: self._build_bundles(category, base)
+            for category, base in (base_context or {}).items()
+        }
+        self._default_bundles = self._build_bundles(None, default_context)
+    
+    def _build_bundles(self, category: str, base: list[str]) -> list[tuple]:
+        bundles = []
+        for mask in range(self._all_rules + 1):
+            snippets = list(base)
+            for i, rule in enumerate(self.rules):
+                if mask >> i & 1 and (rule["categories"] is None or category in rule["categories"]):
+                    snippets.extend(rule["snippets"])
+            bundles.append(tuple(snippets))
+        return bundles
+    
+    def match(self, *texts: str) -> int:
+        """Bitmask of the rules whose keywords occur in any of texts"""
+        # Texts are joined with a newline so a keyword can't span two of them
+        lowered = "\n".join(texts).lower()
+        mask = 0
+        for keyword, rules in self._keywords:
+            if keyword in lowered:
+                mask |= rules
+        return mask
+    
+    def context(self, category: str, *texts: str) -> list[str]:
+        """Base context for category plus the snippets of every matching rule"""
+        bundles = self._bundles.get(category, self._default_bundles)
+        return list(bundles[self.match(*texts)])
+
+ticket_context_rules = ContextRuleTable(TICKET_CONTEXT_RULES, MOCK_KNOWLEDGE_BASE, NO_CONTEXT)
+feedback_context_rules = ContextRuleTable(FEEDBACK_CONTEXT_RULES)
+
 def get_mock_context(category: str, query: str = "") -> list[str]:
     """Get mock context for a given category"""
     if category not in MOCK_KNOWLEDGE_BASE:
-        return ["No specific context available for this category."]
+        return list(NO_CONTEXT)
     
     # Return all context for the category (in real system, this would be based on query)
     return MOCK_KNOWLEDGE_BASE[category]
 
 def get_enhanced_context(category: str, ticket_subject: str, ticket_description: str) -> list[str]:
     """Get enhanced context based on the specific ticket content"""
-    base_context = get_mock_context(category)
-    
-    # Add some context based on keywords in the ticket
-    additional_context = []
-    
-    if "payment" in ticket_subject.lower() or "payment" in ticket_description.lower():
-        if category == "Billing":
-            additional_context.extend([
-                "For payment issues, check if the card expiration date is current.",
-                "International payments may require 3D Secure authentication.",
-                "Payment failures are logged and can be reviewed in the billing history."
-            ])
-    
-    if "login" in ticket_subject.lower() or "login" in ticket_description.lower():
-        if category in ["Technical", "Security"]:
-            additional_context.extend([
-                "Login attempts are limited to 5 tries per hour for security.",
-                "Password reset tokens expire after 1 hour for security reasons.",
-                "Check if CAPS LOCK is accidentally enabled when entering password."
-            ])
-    
-    if "security" in ticket_subject.lower() or "security" in ticket_description.lower():
-        if category == "Security":
-            additional_context.extend([
-                "All login attempts are logged with IP address and timestamp.",
-                "Users receive email notifications for new device logins.",
-                "Account lockout occurs after 5 failed login attempts."
-            ])
-    
-    return base_context + additional_context
\ No newline at end of file
+    return ticket_context_rules.context(category, ticket_subject or "", ticket_description or "")
+
+def get_feedback_context(review_feedback: str) -> list[str]:
+    """Retry guidance for the topics raised in review feedback"""
+    return feedback_context_rules.context(None, str(review_feedback))
@@ -3,81 +3,309 @@
 Real RAG retrieval system using ChromaDB - UPDATED FOR NEW CHROMA API
 """
 
-import chromadb
-from sentence_transformers import SentenceTransformer
+from concurrent.futures import ThreadPoolExecutor
+from src.data.embeddings import get_embedding_model, get_chroma_client, embed_query
+from src.data.bm25_index import bm25_reload_in_progress, get_bm25_index, reload_bm25_index_async
+from src.data.vector_index import VectorIndex
+from src.utils.cache import LRUCache
 from src.utils.config import config
+from src.utils.metrics import metrics
 import logging
+import os
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+# Runs BM25 searches while the calling thread does the vector search
+_keyword_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="bm25")
+
+# Last generation seen by this process and when the file was last read
+_generation_state = {"value": None, "checked_at": 0.0}
+_generation_lock = threading.Lock()
+
+def _generation_path() -> str:
+    return os.path.join(config.CHROMA_PERSIST_DIR, config.KB_GENERATION_FILE)
+
+def _read_generation_file() -> int:
+    try:
+        with open(_generation_path(), 'r', encoding='utf-8') as f:
+            return int(f.read().strip() or 0)
+    except (FileNotFoundError, ValueError):
+        return 0
+
+def current_kb_generation() -> int:
+    """Knowledge base generation, re-read from disk at most every KB_GENERATION_CHECK_SECONDS"""
+    with _generation_lock:
+        now = time.monotonic()
+        if _generation_state["value"] is None or now - _generation_state["checked_at"] >= config.KB_GENERATION_CHECK_SECONDS:
+            _generation_state["value"] = _read_generation_file()
+            _generation_state["checked_at"] = now
+        return _generation_state["value"]
+
+def bump_kb_generation() -> int:
+    """Mark the knowledge base as changed; called by the ingestor after writing"""
+    with _generation_lock:
+        generation = _read_generation_file() + 1
+        os.makedirs(os.path.dirname(_generation_path()) or ".", exist_ok=True)
+        tmp_path = f"{_generation_path()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(str(generation))
+        os.replace(tmp_path, _generation_path())
+        _generation_state["value"] = generation
+        _generation_state["checked_at"] = time.monotonic()
+    
+    logger.info(f"Knowledge base generation is now {generation}")
+    return generation
+
+def reciprocal_rank_fusion(rankings: list[list[dict]], k: int = None) -> list[dict]:
+    """Merge ranked result lists by summed 1 / (k + rank), keyed by item id"""
+    k = k if k is not None else config.RRF_K
+    fused = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, 1):
+            entry = fused.setdefault(item["id"], {**item, "rrf_score": 0.0})
+            entry["rrf_score"] += 1 / (k + rank)
+    
+    return sorted(fused.values(), key=lambda item: item["rrf_score"], reverse=True)
+
 class RealRetrievalSystem:
     def __init__(self):
         self.persist_directory = config.CHROMA_PERSIST_DIR
-        self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+        # The embedding model and Chroma collection are opened on first use
+        self._collection = None
+        self._collection_loaded = False
+        self._vector_index = None
+        self._vector_index_loaded = False
+        self._lock = threading.Lock()
+        # (generation, category, n_results, normalized query) -> scored items
+        self.query_cache = LRUCache(
+            max_size=config.RETRIEVAL_CACHE_MAX_ENTRIES,
+            ttl_seconds=config.RETRIEVAL_CACHE_TTL_SECONDS,
+            name="retrieval"
+        )
+        self._generation = None
+    
+    @property
+    def embedding_model(self):
+        return get_embedding_model()
+    
+    @property
+    def collection(self):
+        """The knowledge base collection, or None if ChromaDB isn't set up"""
+        if not self._collection_loaded:
+            with self._lock:
+                if not self._collection_loaded:
+                    try:
+                        self._collection = get_chroma_client().get_collection(config.CHROMA_COLLECTION)
+                    except Exception as e:
+                        logger.warning(f"ChromaDB collection not found: {e}. Using mock fallback.")
+                        self._collection = None
+                    self._collection_loaded = True
+        
+        return self._collection
+    
+    @property
+    def vector_index(self):
+        """The memory-mapped NumPy index, or None if it hasn't been exported"""
+        if not self._vector_index_loaded:
+            with self._lock:
+                if not self._vector_index_loaded:
+                    directory = os.path.join(config.CHROMA_PERSIST_DIR, config.VECTOR_INDEX_DIR)
+                    try:
+                        self._vector_index = VectorIndex(directory)
+                    except Exception as e:
+                        logger.warning(f"Vector index not found at {directory}: {e}. Using mock fallback.")
+                        self._vector_index = None
+                    self._vector_index_loaded = True
+        
+        return self._vector_index
+    
+    @property
+    def backend(self):
+        """The configured dense search backend, or None if it isn't available"""
+        return self.vector_index if config.RETRIEVAL_BACKEND == "numpy" else self.collection
+    
+    def reload(self):
+        """Forget the cached collection and vector index so the next query reopens them"""
+        with self._lock:
+            self._collection = None
+            self._collection_loaded = False
+            self._vector_index = None
+            self._vector_index_loaded = False
+    
+    def _sync_generation(self) -> int:
+        """Drop cached results and reopen the indexes after an ingestion"""
+        generation = current_kb_generation()
+        if generation != self._generation:
+            if self._generation is not None:
+                logger.info(f"Knowledge base changed (generation {self._generation} -> {generation}); clearing retrieval cache")
+                self.query_cache.clear()
+                self.reload()
+                reload_bm25_index_async()
+            self._generation = generation
+        return generation
+    
+    def _query(self, query: str, category: str, n_results: int) -> list[dict]:
+        """Embed the query and run one dense search, returning scored items"""
+        # Generate query embedding (micro-batched with concurrent tickets)
+        with metrics.timer("embedding_duration_seconds", operation="query"):
+            query_embedding = embed_query(query)
+        
+        if config.RETRIEVAL_BACKEND == "numpy":
+            with metrics.timer("vector_index_query_duration_seconds"):
+                return self.vector_index.search(query_embedding, category, n_results)
+        
+        # Build filters - NEW syntax
+        where_filter = {"category": {"$eq": category}} if category else None
+        
+        # Query the database - NEW syntax
+        with metrics.timer("chroma_query_duration_seconds"):
+            results = self.collection.query(
+                query_embeddings=[query_embedding.tolist()],
+                n_results=n_results,
+                where=where_filter,
+                include=["documents", "metadatas", "distances"]
+            )
+        
+        # Format results
+        context_items = []
+        for chunk_id, doc, metadata, distance in zip(
+            results['ids'][0],
+            results['documents'][0],
+            results['metadatas'][0],
+            results['distances'][0]
+        ):
+            context_items.append({
+                "id": chunk_id,
+                "content": doc,
+                "category": metadata.get('category', 'Unknown'),
+                "type": metadata.get('type', 'Unknown'),
+                "confidence": 1 - distance  # Convert distance to confidence
+            })
         
+        return context_items
+    
+    def _keyword_query(self, query: str, category: str, n_results: int) -> list[dict]:
+        with metrics.timer("bm25_query_duration_seconds"):
+            return get_bm25_index().search(query, category, n_results)
+    
+    def _cached_search(self, query: str, category: str, n_results: int) -> list[dict]:
+        """_search through the result cache, keyed on the normalized query"""
+        if not config.RETRIEVAL_CACHE_ENABLED:
+            items, _ = self._search(query, category, n_results)
+            return items
+        
+        key = f"{self._generation}|{category}|{n_results}|{' '.join(query.lower().split())}"
+        items = self.query_cache.get(key)
+        if items is None:
+            items, complete = self._search(query, category, n_results)
+            if complete:
+                self.query_cache.set(key, items)
+        return list(items)
+    
+    def _search(self, query: str, category: str, n_results: int) -> tuple[list[dict], bool]:
+        """Dense search, or with HYBRID_RETRIEVAL dense + BM25 in parallel fused by RRF.
+        
+        Returns (items, complete); complete is False when the results are
+        degraded (BM25 failed, or still serving the pre-ingestion index)
+        and must not be cached.
+        """
+        if not config.HYBRID_RETRIEVAL:
+            return self._query(query, category, n_results), True
+        
+        candidates = max(n_results, config.HYBRID_CANDIDATES)
+        complete = not bm25_reload_in_progress()
+        keyword_future = _keyword_executor.submit(self._keyword_query, query, category, candidates)
+        dense = self._query(query, category, candidates)
         try:
-            # NEW Chroma client syntax
-            self.client = chromadb.PersistentClient(path=self.persist_directory)
-            self.collection = self.client.get_collection("support_knowledge_base")
+            keyword = keyword_future.result()
         except Exception as e:
-            logger.warning(f"ChromaDB collection not found: {e}. Using mock fallback.")
-            self.collection = None
+            logger.error(f"BM25 search failed, using vector results only: {e}")
+            metrics.inc("retrieval_fallbacks_total", reason="bm25_error")
+            keyword = []
+            complete = False
+        
+        return reciprocal_rank_fusion([dense, keyword])[:n_results], complete
     
     def retrieve_context(self, query: str, category: str = None, n_results: int = 5) -> list[str]:
         """Retrieve relevant context using semantic search"""
+        self._sync_generation()
         
-        # If ChromaDB isn't set up, fall back to mock data
-        if self.collection is None:
-            logger.warning("Using mock data fallback - ChromaDB not initialized")
+        # If the knowledge base isn't set up, fall back to mock data
+        if self.backend is None:
+            logger.warning(f"Using mock data fallback - {config.RETRIEVAL_BACKEND} backend not initialized")
+            metrics.inc("retrieval_fallbacks_total", reason="no_collection")
             from src.data.mock_knowledge import get_enhanced_context
             return get_enhanced_context(category or "General", query, "")
         
         try:
-            # Generate query embedding
-            query_embedding = self.embedding_model.encode([query]).tolist()[0]
-            
-            # Build filters - NEW syntax
-            where_filter = None
-            if category:
-                where_filter = {"category": {"$eq": category}}
-            
-            # Query the database - NEW syntax
-            results = self.collection.query(
-                query_embeddings=[query_embedding],
-                n_results=n_results,
-                where=where_filter,
-                include=["documents", "metadatas", "distances"]
-            )
-            
-            # Format results
-            context_items = []
-            for i, (doc, metadata, distance) in enumerate(zip(
-                results['documents'][0],
-                results['metadatas'][0],
-                results['distances'][0]
-            )):
-                context_items.append({
-                    "content": doc,
-                    "category": metadata.get('category', 'Unknown'),
-                    "type": metadata.get('type', 'Unknown'),
-                    "confidence": 1 - distance  # Convert distance to confidence
-                })
+            context_items = self._cached_search(query, category, n_results)
             
-            logger.info(f"Retrieved {len(context_items)} context items with confidence: {[round(item['confidence'], 2) for item in context_items]}")
+            logger.info(f"Retrieved {len(context_items)} context items: {[item['id'] for item in context_items]}")
             
             # Return just the content for now
             return [item["content"] for item in context_items]
             
         except Exception as e:
             logger.error(f"Error retrieving from ChromaDB: {e}")
+            metrics.inc("retrieval_fallbacks_total", reason="error")
             # Fall back to mock data
             from src.data.mock_knowledge import get_enhanced_context
             return get_enhanced_context(category or "General", query, "")
+    
+    def retrieve_candidates(self, query: str, n_results: int = None) -> list[dict]:
+        """Top-k scored items across all categories, for filtering once the
+        category is known. Returns None when Chroma is unavailable."""
+        self._sync_generation()
+        if self.backend is None:
+            return None
+        
+        try:
+            return self._cached_search(query, None, n_results or config.PREFETCH_CANDIDATES)
+        except Exception as e:
+            logger.error(f"Error prefetching from ChromaDB: {e}")
+            return None
+    
+    def select_context(self, candidates: list[dict], query: str, category: str, n_results: int = 5) -> list[str]:
+        """Pick the best prefetched candidates for the category; candidates
+        arrive best first, as ranked by _search.
+        
+        Falls back to a category-filtered search (or the mock knowledge base)
+        when prefetching failed or no candidate belongs to the category, and
+        tops up with one when fewer than n_results candidates match.
+        """
+        if candidates is not None:
+            matching = [item["content"] for item in candidates if item["category"] == category][:n_results]
+            
+            if len(matching) >= n_results:
+                metrics.inc("prefetch_selections_total", result="hit")
+                logger.info(f"Selected {len(matching)} of {len(candidates)} prefetched items for {category}")
+                return matching
+            
+            if matching:
+                metrics.inc("prefetch_selections_total", result="topped_up")
+                logger.info(f"Only {len(matching)} prefetched items for {category}; topping up with a filtered search")
+                extra = [item for item in self.retrieve_context(query, category, n_results) if item not in matching]
+                return matching + extra[:n_results - len(matching)]
+        
+        metrics.inc("prefetch_selections_total", result="fallback")
+        return self.retrieve_context(query, category, n_results)
 
-# Global instance
+# Global instance (cheap to construct; nothing is loaded until first query)
 retrieval_system = RealRetrievalSystem()
 
 def get_real_context(category: str, ticket_subject: str, ticket_description: str) -> list[str]:
     """Get real context using semantic search"""
     query = f"{ticket_subject} {ticket_description}"
-    return retrieval_system.retrieve_context(query, category)
\ No newline at end of file
+    return retrieval_system.retrieve_context(query, category)
+
+def prefetch_real_candidates(ticket_subject: str, ticket_description: str) -> list[dict]:
+    """Category-independent candidates, fetched while classification runs"""
+    query = f"{ticket_subject} {ticket_description}"
+    return retrieval_system.retrieve_candidates(query)
+
+def select_real_context(candidates: list[dict], category: str, ticket_subject: str, ticket_description: str) -> list[str]:
+    """Context for the category, chosen from prefetched candidates"""
+    query = f"{ticket_subject} {ticket_description}"
+    return retrieval_system.select_context(candidates, query, category)
\ No newline at end of file
@@ -0,0 +1,119 @@
+"""
+Semantic cache of approved responses for near-duplicate tickets
+"""
+
+from src.utils.cache import LRUCache, normalize_ticket_text
+from src.data.embeddings import embed_query
+from src.utils.config import config
+from src.utils.metrics import metrics
+import hashlib
+import logging
+import numpy as np
+import threading
+
+logger = logging.getLogger(__name__)
+
+class SemanticResponseCache:
+    """Returns a previously approved draft when a new ticket in the same
+    category is semantically close enough to one we've already answered."""
+    
+    def __init__(self, threshold: float = None, max_size: int = None,
+                 ttl_seconds: float = None, persist_path: str = None):
+        self.threshold = threshold if threshold is not None else config.RESPONSE_CACHE_THRESHOLD
+        self.entries = LRUCache(
+            max_size=max_size or config.RESPONSE_CACHE_MAX_ENTRIES,
+            ttl_seconds=ttl_seconds or config.RESPONSE_CACHE_TTL_SECONDS,
+            persist_path=persist_path if persist_path is not None else config.RESPONSE_CACHE_PATH,
+            persist_interval=config.RESPONSE_CACHE_PERSIST_INTERVAL
+        )
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # category -> (keys, embedding matrix), rebuilt when the category's keys change
+        self._matrices = {}
+    
+    def embed(self, text: str) -> np.ndarray:
+        """Embed text with the retrieval system's MiniLM model (unit-normalized)"""
+        return embed_query(text)
+    
+    def _category_matrix(self, category: str, candidates: dict) -> tuple[list, np.ndarray]:
+        """Embedding matrix of the category's entries, reused until an entry
+        is stored, evicted or expires"""
+        with self._lock:
+            cached = self._matrices.get(category)
+            if cached is not None and len(cached[0]) == len(candidates) and all(key in candidates for key in cached[0]):
+                return cached
+        
+        keys = list(candidates)
+        matrix = np.asarray([candidates[key]["embedding"] for key in keys], dtype=np.float32)
+        with self._lock:
+            self._matrices[category] = (keys, matrix)
+        return keys, matrix
+    
+    def lookup(self, ticket: dict, category: str):
+        """Find the closest cached entry in this category above the threshold"""
+        candidates = {key: entry for key, entry in self.entries.items() if entry["category"] == category}
+        
+        best_key, best_entry, best_score = None, None, -1.0
+        if candidates:
+            query = self.embed(normalize_ticket_text(ticket["subject"], ticket["description"]))
+            keys, matrix = self._category_matrix(category, candidates)
+            scores = matrix @ query
+            best = int(np.argmax(scores))
+            best_key = keys[best]
+            best_entry = candidates[best_key]
+            best_score = float(scores[best])
+        
+        with self._lock:
+            if best_entry is None or best_score < self.threshold:
+                self.misses += 1
+                metrics.inc("cache_requests_total", cache="response", result="miss")
+                return None
+            self.hits += 1
+        metrics.inc("cache_requests_total", cache="response", result="hit")
+        
+        self.entries.touch(best_key)
+        logger.info(f"Response cache hit (similarity {best_score:.3f}) for category {category}")
+        return {**best_entry, "similarity": best_score}
+    
+    def store(self, ticket: dict, category: str, draft_response: str):
+        """Cache an approved draft for this ticket"""
+        text = normalize_ticket_text(ticket["subject"], ticket["description"])
+        key = hashlib.sha1(f"{category}|{text}".encode("utf-8")).hexdigest()
+        
+        self.entries.set(key, {
+            "category": category,
+            "subject": ticket["subject"],
+            "embedding": [round(float(x), 6) for x in self.embed(text)],
+            "draft_response": draft_response
+        })
+        with self._lock:
+            self._matrices.pop(category, None)
+    
+    def stats(self) -> dict:
+        """Get hit-rate metrics"""
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total * 100, 2) if total > 0 else 0,
+            "size": len(self.entries),
+            "evictions": self.entries.evictions,
+            "threshold": self.threshold
+        }
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+def get_response_cache() -> SemanticResponseCache:
+    """Get the process-wide semantic response cache"""
+    global _response_cache
+    
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = SemanticResponseCache()
+    
+    return _response_cache
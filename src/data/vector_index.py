@@ -0,0 +1,183 @@
+"""
+In-process NumPy vector index, an alternative retrieval backend to Chroma.
+
+The knowledge base is small enough (tens of thousands of 384-dim chunks)
+that exact search is one matrix-vector product. Embeddings are stored in a
+.npy file, sorted by category so each category is a contiguous row range,
+and memory-mapped on load; top-k is an argpartition over the scores of the
+relevant range. Optionally rows are int8-quantized with a per-row scale:
+4x less memory and near-identical rankings, but the int8 product doesn't
+go through BLAS, so float32 is the faster choice when memory allows.
+
+Layout of the index directory:
+    CURRENT       name of the live version subdirectory
+    v<n>/
+        vectors.npy   float32 or int8 matrix, one row per chunk
+        scales.npy    per-row float32 scales (int8 only)
+        meta.json     ids, documents, types and category row ranges
+
+Each export writes a complete new version and then atomically replaces
+CURRENT, so an index opened at any moment sees one consistent set of
+files. The previous version is kept for readers that still map it.
+"""
+
+from src.utils.config import config
+import json
+import logging
+import numpy as np
+import os
+import shutil
+import time
+
+logger = logging.getLogger(__name__)
+
+CURRENT_FILE = "CURRENT"
+KEEP_VERSIONS = 2
+
+def current_version_dir(directory: str) -> str:
+    """Directory holding the live version's files"""
+    try:
+        with open(os.path.join(directory, CURRENT_FILE), 'r', encoding='utf-8') as f:
+            return os.path.join(directory, f.read().strip())
+    except FileNotFoundError:
+        # Indexes exported before versioning keep their files at the top level
+        return directory
+
+def _publish_version(directory: str, version: str):
+    tmp_path = os.path.join(directory, f"{CURRENT_FILE}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(version)
+    os.replace(tmp_path, os.path.join(directory, CURRENT_FILE))
+
+def _remove_old_versions(directory: str, keep: int = KEEP_VERSIONS):
+    versions = sorted(
+        (name for name in os.listdir(directory) if name.startswith("v") and name[1:].isdigit()),
+        key=lambda name: int(name[1:])
+    )
+    for name in versions[:-keep]:
+        # Open memory maps stay valid on POSIX; elsewhere the delete may fail until they close
+        shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+
+class VectorIndex:
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.version_dir = current_version_dir(directory)
+        
+        with open(os.path.join(self.version_dir, "meta.json"), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        
+        self.ids = meta["ids"]
+        self.documents = meta["documents"]
+        self.types = meta["types"]
+        self.categories = {category: tuple(bounds) for category, bounds in meta["categories"].items()}
+        self.quantized = meta["dtype"] == "int8"
+        
+        # Read-only memory maps are shared safely between threads
+        self.vectors = np.load(os.path.join(self.version_dir, "vectors.npy"), mmap_mode="r")
+        self.scales = np.load(os.path.join(self.version_dir, "scales.npy"), mmap_mode="r") if self.quantized else None
+        
+        logger.info(f"Loaded {meta['dtype']} vector index with {len(self.ids)} rows from {self.version_dir}")
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def category_of(self, row: int) -> str:
+        for category, (start, end) in self.categories.items():
+            if start <= row < end:
+                return category
+        return "Unknown"
+    
+    def search(self, query_embedding: np.ndarray, category: str = None, n_results: int = 5) -> list[dict]:
+        """Exact top-k by dot product (cosine for normalized embeddings), best first"""
+        if category:
+            if category not in self.categories:
+                return []
+            start, end = self.categories[category]
+        else:
+            start, end = 0, len(self.ids)
+        
+        if end <= start:
+            return []
+        
+        query = np.asarray(query_embedding, dtype=np.float32)
+        scores = self.vectors[start:end] @ query
+        if self.quantized:
+            scores = scores * self.scales[start:end]
+        
+        k = min(n_results, end - start)
+        top = np.argpartition(-scores, k - 1)[:k] if k < end - start else np.arange(end - start)
+        top = top[np.argsort(-scores[top])]
+        
+        return [
+            {
+                "id": self.ids[start + i],
+                "content": self.documents[start + i],
+                "category": category or self.category_of(start + i),
+                "type": self.types[start + i],
+                "confidence": float(scores[i])
+            }
+            for i in top
+        ]
+
+def build_vector_index(directory: str, ids: list[str], embeddings, documents: list[str],
+                       metadatas: list[dict], quantize: bool = False) -> VectorIndex:
+    """Write an index for the given chunks and open it"""
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    categories = [metadata.get("category", "Unknown") for metadata in metadatas]
+    order = sorted(range(len(ids)), key=lambda i: categories[i])
+    
+    ranges = {}
+    for row, i in enumerate(order):
+        start, _ = ranges.get(categories[i], (row, row))
+        ranges[categories[i]] = (start, row + 1)
+    
+    matrix = embeddings[order] if order else np.zeros((0, embeddings.shape[1] if embeddings.ndim == 2 else 0), dtype=np.float32)
+    
+    # A fresh version directory, published only once every file is written
+    version = f"v{time.time_ns()}"
+    version_dir = os.path.join(directory, version)
+    os.makedirs(version_dir)
+    
+    if quantize:
+        scales = np.abs(matrix).max(axis=1) / 127.0 if len(matrix) else np.zeros(0, dtype=np.float32)
+        scales = np.where(scales == 0, 1.0, scales).astype(np.float32)
+        np.save(os.path.join(version_dir, "vectors.npy"), np.round(matrix / scales[:, None]).astype(np.int8))
+        np.save(os.path.join(version_dir, "scales.npy"), scales)
+    else:
+        np.save(os.path.join(version_dir, "vectors.npy"), matrix)
+    
+    meta = {
+        "dtype": "int8" if quantize else "float32",
+        "ids": [ids[i] for i in order],
+        "documents": [documents[i] for i in order],
+        "types": [metadatas[i].get("type", "Unknown") for i in order],
+        "categories": ranges
+    }
+    with open(os.path.join(version_dir, "meta.json"), 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    
+    _publish_version(directory, version)
+    _remove_old_versions(directory)
+    
+    return VectorIndex(directory)
+
+def export_vector_index(collection, directory: str = None, quantize: bool = None, page_size: int = 5000) -> VectorIndex:
+    """Export every chunk of a Chroma collection, with its stored embedding"""
+    directory = directory or os.path.join(config.CHROMA_PERSIST_DIR, config.VECTOR_INDEX_DIR)
+    quantize = config.VECTOR_INDEX_QUANTIZE if quantize is None else quantize
+    
+    ids, embeddings, documents, metadatas = [], [], [], []
+    offset = 0
+    while True:
+        page = collection.get(include=["embeddings", "documents", "metadatas"], limit=page_size, offset=offset)
+        if not len(page["ids"]):
+            break
+        ids.extend(page["ids"])
+        embeddings.extend(page["embeddings"])
+        documents.extend(page["documents"])
+        metadatas.extend(page["metadatas"])
+        offset += len(page["ids"])
+    
+    index = build_vector_index(directory, ids, embeddings, documents, metadatas, quantize=quantize)
+    logger.info(f"Exported {len(index)} chunks to the vector index at {directory}")
+    return index
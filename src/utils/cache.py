@@ -0,0 +1,180 @@
+from collections import OrderedDict
+from src.utils.metrics import metrics
+import atexit
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+def normalize_ticket_text(subject: str, description: str) -> str:
+    """Lowercase and collapse whitespace so trivially different tickets match"""
+    return " ".join(f"{subject} {description}".lower().split())
+
+def ticket_hash(subject: str, description: str) -> str:
+    """Stable hash of the normalized ticket text, for exact-match caches"""
+    return hashlib.sha256(normalize_ticket_text(subject, description).encode("utf-8")).hexdigest()
+
+class LRUCache:
+    """Thread-safe LRU cache with optional TTL and JSON persistence.
+
+    Keys must be strings and values JSON-serializable when persist_path is
+    set. Entries are stamped with wall-clock time so TTLs survive restarts.
+    """
+
+    def __init__(self, max_size: int = 1000, ttl_seconds: float = None,
+                 persist_path: str = None, persist_interval: float = 0, name: str = None):
+        self.name = name
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.persist_path = persist_path
+        self.persist_interval = persist_interval
+        self._entries = OrderedDict()  # key -> (created_at, value)
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()  # one writer of the tmp file at a time
+        self._last_save = 0.0
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if persist_path:
+            self.load()
+            atexit.register(self.save)
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def get(self, key: str, default=None):
+        """Get a value, counting a hit or miss and refreshing its LRU position"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._expired(entry[0], time.time()):
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                if self.name:
+                    metrics.inc("cache_requests_total", cache=self.name, result="miss")
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            if self.name:
+                metrics.inc("cache_requests_total", cache=self.name, result="hit")
+            return entry[1]
+
+    def touch(self, key: str):
+        """Mark a key as recently used without counting a hit"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+
+    def set(self, key: str, value):
+        """Store a value, evicting the least recently used entry when full"""
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+            self._dirty = True
+            should_save = self.persist_path and time.time() - self._last_save >= self.persist_interval
+            if should_save:
+                # Claim this save slot so concurrent setters don't all save
+                self._last_save = time.time()
+
+        # Written outside the lock so readers aren't blocked on file I/O
+        if should_save:
+            self.save()
+
+    def delete(self, key: str):
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._dirty = True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._dirty = True
+
+    def items(self) -> list[tuple]:
+        """Snapshot of live (key, value) pairs, oldest first; expired entries are dropped"""
+        with self._lock:
+            now = time.time()
+            expired = [k for k, (created_at, _) in self._entries.items() if self._expired(created_at, now)]
+            for key in expired:
+                del self._entries[key]
+            return [(k, v) for k, (_, v) in self._entries.items()]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> dict:
+        """Get hit/miss counters and size"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total * 100, 2) if total > 0 else 0,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "evictions": self.evictions
+            }
+
+    def save(self):
+        """Atomically write the cache to persist_path"""
+        if not self.persist_path:
+            return
+
+        # Snapshots are taken and written under the save lock, so a newer
+        # snapshot is never overwritten by an older one
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                snapshot = [
+                    {"key": k, "created_at": created_at, "value": v}
+                    for k, (created_at, v) in self._entries.items()
+                ]
+                self._dirty = False
+                self._last_save = time.time()
+
+            try:
+                directory = os.path.dirname(self.persist_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                tmp_path = f"{self.persist_path}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(snapshot, f)
+                os.replace(tmp_path, self.persist_path)
+            except Exception as e:
+                logger.error(f"Failed to persist cache to {self.persist_path}: {e}")
+                with self._lock:
+                    self._dirty = True
+
+    def load(self):
+        """Load non-expired entries from persist_path, if it exists"""
+        if not self.persist_path or not os.path.exists(self.persist_path):
+            return
+
+        try:
+            with open(self.persist_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache file {self.persist_path}: {e}")
+            return
+
+        now = time.time()
+        with self._lock:
+            for entry in snapshot[-self.max_size:]:
+                if not self._expired(entry["created_at"], now):
+                    self._entries[entry["key"]] = (entry["created_at"], entry["value"])
+
+        logger.info(f"Loaded {len(self._entries)} cache entries from {self.persist_path}")
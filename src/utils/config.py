@@ -13,8 +13,102 @@ class Config:
     DRAFT_MODEL = "llama-3.1-8b-instant"
     REVIEW_MODEL = "llama-3.1-8b-instant"
     
+    # LLM client pool settings (per pooled client)
+    LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+    LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "10"))
+    LLM_KEEPALIVE_EXPIRY = 60.0
+    
+    # Data files
+    DASHBOARD_DATA_FILE = "dashboard_data.json"  # legacy store, imported into the DB once
+    DASHBOARD_DB_PATH = os.getenv("DASHBOARD_DB_PATH", "dashboard.db")
+    ESCALATION_LOG_FILE = "escalation_log.csv"
+    ESCALATION_LOG_FILES = ["escalation_log.csv", "escalation_sample.csv"]
+    
+    # Background escalation log writer
+    ESCALATION_FLUSH_BATCH_SIZE = 50
+    ESCALATION_FLUSH_INTERVAL = 1.0  # seconds
+    ESCALATION_MAX_BYTES = 10 * 1024 * 1024
+    ESCALATION_ROTATE_DAILY = True
     
     # RAG settings
     CHROMA_PERSIST_DIR = "./chroma_db"
+    CHROMA_COLLECTION = "support_knowledge_base"
+    EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+    
+    # Retrieval result cache, invalidated whenever ingestion bumps the
+    # knowledge base generation counter stored next to the collection
+    RETRIEVAL_CACHE_ENABLED = os.getenv("RETRIEVAL_CACHE_ENABLED", "true").lower() == "true"
+    RETRIEVAL_CACHE_MAX_ENTRIES = 5000
+    RETRIEVAL_CACHE_TTL_SECONDS = 3600
+    KB_GENERATION_FILE = "kb_generation"
+    KB_GENERATION_CHECK_SECONDS = 1.0
+    
+    # Dense retrieval backend: "chroma", or "numpy" for the memory-mapped
+    # vector index exported next to the collection at ingestion
+    RETRIEVAL_BACKEND = os.getenv("RETRIEVAL_BACKEND", "chroma")
+    VECTOR_INDEX_DIR = "vector_index"
+    VECTOR_INDEX_QUANTIZE = os.getenv("VECTOR_INDEX_QUANTIZE", "false").lower() == "true"
+    
+    # Hybrid retrieval: BM25 keyword search next to the vector search,
+    # merged with reciprocal-rank fusion
+    HYBRID_RETRIEVAL = os.getenv("HYBRID_RETRIEVAL", "false").lower() == "true"
+    HYBRID_CANDIDATES = 20  # per retriever, before fusion
+    RRF_K = 60
+    BM25_INDEX_FILE = "bm25_index.json"
+    
+    # Run an unfiltered vector search in parallel with classification and
+    # filter its candidates by category afterwards
+    PARALLEL_RETRIEVAL = os.getenv("PARALLEL_RETRIEVAL", "false").lower() == "true"
+    PREFETCH_CANDIDATES = 20
+    
+    # Knowledge base ingestion
+    INGEST_BATCH_SIZE = 256
+    INGEST_CHUNK_WORDS = 200
+    INGEST_CHUNK_OVERLAP = 30
+    INGEST_MANIFEST_FILE = "ingest_manifest.json"
+    
+    # Micro-batching of concurrent query embeddings
+    EMBEDDING_BATCHING_ENABLED = os.getenv("EMBEDDING_BATCHING_ENABLED", "true").lower() == "true"
+    EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+    EMBEDDING_BATCH_WAIT_MS = float(os.getenv("EMBEDDING_BATCH_WAIT_MS", "5"))
+    
+    # Local fast-path classifier; below the threshold the LLM decides
+    LOCAL_CLASSIFIER_ENABLED = os.getenv("LOCAL_CLASSIFIER_ENABLED", "true").lower() == "true"
+    LOCAL_CLASSIFIER_THRESHOLD = float(os.getenv("LOCAL_CLASSIFIER_THRESHOLD", "0.6"))
+    LOCAL_CLASSIFIER_TEMPERATURE = 0.05
+    
+    # Exact-match classification cache (set CLASSIFICATION_CACHE_PATH to persist it)
+    CLASSIFICATION_CACHE_MAX_ENTRIES = 10000
+    CLASSIFICATION_CACHE_TTL_SECONDS = 24 * 3600
+    CLASSIFICATION_CACHE_PATH = os.getenv("CLASSIFICATION_CACHE_PATH", "")
+    
+    # Semantic response cache for near-duplicate tickets
+    RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+    RESPONSE_CACHE_THRESHOLD = float(os.getenv("RESPONSE_CACHE_THRESHOLD", "0.92"))
+    RESPONSE_CACHE_MAX_ENTRIES = 1000
+    RESPONSE_CACHE_TTL_SECONDS = 7 * 24 * 3600
+    RESPONSE_CACHE_PATH = "./cache/response_cache.json"
+    RESPONSE_CACHE_PERSIST_INTERVAL = 5
+    
+    # Retries revise the rejected draft with the review feedback instead of
+    # redrafting from the full context, and stop once feedback repeats
+    REVISION_MODE = os.getenv("REVISION_MODE", "true").lower() == "true"
+    REPEATED_FEEDBACK_SIMILARITY = 0.85
+    REVISION_CONTEXT_ITEMS = 3  # top retrieved snippets included in the revision prompt
+    
+    # Draft context is deduplicated (word-shingle Jaccard) and trimmed to a
+    # token budget, counted with tiktoken when available
+    CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1500"))
+    CONTEXT_DEDUP_SIMILARITY = 0.7
+    CONTEXT_SHINGLE_SIZE = 2
+    CONTEXT_TOKEN_ENCODING = "cl100k_base"
+    
+    # Stream draft tokens from the LLM (surfaced by /api/process-ticket/stream)
+    DRAFT_STREAMING = os.getenv("DRAFT_STREAMING", "true").lower() == "true"
+    
+    # Local policy pre-screen before the review LLM. Violations are always
+    # rejected locally; with fast-track on, clean drafts skip the LLM review too.
+    REVIEW_PRESCREEN_ENABLED = os.getenv("REVIEW_PRESCREEN_ENABLED", "true").lower() == "true"
+    REVIEW_FAST_TRACK = os.getenv("REVIEW_FAST_TRACK", "false").lower() == "true"
     
 config = Config()
\ No newline at end of file
@@ -0,0 +1,132 @@
+"""
+Context assembly for the draft prompt: deduplicate, rank, trim to budget.
+
+Snippets arrive in relevance order (retrieval returns them best first, and
+retries put the feedback guidance ahead of the retrieved context). Near
+duplicates are dropped by Jaccard similarity of word shingles, keeping the
+higher-ranked copy, and snippets are then taken in order while they fit in
+the token budget. Tokens are counted with tiktoken when it is installed and
+its encoding has been loaded, otherwise estimated as len(text) / 4.
+
+Loading an encoding can download it, so it never happens on the request
+path: load_encoding() runs at warm-up, and if a ticket arrives first the
+load starts in the background while that ticket uses the estimate.
+"""
+
+from src.utils.config import config
+from src.utils.metrics import metrics
+import logging
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+_background_load_started = False
+
+def load_encoding():
+    """Load the tiktoken encoding (blocking, may download); safe to call repeatedly"""
+    global _encoding, _encoding_loaded
+    
+    with _encoding_lock:
+        if not _encoding_loaded:
+            try:
+                import tiktoken
+                _encoding = tiktoken.get_encoding(config.CONTEXT_TOKEN_ENCODING)
+                logger.info(f"Loaded tiktoken encoding {config.CONTEXT_TOKEN_ENCODING}")
+            except Exception as e:
+                logger.warning(f"tiktoken unavailable, estimating tokens as characters / 4: {e}")
+                _encoding = None
+            _encoding_loaded = True
+    
+    return _encoding
+
+def _get_encoding():
+    """The tiktoken encoding if already loaded, else None without blocking"""
+    global _background_load_started
+    
+    if not _encoding_loaded and not _background_load_started:
+        _background_load_started = True
+        threading.Thread(target=load_encoding, name="tiktoken-load", daemon=True).start()
+    
+    return _encoding
+
+def count_tokens(text: str) -> int:
+    encoding = _get_encoding()
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    encoding = _get_encoding()
+    if encoding is None:
+        return text[:max_tokens * 4]
+    return encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens])
+
+def shingles(text: str, size: int) -> frozenset:
+    """Word n-grams of the lowercased text; short texts are one shingle"""
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) <= size:
+        return frozenset([tuple(words)])
+    return frozenset(tuple(words[i:i + size]) for i in range(len(words) - size + 1))
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def dedupe_snippets(snippets: list[str], threshold: float = None, shingle_size: int = None) -> list[str]:
+    """Drop snippets too similar to an earlier (higher-ranked) one"""
+    threshold = config.CONTEXT_DEDUP_SIMILARITY if threshold is None else threshold
+    shingle_size = shingle_size or config.CONTEXT_SHINGLE_SIZE
+    
+    kept, kept_shingles = [], []
+    for snippet in snippets:
+        snippet_shingles = shingles(snippet, shingle_size)
+        if any(jaccard(snippet_shingles, other) >= threshold for other in kept_shingles):
+            continue
+        kept.append(snippet)
+        kept_shingles.append(snippet_shingles)
+    
+    return kept
+
+def assemble_context(snippets: list[str], token_budget: int = None) -> tuple[list[str], dict]:
+    """Deduplicate snippets, in relevance order, and keep those that fit the budget.
+    
+    Returns (snippets, stats) with token counts before and after. If even
+    the top snippet is over budget it is truncated rather than dropped, so
+    the draft always gets some context.
+    """
+    token_budget = token_budget or config.CONTEXT_TOKEN_BUDGET
+    snippets = [snippet for snippet in snippets or [] if snippet and snippet.strip()]
+    counts = {snippet: count_tokens(snippet) for snippet in snippets}
+    tokens_before = sum(counts[snippet] for snippet in snippets)
+    
+    unique = dedupe_snippets(snippets)
+    
+    selected, used = [], 0
+    for snippet in unique:
+        if used + counts[snippet] <= token_budget:
+            selected.append(snippet)
+            used += counts[snippet]
+    
+    if unique and not selected:
+        selected = [truncate_to_tokens(unique[0], token_budget)]
+        used = count_tokens(selected[0])
+    
+    stats = {
+        "snippets_before": len(snippets),
+        "snippets_after": len(selected),
+        "duplicates": len(snippets) - len(unique),
+        "tokens_before": tokens_before,
+        "tokens_after": used,
+        "tokens_saved": tokens_before - used
+    }
+    
+    metrics.inc("context_tokens_saved_total", stats["tokens_saved"])
+    metrics.observe("context_tokens", used)
+    return selected, stats
@@ -0,0 +1,196 @@
+"""
+Background writer for the escalation CSV log.
+
+Escalations are queued by the workflow and written by a single thread in
+batches (on size or time thresholds), so bursts never add disk latency to
+ticket processing and rows from concurrent workers can't interleave. The
+log rotates by size and by day, and pending rows are flushed on close()
+(registered with atexit). A batch that fails to write is kept and retried
+on the next flush rather than dropped.
+"""
+
+from src.utils.config import config
+import atexit
+import csv
+import datetime
+import logging
+import os
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+FIELDNAMES = [
+    "timestamp",
+    "ticket_subject",
+    "ticket_description",
+    "category",
+    "draft_response",
+    "review_feedback",
+    "retry_count",
+    "category_source"
+]
+
+_STOP = object()
+
+class EscalationLogWriter:
+    def __init__(self, path: str = None, batch_size: int = None, flush_interval: float = None,
+                 max_bytes: int = None, rotate_daily: bool = None):
+        self.path = path or config.ESCALATION_LOG_FILE
+        self.batch_size = batch_size or config.ESCALATION_FLUSH_BATCH_SIZE
+        self.flush_interval = flush_interval if flush_interval is not None else config.ESCALATION_FLUSH_INTERVAL
+        self.max_bytes = max_bytes or config.ESCALATION_MAX_BYTES
+        self.rotate_daily = config.ESCALATION_ROTATE_DAILY if rotate_daily is None else rotate_daily
+        
+        self._queue = queue.Queue()
+        self._closed = False
+        # Orders submit() against close(): a record accepted before close
+        # is always queued ahead of the stop marker
+        self._close_lock = threading.Lock()
+        self._header_checked = False
+        self._unwritten = 0  # rows kept after a failed write, awaiting retry
+        self._thread = threading.Thread(target=self._run, name="escalation-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+        
+        self.written = 0
+        self.batches = 0
+        self.rotations = 0
+    
+    def submit(self, record: dict):
+        """Queue an escalation record; returns immediately"""
+        with self._close_lock:
+            if self._closed:
+                raise RuntimeError("Escalation log writer is closed")
+            self._queue.put(record)
+    
+    def flush(self, timeout: float = None):
+        """Block until everything submitted so far has been written (or
+        retried, if a write fails)"""
+        done = threading.Event()
+        with self._close_lock:
+            closed = self._closed
+            if not closed:
+                self._queue.put(done)
+        
+        if closed:
+            # The writer thread drains the queue and exits; nothing would
+            # answer the event, so wait for the thread itself instead
+            self._thread.join(timeout)
+        else:
+            done.wait(timeout)
+    
+    def close(self):
+        """Write pending records and stop the writer thread"""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join()
+    
+    def _run(self):
+        batch = []
+        deadline = None
+        
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            
+            if isinstance(item, dict):
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+            
+            # Flush on size, on the time threshold, or when asked to flush/stop
+            if batch and (item is None or not isinstance(item, dict) or len(batch) >= self.batch_size):
+                if self._write_batch(batch):
+                    batch = []
+                    deadline = None
+                else:
+                    # Keep the rows and retry on the next flush
+                    deadline = time.monotonic() + self.flush_interval
+                self._unwritten = len(batch)
+            
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is _STOP:
+                if batch:
+                    logger.error(f"Escalation log writer stopped with {len(batch)} unwritten records")
+                return
+    
+    def _write_batch(self, batch: list[dict]) -> bool:
+        """Append a batch to the log; returns False if the write failed"""
+        try:
+            self._rotate_if_needed()
+            write_header = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            
+            with open(self.path, 'a', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=FIELDNAMES, extrasaction='ignore')
+                if write_header:
+                    writer.writeheader()
+                writer.writerows(batch)
+                f.flush()
+                os.fsync(f.fileno())
+            
+            self.written += len(batch)
+            self.batches += 1
+            logger.info(f"Escalation log: wrote {len(batch)} records to {self.path}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to write {len(batch)} escalation records, will retry: {e}")
+            return False
+    
+    def _rotate_if_needed(self):
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return
+        
+        file_date = datetime.date.fromtimestamp(os.path.getmtime(self.path))
+        too_big = os.path.getsize(self.path) >= self.max_bytes
+        new_day = self.rotate_daily and file_date != datetime.date.today()
+        if not (too_big or new_day or self._header_outdated()):
+            return
+        
+        stem, ext = os.path.splitext(self.path)
+        index = 1
+        while os.path.exists(f"{stem}.{file_date.isoformat()}.{index}{ext}"):
+            index += 1
+        rotated = f"{stem}.{file_date.isoformat()}.{index}{ext}"
+        os.replace(self.path, rotated)
+        self.rotations += 1
+        logger.info(f"Rotated escalation log to {rotated}")
+    
+    def _header_outdated(self) -> bool:
+        """Whether the live log was started with an older column set"""
+        if self._header_checked:
+            return False
+        with open(self.path, 'r', newline='', encoding='utf-8') as f:
+            header = next(csv.reader(f), [])
+        self._header_checked = header == FIELDNAMES
+        return not self._header_checked
+    
+    def stats(self) -> dict:
+        return {
+            "written": self.written,
+            "batches": self.batches,
+            "rotations": self.rotations,
+            "pending": self._queue.qsize() + self._unwritten
+        }
+
+_escalation_writer = None
+_writer_lock = threading.Lock()
+
+def get_escalation_writer() -> EscalationLogWriter:
+    """Get the process-wide escalation log writer, starting it on first use"""
+    global _escalation_writer
+    
+    if _escalation_writer is None:
+        with _writer_lock:
+            if _escalation_writer is None:
+                _escalation_writer = EscalationLogWriter()
+    
+    return _escalation_writer
@@ -1,23 +1,247 @@
 from langchain_groq import ChatGroq
 from src.utils.config import config
+from src.utils.metrics import metrics
+import asyncio
+import httpx
 import logging
+import threading
+import time
+import weakref
 
 logger = logging.getLogger(__name__)
 
-def get_llm(model_name: str, temperature: float = 0.1):
-    """Get a configured Groq LLM instance"""
+# Process-wide pool of LLM clients keyed by (model_name, temperature).
+# Each pooled client owns a bounded keep-alive HTTP connection pool, so
+# repeated node calls reuse warm TLS connections instead of reconnecting.
+_llm_pool = {}
+_pool_lock = threading.Lock()
+_pool_stats = {"hits": 0, "misses": 0}
+
+# Async connections are bound to the event loop that opened them, so async
+# calls use a per-loop copy of each client: event loop -> {key: LLM}.
+# aclose_loop_llms() closes a loop's clients before the loop ends.
+_loop_llms = weakref.WeakKeyDictionary()
+
+# Optional replacement for ChatGroq construction, e.g. a local stand-in for benchmarks
+_llm_factory = None
+
+def _http_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=config.LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=config.LLM_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=config.LLM_KEEPALIVE_EXPIRY
+    )
+
+def _create_llm(model_name: str, temperature: float, http_async_client: httpx.AsyncClient = None):
+    """Create a new Groq LLM instance with its own bounded HTTP pool.
+    
+    Pooled instances get only the sync client; per-loop instances for
+    async calls are given an AsyncClient opened on that loop.
+    """
+    if _llm_factory is not None:
+        return _llm_factory(model_name, temperature)
+    
     try:
         return ChatGroq(
             model_name=model_name,
             temperature=temperature,
             groq_api_key=config.GROQ_API_KEY,
             max_retries=3,
-            timeout=30
+            timeout=30,
+            http_client=httpx.Client(limits=_http_limits(), timeout=30),
+            http_async_client=http_async_client
         )
     except Exception as e:
         logger.error(f"Failed to create LLM instance: {e}")
         raise
 
+def get_llm(model_name: str, temperature: float = 0.1):
+    """Get a pooled Groq LLM instance, shared across threads"""
+    key = (model_name, float(temperature))
+
+    with _pool_lock:
+        llm = _llm_pool.get(key)
+        if llm is not None:
+            _pool_stats["hits"] += 1
+            return llm
+
+        _pool_stats["misses"] += 1
+        llm = _create_llm(model_name, temperature)
+        _llm_pool[key] = llm
+
+    logger.info(f"Created pooled LLM client for {model_name} (temperature={temperature})")
+    return llm
+
+def _loop_llm(llm):
+    """The running event loop's copy of a pooled LLM, for async calls"""
+    if _llm_factory is not None or not isinstance(llm, ChatGroq):
+        return llm
+    
+    loop = asyncio.get_running_loop()
+    key = (llm.model_name, float(llm.temperature))
+    
+    with _pool_lock:
+        llms = _loop_llms.setdefault(loop, {})
+        loop_llm = llms.get(key)
+        if loop_llm is None:
+            loop_llm = _create_llm(*key, http_async_client=httpx.AsyncClient(limits=_http_limits(), timeout=30))
+            llms[key] = loop_llm
+    
+    return loop_llm
+
+async def aclose_loop_llms():
+    """Close the running event loop's async LLM clients; call before the loop ends"""
+    with _pool_lock:
+        llms = _loop_llms.pop(asyncio.get_running_loop(), {})
+    
+    for llm in llms.values():
+        try:
+            llm.http_client.close()
+            await llm.http_async_client.aclose()
+        except Exception as e:
+            logger.warning(f"Failed to close LLM async HTTP client: {e}")
+
+def get_llm_pool_stats() -> dict:
+    """Get LLM client pool hit/miss counters"""
+    with _pool_lock:
+        hits = _pool_stats["hits"]
+        misses = _pool_stats["misses"]
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "clients": len(_llm_pool),
+            "hit_rate": round(hits / total * 100, 2) if total > 0 else 0
+        }
+
+def reset_llm_pool():
+    """Close pooled HTTP clients and clear the pool"""
+    with _pool_lock:
+        clients = list(_llm_pool.values())
+        _llm_pool.clear()
+        loop_clients = [(loop, llm) for loop, llms in _loop_llms.items() for llm in llms.values()]
+        _loop_llms.clear()
+        _pool_stats["hits"] = 0
+        _pool_stats["misses"] = 0
+
+    for llm in clients + [llm for _, llm in loop_clients]:
+        try:
+            if getattr(llm, "http_client", None) is not None:
+                llm.http_client.close()
+        except Exception as e:
+            logger.warning(f"Failed to close LLM HTTP client: {e}")
+    
+    for loop, llm in loop_clients:
+        _close_async_client(loop, llm.http_async_client)
+
+def _close_async_client(loop, client):
+    """aclose() an httpx.AsyncClient on the loop that opened it.
+    
+    Clients of a closed loop have nothing left to close.
+    """
+    if loop.is_closed():
+        return
+    
+    try:
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        
+        if loop is running:
+            loop.create_task(client.aclose())
+        elif loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        else:
+            loop.run_until_complete(client.aclose())
+    except Exception as e:
+        logger.warning(f"Failed to close LLM async HTTP client: {e}")
+
+def set_llm_factory(factory):
+    """Build pooled LLMs with factory(model_name, temperature) instead of ChatGroq.
+    
+    Pass None to restore ChatGroq. The pool is reset either way.
+    """
+    global _llm_factory
+    
+    reset_llm_pool()
+    _llm_factory = factory
+
+def token_usage(response) -> dict:
+    """Prompt/completion token counts from an LLM response's metadata"""
+    usage = getattr(response, "usage_metadata", None)
+    if usage:
+        return {"prompt_tokens": usage.get("input_tokens", 0), "completion_tokens": usage.get("output_tokens", 0)}
+    
+    raw_usage = (getattr(response, "response_metadata", None) or {}).get("token_usage") or {}
+    return {
+        "prompt_tokens": raw_usage.get("prompt_tokens", 0),
+        "completion_tokens": raw_usage.get("completion_tokens", 0)
+    }
+
+def attempt_usage(response, node: str, attempt: int) -> dict:
+    """Token usage of one LLM call, tagged with its node and retry attempt"""
+    return {"node": node, "attempt": attempt, **token_usage(response)}
+
+def total_tokens(usage: list[dict]) -> int:
+    """Prompt plus completion tokens over a list of attempt_usage records"""
+    return sum(u["prompt_tokens"] + u["completion_tokens"] for u in usage or [])
+
+def record_llm_call(response, node: str, model: str, elapsed: float):
+    """Record latency and token counts for one LLM call"""
+    usage = token_usage(response)
+    metrics.observe("llm_request_duration_seconds", elapsed, node=node, model=model)
+    metrics.inc("llm_tokens_total", usage["prompt_tokens"], node=node, type="prompt")
+    metrics.inc("llm_tokens_total", usage["completion_tokens"], node=node, type="completion")
+
+def invoke_llm(llm, messages, node: str):
+    """llm.invoke with latency and token instrumentation"""
+    start = time.perf_counter()
+    response = llm.invoke(messages)
+    record_llm_call(response, node, getattr(llm, "model_name", "unknown"), time.perf_counter() - start)
+    return response
+
+async def ainvoke_llm(llm, messages, node: str):
+    """llm.ainvoke with latency and token instrumentation"""
+    llm = _loop_llm(llm)
+    start = time.perf_counter()
+    response = await llm.ainvoke(messages)
+    record_llm_call(response, node, getattr(llm, "model_name", "unknown"), time.perf_counter() - start)
+    return response
+
+def stream_llm(llm, messages, node: str):
+    """llm.stream, accumulated into one message, with time-to-first-token.
+    
+    Under LangGraph's "messages" stream mode each chunk is also forwarded
+    to the graph's stream consumer as it arrives.
+    """
+    start = time.perf_counter()
+    response = None
+    for chunk in llm.stream(messages):
+        if response is None:
+            metrics.observe("llm_time_to_first_token_seconds", time.perf_counter() - start, node=node)
+            response = chunk
+        else:
+            response = response + chunk
+    
+    record_llm_call(response, node, getattr(llm, "model_name", "unknown"), time.perf_counter() - start)
+    return response
+
+async def astream_llm(llm, messages, node: str):
+    """Async variant of stream_llm"""
+    llm = _loop_llm(llm)
+    start = time.perf_counter()
+    response = None
+    async for chunk in llm.astream(messages):
+        if response is None:
+            metrics.observe("llm_time_to_first_token_seconds", time.perf_counter() - start, node=node)
+            response = chunk
+        else:
+            response = response + chunk
+    
+    record_llm_call(response, node, getattr(llm, "model_name", "unknown"), time.perf_counter() - start)
+    return response
+
 def get_classification_llm():
     return get_llm(config.CLASSIFICATION_MODEL, temperature=0.1)
 
@@ -35,11 +259,11 @@ def test_available_models():
         "llama-3.1-70b-versatile",
         "mixtral-8x7b-32768"  # This might fail but let's test
     ]
-    
+
     for model in test_models:
         try:
             llm = get_llm(model, temperature=0.1)
             response = llm.invoke("Say hello in one word")
             print(f"✅ {model}: Working - {response.content}")
         except Exception as e:
-            print(f"❌ {model}: Failed - {str(e)[:100]}...")
\ No newline at end of file
+            print(f"❌ {model}: Failed - {str(e)[:100]}...")
@@ -0,0 +1,162 @@
+"""
+In-process metrics for the ticket pipeline.
+
+Counters and histograms are keyed by name plus labels, rendered in the
+Prometheus text format for /metrics, and summarized as p50/p95 for
+/api/stats. Histograms keep cumulative buckets for Prometheus and a
+bounded window of recent samples for percentiles.
+"""
+
+from collections import deque
+from contextlib import contextmanager
+from src.utils.timing import percentile
+import functools
+import inspect
+import threading
+import time
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(label_key: tuple, extra: dict = None) -> str:
+    pairs = list(label_key) + sorted((extra or {}).items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in pairs) + "}"
+
+class Histogram:
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS, window: int = 2048):
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.recent = deque(maxlen=window)
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        self.recent.append(value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.bucket_counts[i] += 1
+                break
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Observe the wall time of the block in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def counter_value(self, name: str, **labels) -> float:
+        with self._lock:
+            return self._counters.get((name, _label_key(labels)), 0)
+
+    def percentiles(self, name: str, by: str) -> dict:
+        """p50/p95 of a histogram over recent samples, grouped by one label"""
+        grouped = {}
+        with self._lock:
+            for (metric, label_key), histogram in self._histograms.items():
+                if metric != name:
+                    continue
+                group = dict(label_key).get(by, "")
+                entry = grouped.setdefault(group, {"count": 0, "samples": []})
+                entry["count"] += histogram.count
+                entry["samples"].extend(histogram.recent)
+
+        return {
+            group: {
+                "count": entry["count"],
+                "p50": round(percentile(entry["samples"], 50), 4),
+                "p95": round(percentile(entry["samples"], 95), 4)
+            }
+            for group, entry in sorted(grouped.items())
+        }
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            counter_names = sorted({name for name, _ in self._counters})
+            for name in counter_names:
+                lines.append(f"# TYPE {name} counter")
+                for (metric, label_key), value in sorted(self._counters.items()):
+                    if metric == name:
+                        lines.append(f"{name}{_format_labels(label_key)} {value}")
+
+            histogram_names = sorted({name for name, _ in self._histograms})
+            for name in histogram_names:
+                lines.append(f"# TYPE {name} histogram")
+                for (metric, label_key), histogram in sorted(self._histograms.items(), key=lambda item: item[0]):
+                    if metric != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.bucket_counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_format_labels(label_key, {'le': str(bound)})} {cumulative}")
+                    lines.append(f"{name}_bucket{_format_labels(label_key, {'le': '+Inf'})} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(label_key)} {histogram.sum}")
+                    lines.append(f"{name}_count{_format_labels(label_key)} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+# Process-wide registry
+metrics = MetricsRegistry()
+
+def instrument_node(name: str, node):
+    """Wrap a workflow node to record its wall time and retry iteration"""
+
+    def record(state, start: float):
+        attempt = state.get("retry_count", 0) if isinstance(state, dict) else 0
+        metrics.observe("node_duration_seconds", time.perf_counter() - start, node=name)
+        metrics.inc("node_calls_total", node=name, attempt=attempt)
+
+    if inspect.iscoroutinefunction(node):
+        @functools.wraps(node)
+        async def async_wrapper(state):
+            start = time.perf_counter()
+            try:
+                return await node(state)
+            finally:
+                record(state, start)
+        return async_wrapper
+
+    @functools.wraps(node)
+    def wrapper(state):
+        start = time.perf_counter()
+        try:
+            return node(state)
+        finally:
+            record(state, start)
+    return wrapper
@@ -0,0 +1,82 @@
+"""
+Lexical support-policy rules, checked locally before the review LLM.
+
+Every rule is a named group in one compiled alternation, so a draft is
+scanned once no matter how many rules there are, and each match reports
+which rule fired via the group name.
+"""
+
+from src.utils.redaction import Redactor
+import re
+
+# Security implementation terms that must not reach customers, with the
+# general wording filter_security_details substitutes for each
+SECURITY_REDACTIONS = {
+    "AES-256 encryption": "industry-standard encryption",
+    "encryption keys": "security protocols",
+    "database schema": "system architecture",
+    "API endpoints": "system interfaces",
+    "SSL/TLS": "secure connections",
+    "RSA encryption": "asymmetric encryption",
+    "SHA-256": "cryptographic hashing"
+}
+
+# Built once; case-insensitive, whole-word matching
+security_redactor = Redactor(SECURITY_REDACTIONS)
+
+# rule name -> (pattern, feedback shown to the drafter)
+POLICY_RULES = {
+    "refund_promise": (
+        r"\b(?:I|we)(?:'ll| will| shall| am going to| are going to)\s+(?:issue\s+(?:you\s+)?(?:a\s+)?(?:full\s+)?)?refund"
+        r"|\byou will (?:receive|get) (?:a |your )?(?:full |partial )?(?:refund|money back|credit)",
+        "Do not promise or guarantee refunds; explain that refund eligibility is reviewed case by case per policy."
+    ),
+    "guarantee": (
+        r"\b(?:I|we) (?:can )?(?:guarantee|promise)\b|\bguaranteed to\b",
+        "Do not guarantee outcomes or make promises the team cannot keep; avoid overpromising per policy."
+    ),
+    "dollar_amount": (
+        r"[$€£]\s?\d[\d,]*(?:\.\d+)?|\b\d[\d,]*(?:\.\d+)?\s?(?:dollars|USD|EUR|GBP)\b",
+        "Do not state specific amounts of money; this is a financial commitment that violates policy."
+    ),
+    # Only percentages tied to money or outcomes; "100% committed" or
+    # "99.9% uptime" are left to the LLM reviewer
+    "percentage": (
+        r"\b\d+(?:\.\d+)?\s?(?:%|percent\b)\s+(?:\w+\s+){0,3}?(?:discount|off|refund|credit|back|cashback|rebate)\b"
+        r"|\b(?:discount|refund|credit|cashback|rebate)s?\s+(?:of\s+)?(?:up\s+to\s+)?\d+(?:\.\d+)?\s?(?:%|percent\b)",
+        "Do not quote specific percentages; this is a financial or outcome commitment that violates policy."
+    ),
+    "timeline_promise": (
+        r"\bwill be (?:resolved|fixed|refunded|processed|credited) (?:within|in) (?:the next )?\d+\s*(?:minutes?|hours?|days?|business days?)\b",
+        "Do not promise specific resolution timelines; avoid overpromising per policy."
+    ),
+    "security_detail": (
+        "|".join(re.escape(term) for term in SECURITY_REDACTIONS)
+        + r"|\bAES(?:-\d+)?\b|\bRSA\b|\bSHA-?\d+\b|\bMD5\b|\bbcrypt\b|\bTLS\s?1\.\d\b",
+        "Do not provide specific security implementation details (encryption types, algorithms, configurations); keep security language general."
+    ),
+}
+
+_COMBINED_PATTERN = re.compile(
+    "|".join(f"(?P<{name}>{pattern})" for name, (pattern, _) in POLICY_RULES.items()),
+    re.IGNORECASE
+)
+
+def scan_policy_violations(text: str) -> list[dict]:
+    """Find every policy rule match in a single pass over the text"""
+    return [
+        {"rule": match.lastgroup, "match": match.group(), "span": match.span()}
+        for match in _COMBINED_PATTERN.finditer(text or "")
+    ]
+
+def format_policy_feedback(violations: list[dict]) -> str:
+    """Structured review feedback: one line per violated rule with its offending phrases"""
+    by_rule = {}
+    for violation in violations:
+        by_rule.setdefault(violation["rule"], []).append(violation["match"])
+    
+    lines = ["Automatic policy pre-screen found violations:"]
+    for rule, matches in by_rule.items():
+        phrases = ", ".join(f'"{m}"' for m in dict.fromkeys(matches))
+        lines.append(f"- {rule}: {phrases}. {POLICY_RULES[rule][1]}")
+    return "\n".join(lines)
@@ -116,6 +116,37 @@ Do not include any other text.
 Begin your STRICT review:
 """)
 
+# Revision prompt - edits the rejected draft instead of drafting from scratch
+REVISION_PROMPT = ChatPromptTemplate.from_template("""
+You are a customer support agent revising your draft response, which a policy reviewer rejected.
+
+**Ticket Subject:** {subject}
+
+**Ticket Description:**
+{description}
+
+**Relevant Knowledge Base Information:**
+{context}
+
+**Previous Draft:**
+{draft_response}
+
+**Reviewer Feedback:**
+{review_feedback}
+
+**Guidance:**
+{guidance}
+
+**Instructions:**
+- Fix every issue raised in the feedback
+- Keep everything the feedback did not criticize
+- If the feedback says the draft misses the customer's question, answer it from the ticket and the knowledge base information
+- Do not make promises you can't keep (like specific refund amounts)
+- Do not provide sensitive security information
+
+Return only the revised response:
+""")
+
 
 # Helper functions
 def get_classification_prompt():
@@ -125,4 +156,7 @@ def get_draft_prompt():
     return DRAFT_PROMPT
 
 def get_review_prompt():
-    return REVIEW_PROMPT
\ No newline at end of file
+    return REVIEW_PROMPT
+
+def get_revision_prompt():
+    return REVISION_PROMPT
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""
+Single-pass multi-term redaction.
+
+The term table is folded into a character trie once and the trie is emitted
+as one regex with shared prefixes factored out (e.g. "RSA(?: encryption)?"),
+so rewriting a text is one left-to-right scan regardless of how many terms
+there are. At each position the longest matching term wins, independent of
+the order of the table.
+"""
+
+import re
+
+def _trie_to_pattern(node: dict) -> str:
+    """Regex for all terms under a trie node; the "" key marks the end of a term"""
+    terminal = "" in node
+    branches = [re.escape(char) + _trie_to_pattern(child) for char, child in sorted(node.items()) if char != ""]
+    
+    if not branches:
+        return ""
+    
+    if len(branches) == 1:
+        body = branches[0]
+        grouped = body if len(body) == 1 else f"(?:{body})"
+        return f"{grouped}?" if terminal else body
+    
+    alternation = f"(?:{'|'.join(branches)})"
+    return f"{alternation}?" if terminal else alternation
+
+class Redactor:
+    """Replace every occurrence of the table's terms in one pass.
+    
+    With word_boundary, a term only matches when not embedded in a longer
+    word ("RSA" does not match inside "UNIVERSAL"). redact() returns the
+    rewritten text plus the spans that were replaced, in original offsets.
+    """
+    
+    def __init__(self, replacements: dict, case_sensitive: bool = False, word_boundary: bool = True):
+        self.case_sensitive = case_sensitive
+        self.word_boundary = word_boundary
+        self.replacements = {self._fold(term): value for term, value in replacements.items() if term}
+        self.pattern = self._compile()
+    
+    def _fold(self, term: str) -> str:
+        return term if self.case_sensitive else term.lower()
+    
+    def _compile(self):
+        if not self.replacements:
+            return None
+        
+        trie = {}
+        for term in self.replacements:
+            node = trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[""] = {}
+        
+        pattern = _trie_to_pattern(trie)
+        if self.word_boundary:
+            pattern = rf"(?<!\w)(?:{pattern})(?!\w)"
+        return re.compile(pattern, 0 if self.case_sensitive else re.IGNORECASE)
+    
+    def redact(self, text: str) -> tuple[str, list[dict]]:
+        """Return (redacted_text, spans); each span has start, end, term and replacement"""
+        if not text or self.pattern is None:
+            return text, []
+        
+        spans = []
+        
+        def replace(match):
+            replacement = self.replacements.get(self._fold(match.group()), match.group())
+            spans.append({
+                "start": match.start(),
+                "end": match.end(),
+                "term": match.group(),
+                "replacement": replacement
+            })
+            return replacement
+        
+        return self.pattern.sub(replace, text), spans
+
+class StreamingRedactor:
+    """Apply a Redactor to text that arrives in chunks, e.g. LLM tokens.
+    
+    feed() holds text back until it is more than the longest term behind
+    the end of the buffer and at a whitespace boundary, so a term split
+    across chunks is always seen whole before anything is released, and
+    returns the redacted text that is safe to emit. flush() releases the
+    rest once the stream ends.
+    """
+    
+    def __init__(self, redactor: Redactor):
+        self.redactor = redactor
+        self.holdback = max((len(term) for term in redactor.replacements), default=0) + 1
+        self.buffer = ""
+    
+    def feed(self, chunk: str) -> str:
+        self.buffer += chunk or ""
+        if self.redactor.pattern is None:
+            text, self.buffer = self.buffer, ""
+            return text
+        
+        limit = len(self.buffer) - self.holdback
+        cut = max(self.buffer.rfind(" ", 0, limit), self.buffer.rfind("\n", 0, limit)) + 1 if limit > 0 else 0
+        if cut <= 0:
+            return ""
+        
+        # Terms may contain spaces; never cut through a match
+        for match in self.redactor.pattern.finditer(self.buffer):
+            if match.start() >= cut:
+                break
+            if match.end() > cut:
+                cut = match.start()
+                break
+        
+        released, self.buffer = self.buffer[:cut], self.buffer[cut:]
+        return self.redactor.redact(released)[0]
+    
+    def flush(self) -> str:
+        released, self.buffer = self.buffer, ""
+        return self.redactor.redact(released)[0]
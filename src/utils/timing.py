@@ -0,0 +1,29 @@
+import math
+
+def percentile(values: list[float], pct: float) -> float:
+    """Get the pct-th percentile (0-100) of values using linear interpolation"""
+    if not values:
+        return 0.0
+    
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    
+    if lower == upper:
+        return ordered[lower]
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+def summarize_latencies(latencies: list[float]) -> dict:
+    """Summarize latencies (seconds) into mean and p50/p95/p99"""
+    if not latencies:
+        return {"count": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    
+    return {
+        "count": len(latencies),
+        "mean": sum(latencies) / len(latencies),
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "max": max(latencies)
+    }
@@ -3,7 +3,8 @@
 Start the web dashboard
 """
 
-from src.dashboard.app import app
+from src.dashboard.app import app, warm_up
 
 if __name__ == '__main__':
+    warm_up()
     app.run(debug=True, host='0.0.0.0', port=5001)
\ No newline at end of file
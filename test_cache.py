@@ -0,0 +1,67 @@
+import os
+import tempfile
+import time
+from src.utils.cache import LRUCache
+
+def test_lru_cache():
+    """Test LRU eviction, TTL expiry and persistence of the shared cache"""
+    
+    print("\n--- LRU eviction ---")
+    cache = LRUCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now least recently used
+    cache.set("c", 3)
+    
+    if cache.get("b") is None and cache.get("a") == 1 and cache.get("c") == 3:
+        print(f"✅ Evicted least recently used entry: {cache.stats()}")
+    else:
+        print(f"❌ Unexpected cache contents: {cache.items()}")
+    
+    print("\n--- TTL expiry ---")
+    cache = LRUCache(max_size=10, ttl_seconds=0.05)
+    cache.set("a", 1)
+    time.sleep(0.1)
+    
+    if cache.get("a") is None:
+        print("✅ Expired entry was dropped")
+    else:
+        print("❌ Expired entry was returned")
+    
+    print("\n--- Persistence ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.json")
+        cache = LRUCache(max_size=10, persist_path=path)
+        cache.set("password reset", {"category": "Security"})
+        
+        reloaded = LRUCache(max_size=10, persist_path=path)
+        if reloaded.get("password reset") == {"category": "Security"}:
+            print("✅ Entries survived a restart")
+        else:
+            print("❌ Entries were not reloaded")
+
+def test_response_cache():
+    """Test that a near-duplicate ticket is served from the semantic cache"""
+    from src.data.response_cache import SemanticResponseCache
+    
+    print("\n--- Semantic response cache ---")
+    cache = SemanticResponseCache(threshold=0.85, persist_path="")
+    cache.store(
+        {"subject": "Password reset", "description": "I forgot my password and need to reset it"},
+        "Security",
+        "You can reset your password from the login page."
+    )
+    
+    hit = cache.lookup({"subject": "Reset password", "description": "I forgot my password, how do I reset it?"}, "Security")
+    other_category = cache.lookup({"subject": "Password reset", "description": "I forgot my password and need to reset it"}, "Billing")
+    
+    if hit and other_category is None:
+        print(f"✅ Near-duplicate served (similarity {hit['similarity']:.2f}); other categories isolated")
+    else:
+        print(f"❌ Unexpected lookup results: hit={hit is not None}, other_category={other_category is not None}")
+    print(f"Stats: {cache.stats()}")
+
+if __name__ == "__main__":
+    print("Testing Caches...")
+    test_lru_cache()
+    test_response_cache()
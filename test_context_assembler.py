@@ -0,0 +1,43 @@
+from src.utils.context_assembler import assemble_context, count_tokens, dedupe_snippets, load_encoding
+
+def test_deduplication():
+    """Test that near-identical snippets are dropped, keeping the higher-ranked copy"""
+
+    print("\n--- Deduplication ---")
+    snippets = [
+        "Refunds are processed within 5-7 business days for eligible requests.",
+        "Refunds are processed within 5-7 business days for all eligible requests.",
+        "You can update payment methods in your account settings under 'Billing'.",
+        "Refunds are processed within 5-7 business days for eligible requests."
+    ]
+
+    unique = dedupe_snippets(snippets)
+    if unique == [snippets[0], snippets[2]]:
+        print(f"✅ Kept {len(unique)} of {len(snippets)} snippets")
+    else:
+        print(f"❌ Unexpected snippets kept: {unique}")
+
+def test_token_budget():
+    """Test trimming to the token budget in relevance order"""
+
+    print("\n--- Token budget ---")
+    snippets = [f"Snippet {i}: " + "billing details and account information " * 10 for i in range(6)]
+    budget = count_tokens(snippets[0]) * 3
+
+    context, stats = assemble_context(snippets, token_budget=budget)
+    if context == snippets[:3] and stats["tokens_after"] <= budget and stats["tokens_saved"] > 0:
+        print(f"✅ {stats['tokens_before']} -> {stats['tokens_after']} tokens ({stats['tokens_saved']} saved)")
+    else:
+        print(f"❌ Unexpected result: {len(context)} snippets, {stats}")
+
+    context, stats = assemble_context(snippets[:1], token_budget=10)
+    if len(context) == 1 and stats["tokens_after"] <= 10:
+        print(f"✅ Oversized top snippet truncated to {stats['tokens_after']} tokens")
+    else:
+        print(f"❌ Unexpected result for oversized snippet: {context}, {stats}")
+
+if __name__ == "__main__":
+    print("Testing Context Assembler...")
+    load_encoding()
+    test_deduplication()
+    test_token_budget()
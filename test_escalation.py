@@ -0,0 +1,58 @@
+import csv
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.escalation_writer import EscalationLogWriter
+
+def make_record(i: int) -> dict:
+    return {
+        "timestamp": f"2025-08-26T19:{i % 60:02d}:00",
+        "ticket_subject": f"Refund demand #{i}",
+        "ticket_description": "I want a full refund of $299.99 now, or I'm filing a lawsuit!",
+        "category": "Billing",
+        "draft_response": "Subject: Re: Refund demand",
+        "review_feedback": "The draft response contains policy violations",
+        "retry_count": 2
+    }
+
+def read_rows(path: str) -> list[dict]:
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+def test_escalation_writer():
+    """Test batching, concurrent submission, rotation and flush-on-close"""
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        print("\n--- Escalation burst from concurrent workers ---")
+        path = os.path.join(tmp, "escalation_log.csv")
+        writer = EscalationLogWriter(path=path, batch_size=25, flush_interval=0.2)
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda i: writer.submit(make_record(i)), range(100)))
+        writer.close()
+        
+        rows = read_rows(path)
+        if len(rows) == 100 and all(row["retry_count"] == "2" for row in rows):
+            print(f"✅ All 100 rows written intact in {writer.stats()['batches']} batches")
+        else:
+            print(f"❌ Expected 100 intact rows, found {len(rows)}")
+        
+        print("\n--- Size-based rotation ---")
+        path = os.path.join(tmp, "rotating_log.csv")
+        writer = EscalationLogWriter(path=path, batch_size=10, flush_interval=0.05, max_bytes=2000)
+        for i in range(60):
+            writer.submit(make_record(i))
+            if i % 10 == 9:
+                writer.flush()
+        writer.close()
+        
+        log_files = [name for name in os.listdir(tmp) if name.startswith("rotating_log")]
+        total_rows = sum(len(read_rows(os.path.join(tmp, name))) for name in log_files)
+        if writer.stats()["rotations"] > 0 and total_rows == 60:
+            print(f"✅ Rotated into {len(log_files)} files without losing rows")
+        else:
+            print(f"❌ Rotation failed: {len(log_files)} files, {total_rows} rows")
+
+if __name__ == "__main__":
+    print("Testing Escalation Log Writer...")
+    test_escalation_writer()
@@ -1,4 +1,10 @@
 from src.agents.retrieval_node import retrieve_context
+from src.data.bm25_index import BM25Index
+from src.data.real_retrieval import RealRetrievalSystem, bump_kb_generation, reciprocal_rank_fusion
+from src.data.vector_index import build_vector_index
+from src.utils.config import config
+import numpy as np
+import tempfile
 
 def test_retrieval():
     """Test the retrieval node with different ticket types"""
@@ -54,6 +60,99 @@ def test_retrieval():
         except Exception as e:
             print(f"❌ Error: {e}")
 
+def test_hybrid_retrieval():
+    """Test BM25 keyword search and reciprocal-rank fusion with dense results"""
+    
+    print("\n--- BM25 keyword index ---")
+    index = BM25Index()
+    index.upsert(
+        ["billing_002", "technical_001", "security_001"],
+        [
+            "Failed payments are usually due to expired cards or incorrect billing information.",
+            "Common login issues can be resolved by clearing browser cache or resetting password.",
+            "Enable two-factor authentication and use a strong password."
+        ],
+        [{"category": "Billing"}, {"category": "Technical"}, {"category": "Security"}]
+    )
+    
+    results = index.search("password reset", n_results=3)
+    filtered = index.search("password reset", category="Security")
+    if results and {r["id"] for r in results} == {"technical_001", "security_001"} and [r["id"] for r in filtered] == ["security_001"]:
+        print(f"✅ Keyword matches: {[(r['id'], round(r['score'], 2)) for r in results]}")
+    else:
+        print(f"❌ Unexpected keyword results: {results}")
+    
+    print("\n--- Reciprocal-rank fusion ---")
+    dense = [{"id": "a"}, {"id": "b"}, {"id": "c"}]
+    keyword = [{"id": "c"}, {"id": "a"}]
+    fused = [item["id"] for item in reciprocal_rank_fusion([dense, keyword])]
+    if fused == ["a", "c", "b"]:
+        print(f"✅ Fused order: {fused}")
+    else:
+        print(f"❌ Unexpected fused order: {fused}")
+
+def test_vector_index():
+    """Test the memory-mapped NumPy index: category ranges, ranking and int8 storage"""
+    
+    print("\n--- NumPy vector index ---")
+    embeddings = np.eye(4, dtype=np.float32)
+    metadatas = [{"category": c} for c in ("Billing", "Security", "Billing", "Technical")]
+    query = np.array([0.9, 0.1, 0.4, 0.0], dtype=np.float32)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        for quantize in (False, True):
+            index = build_vector_index(tmp, ["b1", "s1", "b2", "t1"], embeddings, ["a", "b", "c", "d"], metadatas, quantize=quantize)
+            ranked = [r["id"] for r in index.search(query, "Billing", n_results=5)]
+            top = index.search(query, n_results=1)[0]
+            if ranked == ["b1", "b2"] and top["id"] == "b1" and top["category"] == "Billing":
+                print(f"✅ {'int8' if quantize else 'float32'}: {ranked}")
+            else:
+                print(f"❌ Unexpected {'int8' if quantize else 'float32'} results: {ranked}, {top}")
+
+def test_retrieval_cache():
+    """Test that repeated queries hit the cache until the generation is bumped"""
+    
+    print("\n--- Retrieval cache ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        persist_dir = config.CHROMA_PERSIST_DIR
+        config.CHROMA_PERSIST_DIR = tmp
+        try:
+            system = RealRetrievalSystem()
+            calls = []
+            system._search = lambda query, category, n_results: (calls.append(query) or [{"id": "doc1"}], True)
+            
+            system._sync_generation()
+            system._cached_search("Refund  status", "Billing", 3)
+            system._cached_search("refund status", "Billing", 3)
+            after_repeat = len(calls)
+            
+            bump_kb_generation()
+            system._sync_generation()
+            system._cached_search("refund status", "Billing", 3)
+            after_bump = len(calls)
+            
+            cache_enabled = config.RETRIEVAL_CACHE_ENABLED
+            config.RETRIEVAL_CACHE_ENABLED = False
+            try:
+                uncached = system._cached_search("refund status", "Billing", 3)
+            finally:
+                config.RETRIEVAL_CACHE_ENABLED = cache_enabled
+        finally:
+            config.CHROMA_PERSIST_DIR = persist_dir
+    
+    if after_repeat == 1 and after_bump == 2:
+        print(f"✅ Cache stats: {system.query_cache.stats()}")
+    else:
+        print(f"❌ Expected 1 search before and 2 after the bump, got {after_repeat} and {after_bump}")
+    
+    if uncached == [{"id": "doc1"}] and len(calls) == 3:
+        print("✅ Cache disabled: searched directly and returned the items")
+    else:
+        print(f"❌ Cache disabled: expected the items from a direct search, got {uncached!r}")
+
 if __name__ == "__main__":
     print("Testing Retrieval Node...")
-    test_retrieval()
\ No newline at end of file
+    test_retrieval()
+    test_hybrid_retrieval()
+    test_vector_index()
+    test_retrieval_cache()